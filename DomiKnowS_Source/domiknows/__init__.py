@@ -1 +1 @@
-from .utils import setProductionLogMode, getRegrTimer_logger, getProductionModeStatus, getReuseModel, setDnSkeletonMode, getDnSkeletonMode, getDnSkeletonModeFull, setup_logger
\ No newline at end of file
+from .utils import setProductionLogMode, getRegrTimer_logger, getProductionModeStatus, getReuseModel, setDnSkeletonMode, getDnSkeletonMode, getDnSkeletonModeFull, setup_logger, disableLogger, LazyLogger
\ No newline at end of file
@@ -1,13 +1,32 @@
 from .graph import Graph
 from .concept import Concept, EnumConcept
 from .relation import Relation
-from .logicalConstrain import LcElement, LogicalConstrain, V
-from .logicalConstrain import andL, nandL, orL, ifL, norL, xorL, notL, equivalenceL
-from .logicalConstrain import eqL, fixedL, forAllL
-from .logicalConstrain import existsL, atLeastL, atMostL, exactL
-from .logicalConstrain import existsAL, atLeastAL, atMostAL, exactAL
-from .candidates import CandidateSelection, combinationC
 from .property import Property
 from .trial import Trial
-from .dataNode import DataNode, DataNodeBuilder
-from .dataNodeDummy import createDummyDataNode, satisfactionReportOfConstraints
\ No newline at end of file
+
+# Names imported on first access (PEP 562) - logical constraints, candidates and DataNode
+# pull in torch, the solvers, sklearn and the log files, which defining a graph does not need
+_lazy = {
+    '.logicalConstrain': ('LcElement', 'LogicalConstrain', 'V',
+                          'andL', 'nandL', 'orL', 'ifL', 'norL', 'xorL', 'notL', 'equivalenceL',
+                          'eqL', 'fixedL', 'forAllL',
+                          'existsL', 'atLeastL', 'atMostL', 'exactL',
+                          'existsAL', 'atLeastAL', 'atMostAL', 'exactAL'),
+    '.candidates': ('CandidateSelection', 'combinationC'),
+    '.dataNode': ('DataNode', 'DataNodeBuilder'),
+    '.dataNodeDummy': ('createDummyDataNode', 'satisfactionReportOfConstraints'),
+}
+_lazyNames = {name: module for module, names in _lazy.items() for name in names}
+
+__all__ = ['Graph', 'Concept', 'EnumConcept', 'Relation', 'Property', 'Trial', *_lazyNames]
+
+def __getattr__(name):
+    if name in _lazyNames:
+        import importlib
+        value = getattr(importlib.import_module(_lazyNames[name], __name__), name)
+        globals()[name] = value # Next access does not go through __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazyNames))
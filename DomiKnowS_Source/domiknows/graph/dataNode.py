@@ -3,32 +3,31 @@ from collections import OrderedDict, namedtuple
 from time import perf_counter, perf_counter_ns
 import re
 from itertools import count
+from concurrent.futures import ThreadPoolExecutor
 
 from .dataNodeConfig import dnConfig
+from .dataNodeIndex import DataNodeIndex
+from .dataNodeColumns import DataNodeColumns
 
 from ordered_set import OrderedSet
 
-from domiknows import getRegrTimer_logger, getProductionModeStatus, graph, setup_logger
+from domiknows import getRegrTimer_logger, getProductionModeStatus, graph, setup_logger, LazyLogger
 from domiknows.solver import ilpOntSolverFactory
+from domiknows.solver.ilpConfig import ilpConfig
 from domiknows.utils import getDnSkeletonMode
-from domiknows.graph.relation import Contains
+from domiknows.graph.relation import Relation, Contains
 
 from .property import Property
 from .concept import Concept, EnumConcept
 
-import graphviz
+# For your DataNode logging setup - log file is created on the first use of the logger:
+_DataNode__Logger = LazyLogger(dnConfig, 'datanode.log')
 
-from sklearn import metrics
-
-# For your DataNode logging setup:
-_DataNode__Logger = setup_logger(dnConfig, 'datanode.log')
-
-# For DataNodeBuilder - create separate config or use same handler
+# For DataNodeBuilder - create separate config or use same handler (set up together with the DataNode logger)
 datanode_builder_config = dnConfig.copy() if dnConfig else {}
 datanode_builder_config['log_name'] = 'dataNodeBuilder'
-_DataNodeBuilder__Logger = setup_logger(datanode_builder_config, 'datanode.log')
-
-_DataNodeBuilder__Logger.info('--- Starting new run ---')
+_DataNodeBuilder__Logger = LazyLogger(datanode_builder_config, 'datanode.log', onSetup=lambda logger: logger.info('--- Starting new run ---'),
+                                      sharedWith=_DataNode__Logger)
 
 class DataNode:
     """
@@ -42,7 +41,8 @@ class DataNode:
         - graph (Graph): Graph to which the DataNode belongs.
         - relationLinks (dict): Dictionary mapping relation name to RelationLinks.
         - impactLinks (dict): Dictionary with dataNodes impacting this dataNode.
-        - attributes (dict): Dictionary with node's attributes.
+        - attributes (dict): Dictionary with node's attributes - built from the DataNodeColumns on first access if the node is backed by them.
+        - dnIndex (DataNodeIndex): Index of the data graph this dataNode is connected to.
         - current_device (str): The current device being used ('cpu' or 'cuda').
         - gurobiModel (NoneType): Placeholder for Gurobi model.
         - myLoggerTime (Logger): Logger for time measurement.
@@ -70,6 +70,7 @@ class DataNode:
             relationLinks (dict): Dictionary mapping relation name to RelationLinks.
             impactLinks (dict): Dictionary with dataNodes impacting this dataNode.
             attributes (dict): Dictionary with node's attributes.
+            dnIndex (DataNodeIndex): Index of the data graph this dataNode is connected to.
             current_device (str): The current device being used ('cpu' or 'cuda').
             gurobiModel (NoneType): Placeholder for Gurobi model.
             myLoggerTime (Logger): Logger for time measurement.
@@ -85,29 +86,53 @@ class DataNode:
             if graph is not None:
                 self.graph = graph
 
+        self.dnIndex = None                              # Index of the data graph this dataNode is connected to - created on first link or query
+
         if relationLinks:
             self.relationLinks = relationLinks           # Dictionary mapping relation name to RelationLinks
+            DataNodeIndex.of(self).valid = False         # Links not created through addRelationLink - index not reliable
         else:
             self.relationLinks = {}
 
         self.impactLinks = {}                            # Dictionary with dataNodes impacting this dataNode by having it as a subject of its relation
 
+        self._columns = None                             # DataNodeColumns storing attributes of this dataNode as its row
+        self._row = None
         if attributes:
-            self.attributes = attributes                 # Dictionary with node's attributes
+            self._attributes = attributes                # Dictionary with node's attributes
         else:
-            self.attributes = {}
+            self._attributes = {}
 
-        self.current_device = 'cpu'
-        if torch.cuda.is_available():
-            if torch.cuda.device_count() > 1:
-                self.current_device = 'cuda:1'
-            else:
-                self.current_device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.current_device = DataNode.defaultDevice()
 
         self.gurobiModel = None
 
         self.myLoggerTime = getRegrTimer_logger()
         
+    _defaultDevice = None
+    @classmethod
+    def defaultDevice(cls):
+        """Device used by new DataNodes - CUDA availability is checked once, not for every created DataNode."""
+        if cls._defaultDevice is None:
+            if torch.cuda.is_available():
+                cls._defaultDevice = 'cuda:1' if torch.cuda.device_count() > 1 else 'cuda'
+            else:
+                cls._defaultDevice = 'cpu'
+
+        return cls._defaultDevice
+
+    @property
+    def attributes(self):
+        """Dictionary with node's attributes - for dataNodes backed by DataNodeColumns built from the columns on first access."""
+        if self._attributes is None:
+            self._attributes = self._columns.row(self._row)
+
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = attributes
+
     conceptsMap = {}
     @classmethod
     def clear(cls):
@@ -228,6 +253,8 @@ class DataNode:
             Exception: If the specified inference_mode is not found in the DataNode.
 
         """
+        import graphviz
+
         if include_legend:
             # Build Legend subgraph
             legend = graphviz.Digraph(name='cluster_legend',comment='Legend')
@@ -507,6 +534,7 @@ class DataNode:
             return
 
         self.relationLinks[relationName].append(dn)
+        DataNodeIndex.link(self, dn)
 
         # Impact
         if relationName not in dn.impactLinks:
@@ -515,6 +543,43 @@ class DataNode:
         if self not in dn.impactLinks[relationName]:
             dn.impactLinks[relationName].append(self)
 
+    def addRelationLinks(self, relationName, dns):
+        """Add relation links between the current DataNode and the list of DataNodes.
+
+        This method is equivalent to calling addRelationLink for every DataNode in 'dns',
+        but checks existing links with a set, so linking many DataNodes is not quadratic.
+
+        Args:
+            relationName (str): The name of the relation to add.
+            dns (list): The target DataNodes to link to.
+
+        Returns:
+            None
+        """
+        if relationName is None:
+            return
+
+        if relationName not in self.relationLinks:
+            self.relationLinks[relationName] = []
+
+        relDNs = self.relationLinks[relationName]
+        linkedIds = {relDn.id for relDn in relDNs}
+
+        for dn in dns:
+            if dn.id in linkedIds:
+                continue
+
+            linkedIds.add(dn.id)
+            relDNs.append(dn)
+            DataNodeIndex.link(self, dn)
+
+            # Impact
+            if relationName not in dn.impactLinks:
+                dn.impactLinks[relationName] = []
+
+            if self not in dn.impactLinks[relationName]:
+                dn.impactLinks[relationName].append(self)
+
     def removeRelationLink(self, relationName, dn):
         """Remove a relation link between the current DataNode and another DataNode.
 
@@ -536,6 +601,7 @@ class DataNode:
             return
 
         self.relationLinks[relationName].remove(dn)
+        DataNodeIndex.unlink(self)
 
         # Impact
         if relationName in  dn.impactLinks:
@@ -654,6 +720,14 @@ class DataNode:
 
         self.addRelationLink(relationName, dn)
 
+    def addChildDataNodes(self, dns):
+        """Add the list of child DataNodes to the current DataNode.
+
+        Args:
+            dns (list): The DataNodes to be added as children.
+        """
+        self.addRelationLinks('contains', dns)
+
     def removeChildDataNode(self, dn):
         """Remove a child DataNode from the current DataNode.
 
@@ -670,6 +744,7 @@ class DataNode:
         relationName = 'contains'
 
         self.relationLinks[relationName] = []
+        DataNodeIndex.unlink(self)
 
     # --- Equality methods
 
@@ -943,9 +1018,116 @@ class DataNode:
         else:
             return [None]
 
+    def __parseIndexSelect(self, select):
+        """Translate the select part of the query to (concept name, instanceID) answerable by the DataNodeIndex.
+
+        Supported are queries selecting concept (concept or its name) and queries of the form
+        ((concept,), ("instanceID", id)).
+
+        Args:
+            select (object): Query condition for selecting DataNodes.
+
+        Returns:
+            tuple or None: (concept name, instanceID or None) or None if the query is not supported by the index.
+        """
+        if isinstance(select, str):
+            return select, None
+
+        if isinstance(select, (Concept, Relation)):
+            return select.name, None
+
+        if not isinstance(select, tuple) or not select:
+            return None
+
+        conceptName = None
+        instanceID = None
+        for t in select:
+            if not isinstance(t, tuple):
+                return None
+
+            if len(t) == 1 and isinstance(t[0], str):
+                currentConceptName = t[0]
+            elif len(t) == 1 and isinstance(t[0], (Concept, Relation)):
+                currentConceptName = t[0].name
+            elif len(t) == 2 and isinstance(t[0], str) and t[0] == "instanceID" and instanceID is None and t[1] is not None:
+                instanceID = t[1]
+                try:
+                    hash(instanceID)
+                except TypeError:
+                    return None
+                continue
+            else:
+                return None
+
+            if conceptName is not None and conceptName != currentConceptName:
+                return None
+            conceptName = currentConceptName
+
+        if conceptName is None:
+            return None
+
+        return conceptName, instanceID
+
+    def __findDatanodesInIndex(self, dns, select):
+        """Find DataNodes satisfying the select part of the query using the indexes of the data graphs of dns.
+
+        Args:
+            dns (list): List of DataNodes to start with.
+            select (object): Query condition for selecting DataNodes.
+
+        Returns:
+            list or None: List of DataNodes or None if the query cannot be answered from the indexes.
+        """
+        indexSelect = self.__parseIndexSelect(select)
+        if indexSelect is None:
+            return None
+
+        dnIndexes = {} # Indexes by their ids - in the order of dns
+        for dn in dns:
+            if not isinstance(dn, DataNode):
+                return None
+
+            dnIndex = DataNodeIndex.scoped(dn) or DataNodeIndex.of(dn)
+            if not dnIndex.valid:
+                return None
+
+            dnIndexes.setdefault(id(dnIndex), dnIndex)
+
+        dnIndexes = list(dnIndexes.values())
+
+        conceptName, instanceID = indexSelect
+        if len(dnIndexes) == 1:
+            return list(dnIndexes[0].select(conceptName, instanceID))
+
+        returnDns = []
+        for dnIndex in dnIndexes:
+            returnDns.extend(dnIndex.select(conceptName, instanceID))
+
+        return returnDns
+
+    def __sortDatanodes(self, returnDns):
+        """Sort DataNodes according to their ids (keeping one DataNode per id).
+
+        Args:
+            returnDns (list): List of DataNodes.
+
+        Returns:
+            list: Sorted list of DataNodes.
+        """
+        returnDnsNotSorted = OrderedDict()
+        for dn in returnDns:
+            returnDnsNotSorted[dn.getInstanceID()] = dn
+
+        returnDnsSorted = OrderedDict(sorted(returnDnsNotSorted.items()))
+
+        return [*returnDnsSorted.values()]
+
     def findDatanodes(self, dns = None, select = None, indexes = None, visitedDns = None, depth = 0):
         """Find and return DataNodes based on the given query conditions.
 
+        Queries selecting concept (optionally with instanceID) are answered from the DataNodeIndex
+        of the data graph; other queries traverse the data graph.
+
         Args:
             dns (list): List of DataNodes to start with.
             select (object): Query condition for selecting DataNodes.
@@ -973,43 +1155,18 @@ class DataNode:
 
             return returnDns
 
-        # Check each provided DataNode if it satisfy the select part of the query
-        for dn in dns:
-            # Test current DataNote against the query
-            if self.__testDataNode(dn, select):
-                if dn not in returnDns:
-                    returnDns.append(dn)
-
-            if not visitedDns:
-                visitedDns = OrderedSet()
-
-            visitedDns.add(dn)
-
-        # Call recursively
-        newDepth = depth + 1
-        for dn in dns:
-            # Visit  DataNodes in links
-            for r, rValue in dn.getLinks().items():
-
-                # Check if the nodes already visited
-                dnsToVisit = OrderedSet()
-                for rDn in rValue:
-                    if rDn not in visitedDns:
-                        dnsToVisit.add(rDn)
-
-                if not dnsToVisit:
-                    continue
+        # Use the data graph index if the select part of the query is supported by it
+        indexedDns = None
+        if not depth and visitedDns is None:
+            indexedDns = self.__findDatanodesInIndex(dns, select)
 
-                # Visit DataNodes in the current relation
-                currentRelationDns = self.findDatanodes(dnsToVisit, select = select, indexes = indexes, visitedDns = visitedDns, depth = newDepth)
-
-                if currentRelationDns is not None:
-                    for currentRDn in currentRelationDns:
-                        if currentRDn not in returnDns:
-                            returnDns.append(currentRDn)
+        if indexedDns is not None:
+            returnDns = indexedDns
+        else:
+            returnDns = self.__traverseDatanodes(dns, select, indexes, visitedDns, depth)
 
-        if depth: # Finish recursion
-            return returnDns
+            if depth: # Finish recursion
+                return returnDns
 
         # If index provided in query then filter the found results for the select part of query through the index part of query
         if (indexes != None):
@@ -1064,15 +1221,59 @@ class DataNode:
 
         # Sort results according to their ids
         if returnDns:
-            returnDnsNotSorted = OrderedDict()
-            for dn in returnDns:
-                returnDnsNotSorted[dn.getInstanceID()] = dn
+            returnDns = self.__sortDatanodes(returnDns)
 
-            returnDnsSorted = OrderedDict(sorted(returnDnsNotSorted.items()))
+        return returnDns
 
-            returnDns = [*returnDnsSorted.values()]
+    def __traverseDatanodes(self, dns, select, indexes, visitedDns, depth):
+        """Traverse the data graph starting from dns and return DataNodes satisfying the select part of the query.
 
-        return returnDns
+        Args:
+            dns (list): List of DataNodes to start with.
+            select (object): Query condition for selecting DataNodes.
+            indexes (dict): Optional query filtering, passed to the recursive calls.
+            visitedDns (OrderedSet): Keeps track of already visited DataNodes.
+            depth (int): Depth of the recursive call.
+
+        Returns:
+            list: List of DataNodes that satisfy the select part of the query.
+        """
+        returnDns = OrderedSet()
+
+        # Check each provided DataNode if it satisfy the select part of the query
+        for dn in dns:
+            # Test current DataNote against the query
+            if self.__testDataNode(dn, select):
+                returnDns.add(dn)
+
+            if not visitedDns:
+                visitedDns = OrderedSet()
+
+            visitedDns.add(dn)
+
+        # Call recursively - not leaving the query scope of the thread if set
+        scope = DataNodeIndex.scoped()
+        newDepth = depth + 1
+        for dn in dns:
+            # Visit  DataNodes in links
+            for r, rValue in dn.getLinks().items():
+
+                # Check if the nodes already visited
+                dnsToVisit = OrderedSet()
+                for rDn in rValue:
+                    if rDn not in visitedDns and (scope is None or scope.position(rDn) is not None):
+                        dnsToVisit.add(rDn)
+
+                if not dnsToVisit:
+                    continue
+
+                # Visit DataNodes in the current relation
+                currentRelationDns = self.findDatanodes(dnsToVisit, select = select, indexes = indexes, visitedDns = visitedDns, depth = newDepth)
+
+                if currentRelationDns is not None:
+                    returnDns.update(currentRelationDns)
+
+        return list(returnDns)
 
     # Get root of the dataNode
     def getRootDataNode(self):
@@ -1917,7 +2118,43 @@ class DataNode:
         elapsedInferLocalInMs = (endInferLocal - startInferLocal) * 1000
         self.myLoggerTime.info('Infer Local Probabilities - keys: %s, time: %dms', keys, elapsedInferLocalInMs)
 
-    def inferILPResults(self, *_conceptsRelations, key=("local", "softmax"), fun=None, epsilon=0.00001, minimizeObjective=False, ignorePinLCs=False, Acc=None):
+    def __getBatchItemsIndexes(self, batchDns):
+        """Return query scope indexes of the data graphs of the batch items - None if the data graphs are linked.
+
+        Data graph of the item are the DataNodes reachable from it through relation and impact links
+        without passing through this batch DataNode.
+
+        Args:
+            batchDns (list): Batch items DataNodes.
+
+        Returns:
+            list or None: DataNodeIndex of each item data graph in the order of batchDns.
+        """
+        itemOf = {id(self): None} # DataNode id -> index of its batch item
+        batchIndexes = []
+        for batchIndex, batchDn in enumerate(batchDns):
+            if id(batchDn) in itemOf:
+                return None
+
+            itemOf[id(batchDn)] = batchIndex
+            itemDns = [batchDn]
+            for dn in itemDns: # Extended while visited
+                for linkedDns in dn.getLinks().values():
+                    for linkedDn in linkedDns:
+                        if not isinstance(linkedDn, DataNode):
+                            continue
+
+                        if id(linkedDn) not in itemOf:
+                            itemOf[id(linkedDn)] = batchIndex
+                            itemDns.append(linkedDn)
+                        elif itemOf[id(linkedDn)] not in (None, batchIndex): # Linked to other item data graph
+                            return None
+
+            batchIndexes.append(DataNodeIndex.subgraph(itemDns))
+
+        return batchIndexes
+
+    def inferILPResults(self, *_conceptsRelations, key=("local", "softmax"), fun=None, epsilon=0.00001, minimizeObjective=False, ignorePinLCs=False, Acc=None, batchItems=None, batchWorkers=None, batchFused=None):
         """
         Calculate ILP (Integer Linear Programming) prediction for a data graph using this instance as the root.
         Based on the provided list of concepts and relations, it initiates ILP solving procedures.
@@ -1937,6 +2174,16 @@ class DataNode:
             Whether to ignore pin constraints, default is False.
         - Acc: object, optional
             An accumulator for collecting results, default is None.
+        - batchItems: bool, optional
+            Whether the items of the batch DataNode are solved as independent ILP problems, each on its own data graph,
+            default is None - use ilpConfig['ilpBatchItems']. The batch is solved as one problem if the data graphs
+            of its items are linked to each other.
+        - batchWorkers: int, optional
+            Number of worker threads solving the ILP models of batch items in parallel,
+            default is None - use ilpConfig['ilpBatchWorkers']. Value 1 means serial solving.
+        - batchFused: bool, optional
+            Whether the ILP problems of batch items are solved as one block diagonal model (a block per item) with a single
+            optimize call, default is None - use ilpConfig['ilpBatchFused']. The items are solved separately if it is not possible.
 
         Raises:
         - DataNodeError: When no concepts or relations are found for inference.
@@ -1972,20 +2219,62 @@ class DataNode:
             self.inferLocal(keys=keys, Acc=Acc)
 
         startILPInfer = perf_counter()
-        if self.graph.batch and self.ontologyNode == self.graph.batch and 'contains' in self.relationLinks:
+        # Batch items are solved as independent problems only if requested and their data graphs are not linked,
+        # by default the batch DataNode is solved as one problem
+        batchIndexes = None
+        if self.graph.batch is not None and self.ontologyNode == self.graph.batch and 'contains' in self.relationLinks:
+            if batchItems is None:
+                batchItems = ilpConfig.get('ilpBatchItems', False)
+
+            if batchItems:
+                batchIndexes = self.__getBatchItemsIndexes(self.relationLinks['contains'])
+                if batchIndexes is None:
+                    self.myLoggerTime.info(f'Data graphs of batch items of {self.graph.batch} are linked - batch is solved as one problem')
+
+        if batchIndexes is not None:
             batchConcept = self.graph.batch
-            self.myLoggerTime.info(f'Batch processing ILP for {batchConcept}')
+            batchDns = self.relationLinks['contains']
 
-            for batchIndex, dn in enumerate(self.relationLinks['contains']):
-                startILPBatchStepInfer = perf_counter()
-                myILPOntSolver.calculateILPSelection(dn, *conceptsRelations, key=key, fun=fun, epsilon=epsilon, minimizeObjective=minimizeObjective, ignorePinLCs=ignorePinLCs)
-                endILPBatchStepInfer = perf_counter()
+            if batchFused is None:
+                batchFused = ilpConfig.get('ilpBatchFused', False)
+            
+            if batchFused:
+                self.myLoggerTime.info(f'Batch processing ILP for {batchConcept} - {len(batchDns)} items in one model')
+                batchFused = myILPOntSolver.calculateILPSelectionForBatch(self, *conceptsRelations, batchIndexes=batchIndexes, key=key, fun=fun, epsilon=epsilon, minimizeObjective=minimizeObjective, ignorePinLCs=ignorePinLCs)
+
+            if not batchFused:
+                if batchWorkers is None:
+                    batchWorkers = ilpConfig.get('ilpBatchWorkers', 1)
+                batchWorkers = max(1, min(int(batchWorkers), len(batchDns)))
+
+                self.myLoggerTime.info(f'Batch processing ILP for {batchConcept} - {len(batchDns)} items using {batchWorkers} worker(s)')
+
+                # Each batch item is solved on its own data graph - queries of the solver are scoped to it
+                def solveBatchItem(batchIndex, dn):
+                    startILPBatchStepInfer = perf_counter()
+                    with DataNodeIndex.scope(batchIndexes[batchIndex]):
+                        myILPOntSolver.calculateILPSelection(dn, *conceptsRelations, key=key, fun=fun, epsilon=epsilon, minimizeObjective=minimizeObjective, ignorePinLCs=ignorePinLCs)
+                    endILPBatchStepInfer = perf_counter()
+
+                    elapsed = endILPBatchStepInfer - startILPBatchStepInfer
+                    if elapsed > 1:
+                        self.myLoggerTime.info(f'Finished step {batchIndex} for batch ILP Inference - time: {elapsed:.2f}s')
+                    else:
+                        self.myLoggerTime.info(f'Finished step {batchIndex} for batch ILP Inference - time: {elapsed*1000:.2f}ms')
 
-                elapsed = endILPBatchStepInfer - startILPBatchStepInfer
-                if elapsed > 1:
-                    self.myLoggerTime.info(f'Finished step {batchIndex} for batch ILP Inference - time: {elapsed:.2f}s')
+                if batchWorkers == 1:
+                    for batchIndex, dn in enumerate(batchDns):
+                        solveBatchItem(batchIndex, dn)
                 else:
-                    self.myLoggerTime.info(f'Finished step {batchIndex} for batch ILP Inference - time: {elapsed*1000:.2f}ms')
+                    # Items data graphs are disjoint and each item is solved in its own Gurobi model and environment,
+                    # the solver keeps state of the call per thread; Gurobi releases the GIL during optimize so the items
+                    # are solved concurrently. Results are collected in batch order, the first failing item (in batch order)
+                    # raises its exception, as it would in the serial mode.
+                    with ThreadPoolExecutor(max_workers=batchWorkers, thread_name_prefix='ILPBatch') as executor:
+                        batchFutures = [executor.submit(solveBatchItem, batchIndex, dn) for batchIndex, dn in enumerate(batchDns)]
+
+                        for batchFuture in batchFutures:
+                            batchFuture.result()
         else:
             myILPOntSolver.calculateILPSelection(self, *conceptsRelations, key=key, fun=fun, epsilon=epsilon, minimizeObjective=minimizeObjective, ignorePinLCs=ignorePinLCs)
 
@@ -2075,7 +2364,7 @@ class DataNode:
 
         return verifyResult
 
-    def calculateLcLoss(self, tnorm='P',counting_tnorm=None, sample=False, sampleSize=0, sampleGlobalLoss=False):
+    def calculateLcLoss(self, tnorm='P',counting_tnorm=None, sample=False, sampleSize=0, sampleGlobalLoss=False, lossTracer=None):
         """
         Calculate the loss for logical constraints (LC) based on various t-norms.
 
@@ -2090,6 +2379,9 @@ class DataNode:
             Default is 0.
         - sampleGlobalLoss: bool, optional
             Specifies whether to calculate the global loss in case of sampling. Default is False.
+        - lossTracer: LcLossTracer, optional
+            If provided (and sampling is not used), the loss is calculated by the module traced for the structure
+            of this data graph - the structure is traced on its first use. Default is None.
 
         Returns:
         - lcResult: object
@@ -2103,6 +2395,9 @@ class DataNode:
         myilpOntSolver, conceptsRelations = self.getILPSolver(conceptsRelations=self.collectConceptsAndRelations())
 
         self.inferLocal()
+        if lossTracer is not None and not sample:
+            return lossTracer(myilpOntSolver, self, tnorm=tnorm, counting_tnorm=counting_tnorm)
+
         lcResult = myilpOntSolver.calculateLcLoss(self, tnorm=tnorm,counting_tnorm=counting_tnorm, sample=sample,
                                                   sampleSize=sampleSize, sampleGlobalLoss=sampleGlobalLoss,
                                                   conceptsRelations=conceptsRelations)
@@ -2130,6 +2425,8 @@ class DataNode:
         Logging:
         - Various logs are printed for debugging and information.
         """
+        from sklearn import metrics
+
         if not conceptsRelations:
             _DataNode__Logger.info("Calling %s metrics with empty conceptsRelations"%(inferType))
             conceptsRelations = self.collectConceptsAndRelations(conceptsRelations) # Collect all concepts and relations from graph as default set
@@ -2742,10 +3039,11 @@ class DataNodeBuilder(dict):
         _flattenDns = list(flatten(dns))
         
         # remove any dataNodes from flattenDns that do not have relationLinks to any of the existing root dataNodes
+        dnsRootsSet = set(dnsRoots)
         flattenDns = []
         for dn in _flattenDns:
             if dn.relationLinks:
-                if any(il in dnsRoots for il in dn.relationLinks):
+                if any(il in dnsRootsSet for il in dn.relationLinks):
                     flattenDns.append(dn)
             else:
                 flattenDns.append(dn)
@@ -2779,7 +3077,8 @@ class DataNodeBuilder(dict):
         newDnsRoots = noIncomingDNs
         
         # Remove any dataNodes from dnsRoots that are not in newDnsRoots
-        dnsRoots = [dn for dn in dnsRoots if dn in newDnsRoots]
+        newDnsRootsSet = set(newDnsRoots)
+        dnsRoots = [dn for dn in dnsRoots if dn in newDnsRootsSet]
 
         # if newDnsRoots is empty
         if not newDnsRoots:
@@ -2873,24 +3172,26 @@ class DataNodeBuilder(dict):
 
                 attributeNames = [*existingDnsForAttr]
 
+                # Indexes of the candidates in relation for each relation dataNode - found for the whole candidate value at once
+                candidatesIndexes = {}
+                for attribute in attributeNames:
+                    candidatesIndexes[attribute] = {}
+                    for relationDnIndex, candidateIndex in self.__candidatesInRelation(relationAttrsCache[attribute], existingDnsForRelationSorted):
+                        candidatesIndexes[attribute].setdefault(relationDnIndex, []).append(candidateIndex)
+
                 # Create links between this relation and instance dataNode based on the candidate information provided by sensor for each relation attribute
                 for relationDnIndex, relationDn in existingDnsForRelationSorted.items():
+                    isInRelation = False
                     for attributeIndex, attribute in enumerate(attributeNames):
-                        candidatesForRelation = relationAttrsCache[attribute][relationDnIndex]
-
-                        for candidateIndex, candidate in enumerate(candidatesForRelation):
-                            isInRelation = candidate.item()
-                            if isInRelation == 0:
-                                continue
-
-                            candidateDn = existingDnsForAttr[attribute][candidateIndex]
+                        candidatesForRelation = candidatesIndexes[attribute].get(relationDnIndex)
+                        if not candidatesForRelation:
+                            continue
 
-                            #if attributeIndex == 0:
-                            #   candidateDn.addRelationLink(attribute, relationDn)
+                        isInRelation = True
+                        relationDn.addRelationLinks(attribute, [existingDnsForAttr[attribute][candidateIndex] for candidateIndex in candidatesForRelation])
 
-                            relationDn.addRelationLink(attribute, candidateDn)
-                            if (not self.skeletonDataNode):
-                                relationDn.attributes[keyDataName] = vInfo.value[relationDnIndex] # Add / /Update value of the attribute
+                    if isInRelation and (not self.skeletonDataNode):
+                        relationDn.attributes[keyDataName] = vInfo.value[relationDnIndex] # Add / /Update value of the attribute
 
                 if not getProductionModeStatus():
                     _DataNodeBuilder__Logger.info('Create links between the relation %s and instance dataNode of types'%(conceptInfo['concept'].name))
@@ -2903,8 +3204,7 @@ class DataNodeBuilder(dict):
                         _DataNodeBuilder__Logger.info('Adding attribute %s to relation link dataNodes %s'%(keyDataName,conceptInfo['concept'].name))
 
                 if (not self.skeletonDataNode):
-                    for i, rDn in existingDnsForRelationSorted.items(): # Loop through all relation links dataNodes
-                        rDn.attributes[keyDataName] = vInfo.value[i] # Add / /Update value of the attribute
+                    self.__setRelationAttribute(existingDnsForRelationSorted, keyDataName, vInfo.value)
 
             self.__updateRootDataNodeList(list(existingDnsForRelationSorted.values()))
         else:
@@ -2924,11 +3224,44 @@ class DataNodeBuilder(dict):
                     if vInfo.dim == 0:
                         existingDnsForRelationSorted[0].attributes[keyDataName] = vInfo.value # Add / /Update value of the attribute
                 elif vInfo.dim > 0:
-                    for i, rDn in existingDnsForRelationSorted.items(): # Loop through all relations links dataNodes
-                        rDn.attributes[keyDataName] = vInfo.value[i] # Add / /Update value of the attribute
+                    self.__setRelationAttribute(existingDnsForRelationSorted, keyDataName, vInfo.value)
                 else:
                     pass
 
+    def __candidatesInRelation(self, candidates, relationDns):
+        """
+        Find candidates in relation with the relation dataNodes.
+
+        Args:
+            candidates (Tensor or list): Candidates value - row for each relation dataNode (by its instanceID), column for each candidate dataNode, not 0 if in relation.
+            relationDns (dict): Relation dataNodes by their instanceID.
+
+        Returns:
+            list: (instanceID of the relation dataNode, index of the candidate) pairs in row major order.
+        """
+        if isinstance(candidates, torch.Tensor) and candidates.dim() == 2:
+            return [(relationDnIndex, candidateIndex) for relationDnIndex, candidateIndex in candidates.nonzero().tolist() if relationDnIndex in relationDns]
+
+        return [(relationDnIndex, candidateIndex) for relationDnIndex in relationDns
+                for candidateIndex, candidate in enumerate(candidates[relationDnIndex]) if candidate.item() != 0]
+
+    def __setRelationAttribute(self, relationDns, keyDataName, value):
+        """
+        Set attribute value in the relation dataNodes - as a column if they are rows of the same DataNodeColumns.
+
+        Args:
+            relationDns (dict): Relation dataNodes by their instanceID.
+            keyDataName (str): The name of the attribute.
+            value (Tensor or list): Value of the attribute with a row for each relation dataNode (by its instanceID).
+        """
+        columns = DataNodeColumns.of(list(relationDns.values()))
+        if columns is not None and len(value) == len(relationDns) and all(instanceID == row for row, instanceID in enumerate(relationDns)):
+            columns.setColumn(keyDataName, value)
+            return
+
+        for i, rDn in relationDns.items(): # Loop through all relation links dataNodes
+            rDn.attributes[keyDataName] = value[i] # Add / /Update value of the attribute
+
     def __createInitialDataNode(self, vInfo, conceptInfo, keyDataName):
         """
         Create initial data nodes for the data graph.
@@ -2965,16 +3298,16 @@ class DataNodeBuilder(dict):
                 _DataNodeBuilder__Logger.info('Created single dataNode with id %s of type %s'%(instanceID,conceptName))
             dns.append(initialDn)
         elif vInfo.len > 1:
-            for vIndex, v in enumerate(vInfo.value):
+            for vIndex in range(vInfo.len):
                 instanceValue = ""
                 instanceID = vIndex
                 newInitialDn = DataNode(myBuilder = self, instanceID = instanceID, instanceValue = instanceValue, ontologyNode = conceptInfo['concept'])
 
-                if (not self.skeletonDataNode):
-                    newInitialDn.attributes[keyDataName] = v
-
                 dns.append(newInitialDn)
 
+            if (not self.skeletonDataNode):
+                DataNodeColumns(dns).setColumn(keyDataName, vInfo.value)
+
             if not getProductionModeStatus():
                 _DataNodeBuilder__Logger.info('Created %i dataNodes of type %s'%(len(dns),conceptName))
 
@@ -3043,18 +3376,18 @@ class DataNodeBuilder(dict):
             if not getProductionModeStatus():
                 _DataNodeBuilder__Logger.info('Adding %i new dataNodes of type %s'%(vInfo.len,conceptName))
 
-            for vIndex, v in enumerate(vInfo.value):
+            for vIndex in range(vInfo.len):
                 instanceValue = ""
                 instanceID = vIndex
 
                 # Create new DataNode
                 newDn = DataNode(myBuilder = self, instanceID = instanceID, instanceValue = instanceValue, ontologyNode = conceptInfo['concept'])
 
-                # add attribute
-                if (not self.skeletonDataNode):
-                    newDn.attributes[keyDataName] = v
-
                 dns.append(newDn)
+
+            # add attribute - as column of the new dataNodes
+            if (not self.skeletonDataNode):
+                DataNodeColumns(dns).setColumn(keyDataName, vInfo.value)
         elif vInfo.dim == 2: # Two dimensional relation information
             if "relationMode" in conceptInfo:
                 relatedDnsType = conceptInfo["relationAttrs"]['src']
@@ -3088,20 +3421,14 @@ class DataNodeBuilder(dict):
                     instanceID = i
                     newDn = DataNode(myBuilder = self, instanceID = instanceID, instanceValue = instanceValue, ontologyNode = conceptInfo['concept'])
 
-                    if (not self.skeletonDataNode):
-                        newDn.attributes[keyDataName] = vInfo.value[i]
                     dns.append(newDn)
 
-                    # If it is not a regular relation but (Create contain relation between the new DataNode and existing DataNodes
-                    if not conceptInfo['relation']:
-                        if conceptInfo["relationMode"] == "forward":
-                            for index, isRelated in enumerate(vInfo.value[i]):
-                                if isRelated == 1:
-                                    relatedDns[index].addChildDataNode(newDn)
-                        elif conceptInfo["relationMode"] == "backward":
-                            for index, isRelated in enumerate(vInfo.value[i]):
-                                if isRelated == 1:
-                                    newDn.addChildDataNode(relatedDns[index])
+                if (not self.skeletonDataNode):
+                    DataNodeColumns(dns).setColumn(keyDataName, vInfo.value)
+
+                # If it is not a regular relation but (Create contain relation between the new DataNode and existing DataNodes
+                if not conceptInfo['relation']:
+                    self.__addContainsLinks(conceptInfo["relationMode"], vInfo.value, dns, relatedDns)
             else:
                 if not getProductionModeStatus():
                     _DataNodeBuilder__Logger.info('Create %i new dataNodes of type %s'%(vInfo.len,conceptName))
@@ -3117,6 +3444,33 @@ class DataNodeBuilder(dict):
         self.__updateRootDataNodeList(dns)
         return dns
 
+    def __addContainsLinks(self, relationMode, value, dns, relatedDns):
+        """
+        Create contain relation links between the dataNodes and the related dataNodes.
+
+        Args:
+            relationMode (str): "forward" if dataNodes are contained in the related dataNodes, "backward" if they contain them.
+            value (Tensor or list): Two dimensional value - row for each dataNode, column for each related dataNode, 1 if they are related.
+            dns (list): DataNodes - rows of the value.
+            relatedDns (list): Related dataNodes - columns of the value.
+        """
+        relatedIndexes = DataNodeColumns.relatedIndexes(value)
+
+        if relationMode == "forward":
+            childDns = {}
+            for i, index in relatedIndexes:
+                childDns.setdefault(index, []).append(dns[i])
+
+            for index in sorted(childDns):
+                relatedDns[index].addChildDataNodes(childDns[index])
+        elif relationMode == "backward":
+            childDns = {}
+            for i, index in relatedIndexes:
+                childDns.setdefault(i, []).append(relatedDns[index])
+
+            for i, dnChildDns in childDns.items():
+                dns[i].addChildDataNodes(dnChildDns)
+
     def __updateDataNodes(self, vInfo, conceptInfo, keyDataName):
         """
         Update existing data nodes based on various conditions.
@@ -3157,12 +3511,16 @@ class DataNodeBuilder(dict):
                 else:
                     existingDnsForConcept[0].attributes[keyDataName] = [vInfo.value]
             else:
-                for vIndex, v in enumerate(vInfo.value):
-                    if isinstance(existingDnsForConcept[vIndex], DataNode): # Check if DataNode
-                        existingDnsForConcept[vIndex].attributes[keyDataName] = v
-                    else:
-                        _DataNodeBuilder__Logger.error('Element %i in the list is not a dataNode - skipping it'%(vIndex))
-                        raise ValueError('Element %i in the list is not a dataNode - skipping it'%(vIndex))
+                columns = DataNodeColumns.of(existingDnsForConcept)
+                if columns is not None: # DataNodes are rows of the same columns - set the value as a new column
+                    columns.setColumn(keyDataName, vInfo.value)
+                else:
+                    for vIndex, v in enumerate(vInfo.value):
+                        if isinstance(existingDnsForConcept[vIndex], DataNode): # Check if DataNode
+                            existingDnsForConcept[vIndex].attributes[keyDataName] = v
+                        else:
+                            _DataNodeBuilder__Logger.error('Element %i in the list is not a dataNode - skipping it'%(vIndex))
+                            raise ValueError('Element %i in the list is not a dataNode - skipping it'%(vIndex))
 
                 if keyDataName[0] == '<' and keyDataName[-1] == '>':
                     if "contains" in existingDnsForConcept[0].impactLinks:
@@ -3201,17 +3559,7 @@ class DataNodeBuilder(dict):
                 else:
                     _DataNodeBuilder__Logger.info('%s is contain in %s'%(relatedDnsType, conceptName))
 
-            for i in range(0,vInfo.len):
-                exitingDn = existingDnsForConcept[i]
-
-                if conceptInfo["relationMode"] == "forward":
-                    for index, isRelated in enumerate(vInfo.value[i]):
-                        if isRelated == 1:
-                            relatedDns[index].addChildDataNode(exitingDn)
-                elif conceptInfo["relationMode"] == "backward":
-                    for index, isRelated in enumerate(vInfo.value[i]):
-                        if isRelated == 1:
-                            exitingDn.addChildDataNode(relatedDns[index])
+            self.__addContainsLinks(conceptInfo["relationMode"], vInfo.value, existingDnsForConcept, relatedDns)
 
             self.__updateRootDataNodeList(existingDnsForConcept)
 
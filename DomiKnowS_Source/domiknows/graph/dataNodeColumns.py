@@ -0,0 +1,76 @@
+import torch
+
+
+class DataNodeColumns:
+    """
+    Columnar storage of the attributes of DataNodes of one concept created together by the DataNodeBuilder.
+
+    Sensors provide attribute values for all DataNodes of the concept at once (e.g. tensor with a row for
+    each DataNode). Instead of slicing the value into every DataNode attributes dictionary the value is kept
+    whole as a column and each DataNode is only a view of its row - DataNode.attributes dictionary is built
+    from the columns on its first access. Columns set later are copied into the already built dictionaries,
+    so the DataNode API (getAttribute, attributes) returns the same values as with per DataNode storage.
+
+    Attributes:
+        - columns (dict): Attribute key to the value holding a row for each DataNode.
+        - dns (list): DataNodes backed by the columns - DataNode at index i is the row i.
+    """
+    __slots__ = ('columns', 'dns')
+
+    def __init__(self, dns=()):
+        self.columns = {}
+        self.dns = []
+
+        for dn in dns:
+            self.addRow(dn)
+
+    def addRow(self, dn):
+        dn._columns = self
+        dn._row = len(self.dns)
+        if not dn._attributes: # Build attributes dictionary from the columns when accessed
+            dn._attributes = None
+        self.dns.append(dn)
+
+    def row(self, rowIndex):
+        """Return attributes dictionary of the DataNode at the row."""
+        return {key: value[rowIndex] for key, value in self.columns.items()}
+
+    def setColumn(self, key, value):
+        """Set attribute value for all DataNodes - value has a row for each DataNode."""
+        self.columns[key] = value
+
+        for rowIndex, dn in enumerate(self.dns):
+            if dn._attributes is not None: # Attributes dictionary already built - update it
+                dn._attributes[key] = value[rowIndex]
+
+    def isBacking(self, dns):
+        """Check if the DataNodes are exactly the rows of these columns in order."""
+        if len(dns) != len(self.dns):
+            return False
+
+        return all(getattr(dn, '_columns', None) is self and dn._row == rowIndex for rowIndex, dn in enumerate(dns))
+
+    @classmethod
+    def of(cls, dns):
+        """Return columns backing the DataNodes or None if they are not backed by a single columns storage."""
+        if not dns:
+            return None
+
+        columns = getattr(dns[0], '_columns', None)
+        if columns is None or not columns.isBacking(dns):
+            return None
+
+        return columns
+
+    @staticmethod
+    def relatedIndexes(value):
+        """
+        Return (row, column) pairs of the related entries (equal to 1) of two dimensional relation value.
+
+        The pairs are in the row major order - the order of the adjacency in the CSR format. For tensors they
+        are found with a single nonzero call instead of comparing every element in Python.
+        """
+        if isinstance(value, torch.Tensor):
+            return (value == 1).nonzero().tolist()
+
+        return [(rowIndex, index) for rowIndex, row in enumerate(value) for index, isRelated in enumerate(row) if isRelated == 1]
@@ -0,0 +1,161 @@
+import threading
+from contextlib import contextmanager
+
+
+class DataNodeIndex:
+    """
+    Index of the DataNodes connected (through relation or impact links) into one data graph.
+
+    The index is shared by all DataNodes of the connected data graph and keeps them grouped by
+    concept name and by (concept name, instanceID), so DataNode.findDatanodes can answer concept
+    queries without traversing the graph.
+
+    It is maintained incrementally while the DataNodeBuilder creates DataNodes and links them -
+    linking two DataNodes from different data graphs merges their indexes (smaller into larger).
+    Removing a link may split a data graph, so it invalidates the index and queries for this
+    data graph fall back to the graph traversal.
+
+    A query scope (index of a part of the data graph, e.g. one batch item, see subgraph and scope) can be set
+    for the current thread - queries for the DataNodes in the scope are then answered from it only.
+
+    Attributes:
+        - dns (list): DataNodes in the data graph.
+        - byConcept (dict): Concept name to list of DataNodes of this concept.
+        - byConceptInstance (dict): (concept name, instanceID) to list of DataNodes.
+        - valid (bool): False if the index can no longer be trusted.
+        - groundings (dict): Candidates of the logical constraints elements found in the data graph (see LcGroundingCache),
+          dropped when the data graph changes.
+    """
+    __slots__ = ('dns', 'byConcept', 'byConceptInstance', 'valid', 'groundings', '_positions', '_signature')
+
+    _scope = threading.local() # Query scope index of the thread
+
+    def __init__(self):
+        self.dns = []
+        self.byConcept = {}
+        self.byConceptInstance = {}
+        self.valid = True
+        self.resetStructure()
+
+    @staticmethod
+    def conceptName(dn):
+        ontologyNode = dn.ontologyNode
+        return ontologyNode.name if ontologyNode is not None else None
+
+    @classmethod
+    def of(cls, dn):
+        """Return index of the data graph of the DataNode, creating single node index if not yet indexed."""
+        dnIndex = dn.dnIndex
+        if dnIndex is None:
+            dnIndex = cls()
+            dnIndex.add(dn)
+
+        return dnIndex
+
+    def resetStructure(self):
+        """Drop what was derived from the structure of the data graph - it has changed."""
+        self.groundings = {}
+        self._positions = None
+        self._signature = None
+
+    @classmethod
+    def subgraph(cls, dns):
+        """Return index of the DataNodes (part of a data graph) used as query scope - their dnIndex is not changed."""
+        dnIndex = cls()
+        for dn in dns:
+            dnIndex.insert(dn)
+
+        return dnIndex
+
+    @classmethod
+    @contextmanager
+    def scope(cls, dnIndex):
+        """Answer the queries of the current thread for the DataNodes in dnIndex from it instead of the index of their data graph."""
+        previous = getattr(cls._scope, 'dnIndex', None)
+        cls._scope.dnIndex = dnIndex
+        try:
+            yield dnIndex
+        finally:
+            cls._scope.dnIndex = previous
+
+    @classmethod
+    def scoped(cls, dn=None):
+        """Return query scope index of the current thread (None if not set) - if dn is provided only if the scope contains it."""
+        dnIndex = getattr(cls._scope, 'dnIndex', None)
+        if dnIndex is None or dn is None or dnIndex.position(dn) is not None:
+            return dnIndex
+
+        return None
+
+    def add(self, dn):
+        dn.dnIndex = self
+        self.insert(dn)
+
+    def insert(self, dn):
+        self.resetStructure()
+        self.dns.append(dn)
+
+        conceptName = self.conceptName(dn)
+        self.byConcept.setdefault(conceptName, []).append(dn)
+
+        try:
+            self.byConceptInstance.setdefault((conceptName, dn.instanceID), []).append(dn)
+        except TypeError: # Not hashable instanceID - not possible to index it
+            self.valid = False
+
+    def merge(self, other):
+        """Merge two indexes and return the merged one."""
+        if other is self:
+            return self
+
+        larger, smaller = (self, other) if len(self.dns) >= len(other.dns) else (other, self)
+
+        for dn in smaller.dns:
+            larger.add(dn)
+
+        larger.valid = larger.valid and smaller.valid
+
+        return larger
+
+    @classmethod
+    def link(cls, dn, otherDn):
+        """Update indexes when link between two DataNodes is created."""
+        cls.of(dn).merge(cls.of(otherDn)).resetStructure()
+
+    @classmethod
+    def unlink(cls, dn):
+        """Update indexes when link of the DataNode is removed."""
+        if dn.dnIndex is not None:
+            dn.dnIndex.valid = False
+
+    def select(self, conceptName, instanceID=None):
+        """Return DataNodes of the given concept (and instanceID if provided) in the data graph."""
+        if instanceID is None:
+            return self.byConcept.get(conceptName, [])
+
+        return self.byConceptInstance.get((conceptName, instanceID), [])
+
+    def position(self, dn):
+        """Return position of the DataNode in the index (None if not in the index)."""
+        if self._positions is None:
+            self._positions = {id(indexDn): i for i, indexDn in enumerate(self.dns)}
+
+        return self._positions.get(id(dn))
+
+    def signature(self):
+        """
+        Return structure of the data graph - concept, instanceID and relation and impact links of its DataNodes
+        in the index order. Data graphs with the same signature have the same DataNodes at the same positions.
+        """
+        if self._signature is None:
+            signature = []
+            for dn in self.dns:
+                links = tuple((relationName, tuple(self.position(linkedDn) for linkedDn in linkedDns))
+                              for relationName, linkedDns in dn.relationLinks.items())
+                impactLinks = tuple((relationName, tuple(self.position(linkedDn) for linkedDn in linkedDns))
+                                    for relationName, linkedDns in dn.impactLinks.items())
+                signature.append((self.conceptName(dn), dn.instanceID, links, impactLinks))
+
+            self._signature = tuple(signature)
+
+        return self._signature
@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict
+
+import torch
+
+from domiknows.graph.concept import Concept
+from domiknows.graph.logicalConstrain import LcElement, V, eqL
+from domiknows.graph.candidates import getCandidates
+from domiknows.graph.dataNodeIndex import DataNodeIndex
+
+
+class LcGroundingPlan:
+    """
+    Grounding plan of the head logical constraint - compiled once per graph from lc.e.
+
+    Attributes:
+        - lc (LogicalConstrain): Head logical constraint.
+        - concepts (list): Names of the concepts grounded by the LC elements, nested LCs included, in the binding order.
+        - paths (list): Path hops (relation names) of the LC variables.
+        - cacheable (bool): False if a path selects DataNodes by attribute values (eqL) - candidates then depend
+          on the data, not only on the structure of the data graph.
+    """
+    def __init__(self, lc):
+        self.lc = lc
+        self.concepts = []
+        self.paths = []
+        self.cacheable = True
+        self.compile(lc)
+
+    def compile(self, lc):
+        for e in lc.e:
+            if isinstance(e, V):
+                if e.v is not None:
+                    self.compilePath(e.v)
+            elif isinstance(e, tuple) and e and isinstance(e[0], Concept):
+                self.concepts.append(e[0].name)
+            elif isinstance(e, tuple) and e and isinstance(e[0], LcElement): # Candidate selection with its variables
+                self.compile(e[0])
+            elif isinstance(e, LcElement): # Nested LC
+                self.compile(e)
+
+    def compilePath(self, path):
+        if isinstance(path, eqL):
+            self.cacheable = False
+        elif isinstance(path, tuple):
+            for i, hop in enumerate(path):
+                if isinstance(hop, (tuple, eqL)):
+                    self.compilePath(hop)
+                elif i > 0: # First element is the referred variable name
+                    self.paths.append(hop if isinstance(hop, str) else hop.name)
+
+
+class LcGroundingCache:
+    """
+    Groundings of the logical constraints - the candidate DataNodes of the LC elements found by getCandidates.
+
+    In a data graph the candidates of an LC element are found once and reused by all the consumers of the LC
+    (loss, sample loss, ILP and verification) - they are kept in the DataNodeIndex of the data graph and dropped
+    when it changes. The candidates are also kept as dense index tensors of DataNode positions in the index,
+    per structure signature of the data graph (least recently used signatures are evicted above maxSize),
+    so an example with the same structure as an earlier one gets them by indexing its own DataNodes instead of
+    traversing the paths again.
+    """
+    def __init__(self, maxSize=32):
+        self.maxSize = maxSize
+        self.plans = {}
+        self.structures = OrderedDict() # structure signature -> {grounding key: (indexes, lengths, referred variables)}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.structureHits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.structures)
+
+    def plan(self, lc):
+        """Return grounding plan of the head LC, compiling it on the first use."""
+        plan = self.plans.get(lc)
+        if plan is None:
+            plan = self.plans[lc] = LcGroundingPlan(lc)
+
+        return plan
+
+    def getCandidates(self, dn, e, variable, lcVariablesDns, lc, rootLc, eIndex, logger, integrate = False):
+        """Return getCandidates result for the element of the LC processed as part of the head LC rootLc."""
+        dnIndex = DataNodeIndex.scoped(dn) or dn.dnIndex # Candidates found in the query scope are kept in its index
+        if rootLc is None or dnIndex is None or not dnIndex.valid or not self.plan(rootLc).cacheable:
+            return getCandidates(dn, e, variable, lcVariablesDns, lc, logger, integrate = integrate)
+
+        key = (rootLc, lc, eIndex, variable.name, dnIndex.position(dn))
+        grounding = dnIndex.groundings.get(key)
+        if grounding is not None:
+            self.hits += 1
+        else:
+            grounding = self.fromStructure(dnIndex, key)
+            if grounding is None:
+                candidates = getCandidates(dn, e, variable, lcVariablesDns, lc, logger, integrate = integrate)
+                if candidates is None:
+                    return candidates
+
+                self.misses += 1
+                grounding = (candidates[0], tuple(candidates[1]))
+                self.toStructure(dnIndex, key, grounding)
+
+            dnIndex.groundings[key] = grounding
+
+        # Copies - the consumers modify the lists
+        dnsList, referredVariables = grounding
+        return [list(dns) for dns in dnsList], list(referredVariables)
+
+    def fromStructure(self, dnIndex, key):
+        if not self.maxSize:
+            return None
+
+        signature = dnIndex.signature()
+        with self.lock:
+            groundings = self.structures.get(signature)
+            if groundings is None or key not in groundings:
+                return None
+
+            self.structures.move_to_end(signature)
+            indexes, lengths, referredVariables = groundings[key]
+
+        self.structureHits += 1
+        dnsList = [[dnIndex.dns[position] if position >= 0 else None for position in row[:length]]
+                   for row, length in zip(indexes.tolist(), lengths)]
+        return dnsList, referredVariables
+
+    def toStructure(self, dnIndex, key, grounding):
+        if not self.maxSize:
+            return
+
+        dnsList, referredVariables = grounding
+        rows = []
+        for dns in dnsList:
+            row = []
+            for candidateDn in dns:
+                position = -1 if candidateDn is None else dnIndex.position(candidateDn)
+                if position is None: # Candidate outside of the data graph
+                    return
+                row.append(position)
+            rows.append(row)
+
+        # Rows padded with -1 to the longest one - None candidates are -1 inside the row length
+        lengths = tuple(len(row) for row in rows)
+        width = max(lengths, default=0)
+        indexes = torch.tensor([row + [-1] * (width - len(row)) for row in rows], dtype=torch.long).reshape(len(rows), width)
+
+        signature = dnIndex.signature()
+        with self.lock:
+            groundings = self.structures.get(signature)
+            if groundings is None:
+                groundings = self.structures[signature] = {}
+                while len(self.structures) > self.maxSize:
+                    self.structures.popitem(last=False)
+
+            self.structures.move_to_end(signature)
+            groundings[key] = (indexes, lengths, referredVariables)
+
+    def clear(self):
+        with self.lock:
+            self.structures.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'structureHits': self.structureHits, 'misses': self.misses, 'structures': len(self.structures)}
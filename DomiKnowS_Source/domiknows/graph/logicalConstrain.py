@@ -392,7 +392,7 @@ class LogicalConstrain(LcElement):
 
             if len(var) == 0:
                 if not (headConstrain or integrate):
-                    zVars.append([None])
+                    varsSetup.append(None) # No variables - no count
 
                 continue
 
@@ -407,9 +407,12 @@ class LogicalConstrain(LcElement):
             zVars.append([myIlpBooleanProcessor.countVar(model, *varsSetup, onlyConstrains = headConstrain, limitOp = cOperation, limit=cLimit,
                                                          logicMethodName = logicMethodName)])
         else:
+            # Counts of all the variables sets created together
+            counts = iter(myIlpBooleanProcessor.countVars(model, [current_var for current_var in varsSetup if current_var is not None],
+                                                          onlyConstrains = headConstrain, limitOp = cOperation, limit=cLimit,
+                                                          logicMethodName = logicMethodName))
             for current_var in varsSetup:
-                zVars.append([myIlpBooleanProcessor.countVar(model, *current_var, onlyConstrains = headConstrain, limitOp = cOperation, limit=cLimit,
-                                                         logicMethodName = logicMethodName)])
+                zVars.append([next(counts) if current_var is not None else None])
            
         if model is not None:
             model.update()
@@ -1,8 +1,6 @@
 import abc
 from itertools import permutations
 
-import torch
-
 if __package__ is None or __package__ == '':
     from base import BaseGraphTree
     from concept import Concept
@@ -20,6 +18,8 @@ class Transformed():
         self.fn = fn
 
     def __call__(self, data_item, device=None):
+        import torch
+
         value = self.property(data_item)
         try:
             mapping = self.relation.dst[self.relation](data_item)
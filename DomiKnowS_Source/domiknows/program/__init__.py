@@ -1,4 +1,21 @@
-from .program import LearningBasedProgram
-from .model_program import POIProgram, IMLProgram, POILossProgram, SolverPOIProgram, SolverPOIDictLossProgram
-from .callbackprogram import CallbackProgram
-from .lossprogram import PrimalDualModel, SampleLossModel, GBIProgram
\ No newline at end of file
+# Programs and models are imported on first access (PEP 562) - each of them pulls in torch and the solvers
+_lazy = {
+    '.program': ('LearningBasedProgram',),
+    '.model_program': ('POIProgram', 'IMLProgram', 'POILossProgram', 'SolverPOIProgram', 'SolverPOIDictLossProgram'),
+    '.callbackprogram': ('CallbackProgram',),
+    '.lossprogram': ('PrimalDualModel', 'SampleLossModel', 'GBIProgram'),
+}
+_lazyNames = {name: module for module, names in _lazy.items() for name in names}
+
+__all__ = list(_lazyNames)
+
+def __getattr__(name):
+    if name in _lazyNames:
+        import importlib
+        value = getattr(importlib.import_module(_lazyNames[name], __name__), name)
+        globals()[name] = value # Next access does not go through __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazyNames))
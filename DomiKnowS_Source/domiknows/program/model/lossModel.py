@@ -6,8 +6,9 @@ import numpy as np
 import torch
 
 from ...graph import DataNodeBuilder
+from ...solver.lcLossTracer import LcLossTracer
 from ..metric import MetricTracker, MacroAverageTracker
-from domiknows import setup_logger, getProductionModeStatus
+from domiknows import setup_logger, getProductionModeStatus, disableLogger
 
 try:
     from monitor.constraint_monitor import ( # type: ignore
@@ -23,7 +24,8 @@ class LossModel(torch.nn.Module):
     def __init__(self, graph, 
                  tnorm='P',
                  counting_tnorm=None,
-                 sample = False, sampleSize = 0, sampleGlobalLoss = False, device='auto'):
+                 sample = False, sampleSize = 0, sampleGlobalLoss = False, device='auto',
+                 traceLoss = False, compileLoss = False):
         """
         This function initializes a LossModel object with the given parameters and sets up the
         necessary variables and constraints.
@@ -46,6 +48,12 @@ class LossModel(torch.nn.Module):
         global loss will be sampled. Otherwise, it will not be sampled, defaults to False (optional)
         :param device: The `device` parameter specifies the device (CPU or GPU) on which the model will
         be trained and evaluated. It can take the following values:, defaults to auto (optional)
+        :param traceLoss: The `traceLoss` parameter is a boolean flag that determines whether the LC
+        loss is traced into a torch.fx module for each structure of the data graph and the module is
+        reused for the examples with the same structure (not used with sampling), defaults to False (optional)
+        :param compileLoss: The `compileLoss` parameter determines whether the traced LC loss modules
+        are compiled with torch.compile - True for the default backend or the backend name, defaults
+        to False (optional)
         """
         super().__init__()
         self.graph = graph
@@ -59,6 +67,8 @@ class LossModel(torch.nn.Module):
         self.sampleSize = sampleSize
         self.sampleGlobalLoss = sampleGlobalLoss
         
+        self.lossTracer = LcLossTracer(compile=compileLoss) if traceLoss else None
+        
         self.constr = OrderedDict(graph.logicalConstrainsRecursive)
         nconstr = len(self.constr)
         if nconstr == 0:
@@ -99,8 +109,7 @@ class LossModel(torch.nn.Module):
         
         # Disable logger if in production mode
         if getProductionModeStatus():
-            self.lossModelLogger.addFilter(lambda record: False)
-            self.lossModelLogger.info("LossModel logger disabled due to production mode")
+            disableLogger(self.lossModelLogger)
         else:
             self.lossModelLogger.info("=== LossModel Operations Logger Initialized ===")
 
@@ -128,14 +137,17 @@ class LossModel(torch.nn.Module):
         return self.lmbd[self.lmbd_index[key]].clamp(max=self.lmbd_p[self.lmbd_index[key]])
 
     def forward(self, builder, build=None):
+        logInfo = self.lossModelLogger.isEnabledFor(logging.INFO)
+        logDebug = self.lossModelLogger.isEnabledFor(logging.DEBUG)
+
         self.lossModelLogger.info("=== LossModel Forward Operation Started ===")
-        self.lossModelLogger.info(f"Parameters: build={build}, sample={self.sample}, sampleSize={self.sampleSize}")
-        self.lossModelLogger.info(f"T-norm: {self.tnorm}, counting_tnorm: {self.counting_tnorm}")
-        self.lossModelLogger.info(f"Device: {self.device}")
+        if logInfo: self.lossModelLogger.info(f"Parameters: build={build}, sample={self.sample}, sampleSize={self.sampleSize}")
+        if logInfo: self.lossModelLogger.info(f"T-norm: {self.tnorm}, counting_tnorm: {self.counting_tnorm}")
+        if logInfo: self.lossModelLogger.info(f"Device: {self.device}")
         
         if build is None:
             build = self.build
-            self.lossModelLogger.debug(f"Using default build value: {build}")
+            if logDebug: self.lossModelLogger.debug(f"Using default build value: {build}")
             
         if not build and not isinstance(builder, DataNodeBuilder):
             self.lossModelLogger.error("PrimalDualModel must be invoked with `build` on or with provided DataNode Builder")
@@ -144,38 +156,39 @@ class LossModel(torch.nn.Module):
         self.lossModelLogger.debug("Creating batch root data node")
         builder.createBatchRootDN()
         datanode = builder.getDataNode(device=self.device)
-        self.lossModelLogger.info(f"DataNode created on device: {datanode.device if hasattr(datanode, 'device') else 'unknown'}")
+        if logInfo: self.lossModelLogger.info(f"DataNode created on device: {datanode.device if hasattr(datanode, 'device') else 'unknown'}")
         
         # Call the loss calculation returns a dictionary, keys are matching the constraints
         self.lossModelLogger.info("Calculating LC loss...")
-        constr_loss = datanode.calculateLcLoss(tnorm=self.tnorm,counting_tnorm=self.counting_tnorm, sample=self.sample, sampleSize = self.sampleSize)
-        self.lossModelLogger.info(f"Constraint loss keys: {list(constr_loss.keys())}")
+        constr_loss = datanode.calculateLcLoss(tnorm=self.tnorm,counting_tnorm=self.counting_tnorm, sample=self.sample, sampleSize = self.sampleSize,
+                                               lossTracer=self.lossTracer)
+        if logInfo: self.lossModelLogger.info(f"Constraint loss keys: {list(constr_loss.keys())}")
 
         lmbd_loss = []
         if self.sampleGlobalLoss and constr_loss['globalLoss']:
             globalLoss = constr_loss['globalLoss']
-            self.lossModelLogger.info(f"Using global loss: {globalLoss}")
+            if logInfo: self.lossModelLogger.info(f"Using global loss: {globalLoss}")
             self.loss['globalLoss'](globalLoss)
             lmbd_loss = torch.tensor(globalLoss, requires_grad=True)
         else:
             self.lossModelLogger.debug("Processing individual constraint losses")
             for key, loss in constr_loss.items():
                 if key not in self.constr:
-                    self.lossModelLogger.debug(f"Skipping key '{key}' (not in constraints)")
+                    if logDebug: self.lossModelLogger.debug(f"Skipping key '{key}' (not in constraints)")
                     continue
                 
                 if loss['lossTensor'] != None:
                     loss_value = loss['lossTensor'].clamp(min=0)
                     loss_nansum = loss_value[loss_value==loss_value].sum()
                     loss_ = self.get_lmbd(key) * loss_nansum
-                    self.lossModelLogger.debug(f"Constraint '{key}': loss_nansum={loss_nansum.item() if hasattr(loss_nansum, 'item') else loss_nansum}, lambda={self.get_lmbd(key).item()}, weighted_loss={loss_.item() if hasattr(loss_, 'item') else loss_}")
+                    if logDebug: self.lossModelLogger.debug(f"Constraint '{key}': loss_nansum={loss_nansum.item() if hasattr(loss_nansum, 'item') else loss_nansum}, lambda={self.get_lmbd(key).item()}, weighted_loss={loss_.item() if hasattr(loss_, 'item') else loss_}")
                     self.loss[key](loss_)
                     lmbd_loss.append(loss_)
                 else:
-                    self.lossModelLogger.debug(f"Constraint '{key}': lossTensor is None")
+                    if logDebug: self.lossModelLogger.debug(f"Constraint '{key}': lossTensor is None")
                
             lmbd_loss = sum(lmbd_loss)
-            self.lossModelLogger.info(f"Total lambda loss: {lmbd_loss.item() if hasattr(lmbd_loss, 'item') else lmbd_loss}")
+            if logInfo: self.lossModelLogger.info(f"Total lambda loss: {lmbd_loss.item() if hasattr(lmbd_loss, 'item') else lmbd_loss}")
         
         self.lossModelLogger.info("=== LossModel Forward Operation Completed ===\n")
         # (*out, datanode, builder)
@@ -186,7 +199,7 @@ class LossModel(torch.nn.Module):
 class PrimalDualModel(LossModel):
     logger = logging.getLogger(__name__)
 
-    def __init__(self, graph, tnorm='P',counting_tnorm=None, device='auto'):
+    def __init__(self, graph, tnorm='P',counting_tnorm=None, device='auto', traceLoss=False, compileLoss=False):
         """
         The above function is the constructor for a class that initializes an object with a graph,
         tnorm, and device parameters.
@@ -201,8 +214,12 @@ class PrimalDualModel(LossModel):
         (optional)
         :param device: The `device` parameter specifies the device on which the computations will be
         performed. It can take the following values:, defaults to auto (optional)
+        :param traceLoss: The `traceLoss` parameter determines whether the LC loss is traced per structure
+        of the data graph, see LossModel, defaults to False (optional)
+        :param compileLoss: The `compileLoss` parameter determines whether the traced LC loss is compiled
+        with torch.compile, see LossModel, defaults to False (optional)
         """
-        super().__init__(graph, tnorm=tnorm, counting_tnorm = counting_tnorm, device=device)
+        super().__init__(graph, tnorm=tnorm, counting_tnorm = counting_tnorm, device=device, traceLoss=traceLoss, compileLoss=compileLoss)
         
         # Set up dedicated logger for PrimalDualModel operations
         self._setup_primaldual_logger()
@@ -224,8 +241,7 @@ class PrimalDualModel(LossModel):
         
         # Disable logger if in production mode
         if getProductionModeStatus():
-            self.primalDualLogger.addFilter(lambda record: False)
-            self.primalDualLogger.info("PrimalDualModel logger disabled due to production mode")
+            disableLogger(self.primalDualLogger)
         else:
             self.primalDualLogger.info("=== PrimalDualModel Operations Logger Initialized ===")
 
@@ -268,12 +284,14 @@ class InferenceModel(LossModel):
         
         # Disable logger if in production mode
         if getProductionModeStatus():
-            self.inferenceLogger.addFilter(lambda record: False)
-            self.inferenceLogger.info("InferenceModel logger disabled due to production mode")
+            disableLogger(self.inferenceLogger)
         else:
             self.inferenceLogger.info("=== InferenceModel Operations Logger Initialized ===")
 
     def forward(self, builder, build=None):
+        logInfo = self.inferenceLogger.isEnabledFor(logging.INFO)
+        logDebug = self.inferenceLogger.isEnabledFor(logging.DEBUG)
+
         self.inferenceLogger.info("=== InferenceModel Forward Operation Started ===")
         
         if MONITORING_AVAILABLE:
@@ -282,7 +300,7 @@ class InferenceModel(LossModel):
             
         if build is None:
             build = self.build
-            self.inferenceLogger.debug(f"Using default build value: {build}")
+            if logDebug: self.inferenceLogger.debug(f"Using default build value: {build}")
             
         if not build and not isinstance(builder, DataNodeBuilder):
             self.inferenceLogger.error("InferenceModel must be invoked with `build` on or with provided DataNode Builder")
@@ -302,7 +320,7 @@ class InferenceModel(LossModel):
             raise ValueError(f'Multiple constraint datanodes (for concept {self.constraint_concept.name}) found: found {len(constraint_datanode)}, expected one.')
 
         constraint_datanode = constraint_dn_search[0]
-        self.inferenceLogger.info(f"Found constraint datanode: {constraint_datanode}")
+        if logInfo: self.inferenceLogger.info(f"Found constraint datanode: {constraint_datanode}")
 
         # Get the constraint labels
         # read_labels will be of format: {'LC{n}/label': label_value}
@@ -314,7 +332,7 @@ class InferenceModel(LossModel):
         # Has the format {'LC{n}': {'lossTensor': tensor, ...}
         self.inferenceLogger.info("Calculating LC loss...")
         constr_loss = datanode.calculateLcLoss(tnorm=self.tnorm,counting_tnorm=self.counting_tnorm, sample=self.sample, sampleSize = self.sampleSize)
-        self.inferenceLogger.info(f"Constraint loss keys: {list(constr_loss.keys())}")
+        if logInfo: self.inferenceLogger.info(f"Constraint loss keys: {list(constr_loss.keys())}")
 
         # print('retrieved labels:', read_labels)
 
@@ -322,21 +340,21 @@ class InferenceModel(LossModel):
         losses = []
         for i, (lcName, loss_dict) in enumerate(constr_loss.items()):
             if lcName not in self.constr:
-                self.inferenceLogger.debug(f"Skipping constraint '{lcName}' (not in self.constr)")
+                if logDebug: self.inferenceLogger.debug(f"Skipping constraint '{lcName}' (not in self.constr)")
                 continue
             
             lc = self.graph.logicalConstrains[lcName]
             lcRepr = f'{lc.__class__.__name__} {lc.strEs()}'
-            self.inferenceLogger.debug(f"Processing constraint '{lcName}' ({i+1}/{len(constr_loss)}) with representation: {lcRepr}")
+            if logDebug: self.inferenceLogger.debug(f"Processing constraint '{lcName}' ({i+1}/{len(constr_loss)}) with representation: {lcRepr}")
                       
             # Get the t-norm translated output of the constraint
             constr_out = loss_dict['conversionSigmoid']
-            self.inferenceLogger.debug(f"Constraint '{lcName}' conversion (succes) output shape: {constr_out.shape}: {constr_out}")
+            if logDebug: self.inferenceLogger.debug(f"Constraint '{lcName}' conversion (succes) output shape: {constr_out.shape}: {constr_out}")
 
             # Target for for constraint lcName
             lbl = read_labels[f'{lcName}/label'].float().unsqueeze(0)
             lbl = lbl.squeeze() # remove singleton dimension if present
-            self.inferenceLogger.debug(f"Constraint '{lcName}' label shape: {lbl.shape}: {lbl}")
+            if logDebug: self.inferenceLogger.debug(f"Constraint '{lcName}' label shape: {lbl.shape}: {lbl}")
 
             if MONITORING_AVAILABLE:
                 log_single_lc(
@@ -348,11 +366,11 @@ class InferenceModel(LossModel):
 
             # Calcluate loss 
             constraint_loss = self.loss_func(constr_out.float(), lbl)
-            self.inferenceLogger.debug(f"Constraint '{lcName}' calculated loss with function {self.loss_func.__class__.__name__}: {constraint_loss.item()}")
+            if logDebug: self.inferenceLogger.debug(f"Constraint '{lcName}' calculated loss with function {self.loss_func.__class__.__name__}: {constraint_loss.item()}")
             losses.append(constraint_loss) # TODO: match dtypes too?
 
         loss_scalar = sum(losses)
-        self.inferenceLogger.info(f"Total inference loss: {loss_scalar.item() if hasattr(loss_scalar, 'item') else loss_scalar}")
+        if logInfo: self.inferenceLogger.info(f"Total inference loss: {loss_scalar.item() if hasattr(loss_scalar, 'item') else loss_scalar}")
         
         if MONITORING_AVAILABLE:
             log_memory() 
@@ -428,8 +446,7 @@ class SampleLossModel(torch.nn.Module):
         
         # Disable logger if in production mode
         if getProductionModeStatus():
-            self.sampleLossLogger.addFilter(lambda record: False)
-            self.sampleLossLogger.info("SampleLossModel logger disabled due to production mode")
+            disableLogger(self.sampleLossLogger)
         else:
             self.sampleLossLogger.info("=== SampleLossModel Operations Logger Initialized ===")
 
@@ -492,9 +509,12 @@ class SampleLossModel(torch.nn.Module):
             temperature: Gumbel-Softmax temperature
             hard_gumbel: If True, use straight-through estimator
         """
+        logInfo = self.sampleLossLogger.isEnabledFor(logging.INFO)
+        logDebug = self.sampleLossLogger.isEnabledFor(logging.DEBUG)
+
         self.sampleLossLogger.info("=== SampleLossModel Forward Operation Started ===")
-        self.sampleLossLogger.info(f"Iteration step: {self.iter_step}")
-        self.sampleLossLogger.info(f"Gumbel settings: use={use_gumbel}, temp={temperature}, hard={hard_gumbel}")
+        if logInfo: self.sampleLossLogger.info(f"Iteration step: {self.iter_step}")
+        if logInfo: self.sampleLossLogger.info(f"Gumbel settings: use={use_gumbel}, temp={temperature}, hard={hard_gumbel}")
         
         if build is None:
             build = self.build
@@ -514,7 +534,7 @@ class SampleLossModel(torch.nn.Module):
             if self.training:
                 self.anneal_temperature()
             
-            self.sampleLossLogger.info(f"Applying Gumbel-Softmax with temp={self.temperature}, hard={self.hard_gumbel}")
+            if logInfo: self.sampleLossLogger.info(f"Applying Gumbel-Softmax with temp={self.temperature}, hard={self.hard_gumbel}")
             # First compute standard local/softmax
             datanode.inferLocal(keys=("softmax",))
             # Then apply Gumbel transformation
@@ -528,7 +548,7 @@ class SampleLossModel(torch.nn.Module):
             sampleSize=self.sampleSize, 
             sampleGlobalLoss=self.sampleGlobalLoss
         )
-        self.sampleLossLogger.info(f"Constraint loss keys: {list(constr_loss.keys())}")
+        if logInfo: self.sampleLossLogger.info(f"Constraint loss keys: {list(constr_loss.keys())}")
         
         import math
         lmbd_loss = []
@@ -537,17 +557,17 @@ class SampleLossModel(torch.nn.Module):
         key_losses = dict()
         for key, loss in constr_loss.items():
             if key not in self.constr:
-                self.sampleLossLogger.debug(f"Skipping key '{key}' (not in constraints)")
+                if logDebug: self.sampleLossLogger.debug(f"Skipping key '{key}' (not in constraints)")
                 continue
             # loss_value = loss['loss']
             epsilon = 0.0
             key_loss = 0
             new_eps = 0.01
-            self.sampleLossLogger.debug(f"Processing constraint '{key}' with {len(loss['lossTensor'])} loss tensors")
+            if logDebug: self.sampleLossLogger.debug(f"Processing constraint '{key}' with {len(loss['lossTensor'])} loss tensors")
             
             for i, lossTensor in enumerate(loss['lossTensor']):
                 lcSuccesses = loss['lcSuccesses'][i]
-                self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: lossTensor sum={lossTensor.sum().item()}, lcSuccesses sum={lcSuccesses.sum().item()}")
+                if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: lossTensor sum={lossTensor.sum().item()}, lcSuccesses sum={lcSuccesses.sum().item()}")
                 
                 if self.sampleSize == -1:
                     sample_info = [val_ for key, val in loss['sampleInfo'].items() for val_ in val if len(val_)]
@@ -565,20 +585,20 @@ class SampleLossModel(torch.nn.Module):
                         loss_value = lossTensor[unique_selected_indexes].sum()
                         loss_ = -1 * torch.log(loss_value)
                         key_loss += loss_
-                        self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: unique selected, loss_value={loss_value.item()}, loss_={loss_.item()}")
+                        if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: unique selected, loss_value={loss_value.item()}, loss_={loss_.item()}")
 
                     else:
                         loss_ = 0
-                        self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: no unique selected indexes")
+                        if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: no unique selected indexes")
                     
                 else:
                     if constr_loss["globalSuccessCounter"] > 0:
                         lcSuccesses = constr_loss["globalSuccesses"]
-                        self.sampleLossLogger.debug(f"Using global successes: {lcSuccesses.sum().item()}")
+                        if logDebug: self.sampleLossLogger.debug(f"Using global successes: {lcSuccesses.sum().item()}")
                     if lossTensor.sum().item() != 0:
                         tidx = (lcSuccesses == 1).nonzero().squeeze(-1)
                         true_val = lossTensor[tidx]
-                        self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: true_val sum={true_val.sum().item()}")
+                        if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: true_val sum={true_val.sum().item()}")
                         
                         if true_val.sum().item() != 0: 
                             if not replace_mul:
@@ -587,16 +607,16 @@ class SampleLossModel(torch.nn.Module):
                                 if self.iter_step < self.warmpup:
                                     with torch.no_grad():
                                         min_val = loss_value
-                                    self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: warmup phase, min_val set to loss_value")
+                                    if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: warmup phase, min_val set to loss_value")
                                 else:
                                     min_val = -1
-                                    self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: post-warmup phase, min_val=-1")
+                                    if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: post-warmup phase, min_val=-1")
                                 # min_val = -1
                                 # with torch.no_grad():
                                 #     min_val = loss_value
                                 loss_ = min_val * loss_value
                                 key_loss += loss_
-                                self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: loss_value={loss_value.item()}, min_val={min_val}, loss_={loss_.item()}")
+                                if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}' tensor {i}: loss_value={loss_value.item()}, min_val={min_val}, loss_={loss_.item()}")
                             else:
                                 loss_value = true_val.logsumexp(dim=0) - lossTensor.logsumexp(dim=0)
                                 key_loss += -1 * loss_value
@@ -633,36 +653,36 @@ class SampleLossModel(torch.nn.Module):
         all_losses = [key_losses[key] for key in key_losses]
         if all_losses:
                 all_losses = torch.stack(all_losses)
-                self.sampleLossLogger.debug(f"Stacked all_losses tensor: {all_losses}")
+                if logDebug: self.sampleLossLogger.debug(f"Stacked all_losses tensor: {all_losses}")
 
                 satisfied_num = len( set(constr_loss.keys()) - set(key_losses.keys()) )
                 unsatisfied_num = len(set(constr_loss.keys())) - satisfied_num
-                self.sampleLossLogger.info(f"Number of satisfied constraints: {satisfied_num}")
-                self.sampleLossLogger.info(f"Number of unsatisfied constraints: {unsatisfied_num}")
+                if logInfo: self.sampleLossLogger.info(f"Number of satisfied constraints: {satisfied_num}")
+                if logInfo: self.sampleLossLogger.info(f"Number of unsatisfied constraints: {unsatisfied_num}")
                 
                 for key in key_losses:
                     if self.sampleSize != -1:
                         if replace_mul:
                             loss_val = (key_losses[key] / all_losses.sum()) * key_losses[key]
-                            self.sampleLossLogger.debug(f"Constraint '{key}': replace_mul mode, loss_val={loss_val.item()}")
+                            if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}': replace_mul mode, loss_val={loss_val.item()}")
                         else:
                             loss_val = key_losses[key]
-                            self.sampleLossLogger.debug(f"Constraint '{key}': standard mode, loss_val={loss_val.item()}")
+                            if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}': standard mode, loss_val={loss_val.item()}")
                     else:
                         loss_val = key_losses[key]
-                        self.sampleLossLogger.debug(f"Constraint '{key}': sampleSize=-1 mode, loss_val={loss_val.item()}")
+                        if logDebug: self.sampleLossLogger.debug(f"Constraint '{key}': sampleSize=-1 mode, loss_val={loss_val.item()}")
 
                     self.loss[key](loss_val)
                     lmbd_loss.append(loss_val) 
                     
                 lmbd_loss = sum(lmbd_loss)
-                self.sampleLossLogger.info(f"Final lambda loss: {lmbd_loss.item()}")
+                if logInfo: self.sampleLossLogger.info(f"Final lambda loss: {lmbd_loss.item()}")
         else:
             self.sampleLossLogger.info("No losses calculated - all constraints satisfied or no valid losses")
             lmbd_loss = 0
-            self.sampleLossLogger.info(f"Lambda loss set to: {lmbd_loss}")
+            if logInfo: self.sampleLossLogger.info(f"Lambda loss set to: {lmbd_loss}")
         
         self.sampleLossLogger.info("=== SampleLossModel Forward Operation Completed ===")
-        self.sampleLossLogger.debug(f"Returning: lmbd_loss, datanode, builder")
+        if logDebug: self.sampleLossLogger.debug(f"Returning: lmbd_loss, datanode, builder")
         
         return lmbd_loss, datanode, builder
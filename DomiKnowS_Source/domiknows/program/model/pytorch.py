@@ -149,7 +149,7 @@ class TorchModel(torch.nn.Module):
                 data_item = {None: data_item}
         data_item = self.move(data_item)
 
-        for sensor in self.graph.get_sensors(CacheSensor, lambda s: s.cache):
+        for sensor in self.graph.get_sensors(CacheSensor, lambda s: s.cache is not None):
             data_hash = data_hash or self.data_hash(data_item)
             sensor.fill_hash(data_hash)
         for sensor in self.graph.get_sensors(ReaderSensor):
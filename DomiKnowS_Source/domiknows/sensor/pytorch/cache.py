@@ -0,0 +1,311 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+
+import torch
+
+try:
+    import fcntl
+except ImportError: # Not available on Windows - shards are then locked only within the process
+    fcntl = None
+
+
+DEFAULT_CACHE_BUDGET = 512 * 1024 * 1024 # Bytes of sensor values kept in memory by default by each CacheSensor
+
+
+def valueSize(value):
+    """Estimate memory use of the cached sensor value in bytes - tensor storage and containers of tensors."""
+    if torch.is_tensor(value):
+        return value.element_size() * value.nelement()
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(valueSize(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(valueSize(k) + valueSize(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class Cache:
+    """
+    Base class of the CacheSensor caches - a mapping from the data item hash to the sensor value.
+
+    Attributes:
+        - hits (int): Number of values found in the cache.
+        - misses (int): Number of values not found (computed by the sensor).
+        - evictions (int): Number of values removed to stay within the cache limits.
+
+    The counters are kept per process - they start from zero in a process the cache is pickled to.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __setitem__(self, name, value):
+        raise NotImplementedError
+
+    def __getitem__(self, name):
+        raise NotImplementedError
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update({'hits': 0, 'misses': 0, 'evictions': 0})
+        return state
+
+
+class LRUCache(Cache):
+    """
+    In-memory LRU cache of sensor values.
+
+    Least recently used values are evicted when the cache holds more than maxSize values or their estimated
+    size exceeds budget bytes (None - no limit). If backend is set (e.g. a ShardedCache), values are also
+    written to it and values not found in memory are read from it - the LRU then keeps the hot values of a
+    larger on-disk cache.
+
+    Pickling (e.g. to a DataLoader worker process) copies the settings and the backend, not the values.
+    """
+    def __init__(self, maxSize=None, budget=DEFAULT_CACHE_BUDGET, backend=None):
+        super().__init__()
+        self.maxSize = maxSize
+        self.budget = budget
+        self.backend = backend
+        self.entries = OrderedDict() # name -> (value, size)
+        self.totalSize = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __getitem__(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is not None:
+                self.entries.move_to_end(name)
+                self.hits += 1
+                return entry[0]
+
+        if self.backend is None:
+            self.misses += 1
+            raise KeyError(name)
+
+        try:
+            value = self.backend[name]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        self.hits += 1
+        self.store(name, value)
+        return value
+
+    def __setitem__(self, name, value):
+        self.store(name, value)
+        if self.backend is not None:
+            self.backend[name] = value
+
+    def store(self, name, value):
+        """Keep the value in memory as the most recently used one and evict values over the limits."""
+        size = valueSize(value)
+        with self.lock:
+            previous = self.entries.pop(name, None)
+            if previous is not None:
+                self.totalSize -= previous[1]
+
+            self.entries[name] = (value, size)
+            self.totalSize += size
+
+            while len(self.entries) > 1 and \
+                    ((self.maxSize is not None and len(self.entries) > self.maxSize) or (self.budget is not None and self.totalSize > self.budget)):
+                _, (_, evictedSize) = self.entries.popitem(last=False)
+                self.totalSize -= evictedSize
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.totalSize = 0
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({'size': len(self.entries), 'bytes': self.totalSize})
+        if self.backend is not None:
+            stats['backend'] = self.backend.stats()
+        return stats
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.update({'entries': OrderedDict(), 'totalSize': 0, 'lock': None})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+
+class TorchCache(Cache):
+    """On-disk cache writing one torch.save file per value."""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+
+    def sanitize(self, name):
+        return name.replace('/', '_').replace("<","").replace(">","")
+
+    def file_path(self, name):
+        return os.path.join(self.path, self.sanitize(name) + '.pt')
+
+    def __setitem__(self, name, value):
+        file_path = self.file_path(name)
+        torch.save(value, file_path)
+
+    def __getitem__(self, name):
+        file_path = self.file_path(name)
+        try:
+            value = torch.load(file_path)
+        except FileNotFoundError as e:
+            self.misses += 1
+            raise KeyError(f'{name} (e.message)')
+
+        self.hits += 1
+        return value
+
+
+class ShardedCache(Cache):
+    """
+    On-disk cache storing the values in a fixed number of shard files instead of one file per value.
+
+    A value is serialized with torch.save (optionally zlib compressed with the compress level) and appended
+    to the shard selected by the hash of its name; its offset and length are appended to the shard index file.
+    Shards are appended under a file lock and indexes of the other processes' writes are read on a miss, so one
+    cache directory can be shared by DataLoader worker processes and by later runs.
+    """
+    def __init__(self, path, shards=16, compress=None):
+        super().__init__()
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.shards = shards
+        self.compress = compress
+        self.index = {} # name -> (shard, offset, length)
+        self.indexRead = [0] * shards # Bytes of each shard index already read
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            for shard in range(self.shards):
+                self.readIndex(shard)
+            return len(self.index)
+
+    def shard(self, name):
+        # Stable over processes and runs, unlike hash()
+        return int(hashlib.sha1(name.encode('utf-8')).hexdigest(), 16) % self.shards
+
+    def shardPath(self, shard):
+        return os.path.join(self.path, 'shard-%03i.bin' % shard)
+
+    def indexPath(self, shard):
+        return os.path.join(self.path, 'shard-%03i.idx' % shard)
+
+    def readIndex(self, shard):
+        """Read the index entries appended to the shard index since the last read (by this or other processes)."""
+        try:
+            with open(self.indexPath(shard), 'rb') as f:
+                f.seek(self.indexRead[shard])
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        data = data[:data.rfind(b'\n') + 1] # Only complete lines - the writer may be in the middle of a line
+        for line in data.splitlines():
+            name, offset, length = json.loads(line)
+            self.index[name] = (shard, offset, length)
+        self.indexRead[shard] += len(data)
+
+    def __getitem__(self, name):
+        key = str(name)
+        with self.lock:
+            location = self.index.get(key)
+            if location is None:
+                self.readIndex(self.shard(key))
+                location = self.index.get(key)
+
+        if location is None:
+            self.misses += 1
+            raise KeyError(name)
+
+        shard, offset, length = location
+        with open(self.shardPath(shard), 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+
+        if self.compress is not None:
+            data = zlib.decompress(data)
+
+        self.hits += 1
+        return torch.load(io.BytesIO(data), weights_only=False)
+
+    def __setitem__(self, name, value):
+        key = str(name)
+        buffer = io.BytesIO()
+        torch.save(value, buffer)
+        data = buffer.getvalue()
+        if self.compress is not None:
+            data = zlib.compress(data, self.compress)
+
+        shard = self.shard(key)
+        with self.lock, open(self.shardPath(shard), 'ab') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(data)
+                f.flush()
+                with open(self.indexPath(shard), 'a') as indexFile:
+                    indexFile.write(json.dumps([key, offset, len(data)]) + '\n')
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+            self.index[key] = (shard, offset, len(data))
+
+    def clear(self):
+        """Remove all the shards of the cache directory."""
+        with self.lock:
+            for shard in range(self.shards):
+                for path in (self.shardPath(shard), self.indexPath(shard)):
+                    if os.path.exists(path):
+                        os.remove(path)
+            self.index.clear()
+            self.indexRead = [0] * self.shards
+
+    def stats(self):
+        stats = super().stats()
+        stats['size'] = len(self.index)
+        return stats
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.update({'index': {}, 'indexRead': [0] * self.shards, 'lock': None})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -37,10 +37,25 @@ class EdgeSensor(FunctionalSensor):
 
 
 class BaseCandidateSensor(QuerySensor):
+    # In batch mode forward is called once for all candidates - instead of argument DataNodes it receives
+    # for every argument an index grid (tensor with the shape of all candidates) with index of the argument DataNode
+    # in each candidate, and returns the candidates mask with the same shape (or shape broadcastable to it).
+    # Otherwise forward is called for each candidate tuple of the argument DataNodes.
+    def __init__(self, *pres, batch=False, **kwargs):
+        super().__init__(*pres, **kwargs)
+        self.batch = batch
+
     @property
     def args(self):
         raise NotImplementedError
 
+    def forward_batch(self, inputs, dims):
+        grids = torch.meshgrid(*(torch.arange(dim, device=self.device) for dim in dims), indexing='ij')
+        candidates = dict(zip(self.args.keys(), grids))
+        mask = self.forward(*inputs, **candidates)
+        mask = torch.as_tensor(mask, device=self.device)
+        return torch.broadcast_to(mask, dims).contiguous()
+
     def define_inputs(self):
         super(QuerySensor, self).define_inputs()  # skip QuerySensor.define_inputs
         args = {}
@@ -68,6 +83,8 @@ class CandidateSensor(EdgeSensor, BaseCandidateSensor):
         for arg_list in args.values():
             arg_lists.append(enumerate(arg_list))
             dims.append(len(arg_list))
+        if self.batch:
+            return self.forward_batch(inputs, dims).to(dtype=torch.long)
         output = torch.zeros(dims, dtype=torch.long, device=self.device)
         for arg_enum in product(*arg_lists):
             index, arg_list = zip(*arg_enum)
@@ -99,12 +116,16 @@ class CompositionCandidateSensor(JointSensor, BaseCandidateSensor):
             dims.append(len(arg_list))
             indexes.append([])
 
-        for arg_enum in product(*arg_lists):
-            index, arg_list = zip(*arg_enum)
-            candidates = dict(zip(self.args.keys(), arg_list))
-            if self.forward(*inputs, **candidates):
-                for i, index_ in enumerate(index):
-                    indexes[i].append(index_)
+        if self.batch:
+            # nonzero lists the candidates in the same (row major) order as the product
+            indexes = self.forward_batch(inputs, dims).nonzero().t().tolist()
+        else:
+            for arg_enum in product(*arg_lists):
+                index, arg_list = zip(*arg_enum)
+                candidates = dict(zip(self.args.keys(), arg_list))
+                if self.forward(*inputs, **candidates):
+                    for i, index_ in enumerate(index):
+                        indexes[i].append(index_)
 
         mappings = []
         for index, dim in zip(indexes, dims):
@@ -124,8 +145,8 @@ class CandidateRelationSensor(CandidateSensor):
         concept = self.concept
         return OrderedDict((rel.name, rel.dst) if concept is rel.src else (rel.reversed.name, rel.src) for rel in self.relations)
 
-    def __init__(self, *pres, relations, edges=None, forward=None, label=False, device='auto'):
-        super().__init__(*pres, edges=edges, forward=forward, label=label, device=device)
+    def __init__(self, *pres, relations, edges=None, forward=None, label=False, device='auto', batch=False):
+        super().__init__(*pres, edges=edges, forward=forward, label=label, device=device, batch=batch)
         self.relations = relations
 
 
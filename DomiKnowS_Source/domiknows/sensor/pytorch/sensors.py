@@ -1,9 +1,9 @@
 from typing import Dict, Any
-import os
 import torch
 
 from .. import Sensor
 from ...graph import Property
+from .cache import Cache, LRUCache, TorchCache, ShardedCache
 
 
 class TorchSensor(Sensor):
@@ -474,49 +474,20 @@ def joint(SensorClass, JointSensorClass=JointSensor):
     return type(f"Joint{SensorClass.__name__}", (SensorClass, JointSensorClass), {})
 
 
-class Cache:
-    def __setitem__(self, name, value):
-        raise NotImplementedError
-
-    def __getitem__(self, name):
-        raise NotImplementedError
-
-
-class TorchCache(Cache):
-    def __init__(self, path):
-        super().__init__()
-        self.path = path
-
-    @property
-    def path(self):
-        return self._path
-
-    @path.setter
-    def path(self, path):
-        os.makedirs(path, exist_ok=True)
-        self._path = path
-
-    def sanitize(self, name):
-        return name.replace('/', '_').replace("<","").replace(">","")
-
-    def file_path(self, name):
-        return os.path.join(self.path, self.sanitize(name) + '.pt')
-
-    def __setitem__(self, name, value):
-        file_path = self.file_path(name)
-        torch.save(value, file_path)
-
-    def __getitem__(self, name):
-        file_path = self.file_path(name)
-        try:
-            return torch.load(file_path)
-        except FileNotFoundError as e:
-            raise KeyError(f'{name} (e.message)')
-
-
 class CacheSensor(FunctionalSensor):
-    def __init__(self, *args, cache=dict(), **kwargs):
+    def __init__(self, *args, cache=LRUCache, **kwargs):
+        """
+        Initializes the CacheSensor, caching the sensor values by the hash of the data item.
+
+        Args:
+        - cache (optional): Cache instance (e.g. LRUCache, ShardedCache(path) or LRUCache(backend=ShardedCache(path))),
+          None to disable caching, or a Cache class constructible without arguments (e.g. the default LRUCache) -
+          every sensor then gets its own instance. Caches needing arguments (TorchCache, ShardedCache) must be
+          passed as instances.
+        """
         super().__init__(*args, **kwargs)
+        if isinstance(cache, type): # Cache class - every sensor gets its own bounded cache
+            cache = cache()
         self.cache = cache
         self._hash = None
 
@@ -1 +1,10 @@
-from .ilpOntSolverFactory import ilpOntSolverFactory
\ No newline at end of file
+# The solver factory is imported on first access (PEP 562) - it loads owlready2, and the
+# solver backends (gurobipy, HiGHS) are loaded by the factory when a solver is requested
+__all__ = ['ilpOntSolverFactory']
+
+def __getattr__(name):
+    if name == 'ilpOntSolverFactory':
+        from .ilpOntSolverFactory import ilpOntSolverFactory
+        globals()[name] = ilpOntSolverFactory # Next access does not go through __getattr__
+        return ilpOntSolverFactory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
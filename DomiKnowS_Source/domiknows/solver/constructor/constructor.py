@@ -145,7 +145,7 @@ class Constructor():
 
     def objective(self, candidates, variables, predictions, variables_not, predictions_not, *predicates_list):
         self.logger.debug('set objective')
-        objective = None
+        objective = 0
         for predicates in predicates_list:
             for concept in predicates:
                 for x in candidates[concept]:
@@ -0,0 +1,190 @@
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from time import perf_counter
+
+import gurobipy
+from gurobipy import Env
+
+from domiknows.solver.ilpConfig import ilpConfig
+
+
+class GurobiEnvPool:
+    """
+    Process wide pool of started Gurobi environments reused by the ILP solver calls instead of starting a new
+    environment (and checking the license) for each call.
+
+    Gurobi environments are not thread safe - an environment is leased by one thread at a time and the models created
+    in it are used only while it is leased: a model kept for reuse (in the ILP models cache or in the DataNode) remembers
+    its environment in model._env and is used again by leasing this environment (acquire waits until it is released).
+
+    At most maxSize environments are started (None - no limit), acquire waits for a free environment when all of them
+    are leased. Each environment is started with the Threads parameter set to threads (0 - Gurobi default) and the params.
+
+    Attributes:
+        - acquired (int): Number of leases.
+        - waits (int): Number of leases which had to wait for the environment.
+        - waitTime (float): Total time in seconds the leases waited for the environments, maxWaitTime the longest wait.
+    """
+    def __init__(self, maxSize=None, threads=0, params=None):
+        self.maxSize = maxSize
+        self.threads = threads
+        self.params = dict(params or {})
+        self.envs = {} # id -> all started environments
+        self.free = OrderedDict() # id -> environments not leased, the most recently released last
+        self.starting = 0 # Environments being started outside of the lock
+        self.condition = threading.Condition()
+        self.closed = False
+        self.acquired = 0
+        self.waits = 0
+        self.waitTime = 0.0
+        self.maxWaitTime = 0.0
+
+    def __len__(self):
+        return len(self.envs)
+
+    def owns(self, env):
+        """Return True if env was started by the pool and is not disposed."""
+        with self.condition:
+            return env is not None and id(env) in self.envs and self.envs[id(env)] is env
+
+    def startEnv(self):
+        env = Env("", empty=True)
+        env.setParam('OutputFlag', 0)
+        if self.threads:
+            env.setParam('Threads', self.threads)
+        for name, value in self.params.items():
+            env.setParam(name, value)
+        env.start()
+
+        return env
+
+    def acquire(self, env=None, wait=True):
+        """
+        Lease the environment env (e.g. environment of a reused model) or any free environment if env is None, starting
+        a new one if none is free and the pool is not full. Returns None if wait is False and the environment is not free.
+        Environment not started by the pool is returned as is - it is not shared with other models.
+        """
+        start = perf_counter()
+        waited = False
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise RuntimeError('Gurobi environments pool is closed')
+
+                if env is not None:
+                    if id(env) not in self.envs:
+                        return env
+                    if id(env) in self.free:
+                        del self.free[id(env)]
+                        break
+                elif self.free:
+                    _, env = self.free.popitem()
+                    break
+                elif self.maxSize is None or len(self.envs) + self.starting < self.maxSize:
+                    self.starting += 1
+                    break
+
+                if not wait:
+                    return None
+
+                waited = True
+                self.condition.wait()
+
+            elapsed = perf_counter() - start
+            self.acquired += 1
+            if waited:
+                self.waits += 1
+                self.waitTime += elapsed
+                self.maxWaitTime = max(self.maxWaitTime, elapsed)
+
+        if env is None: # Start a new environment outside of the lock
+            try:
+                env = self.startEnv()
+            finally:
+                with self.condition:
+                    self.starting -= 1
+                    if env is not None:
+                        self.envs[id(env)] = env
+                    self.condition.notify_all()
+
+        return env
+
+    def release(self, env):
+        """Return the leased environment to the pool."""
+        with self.condition:
+            if id(env) not in self.envs:
+                return
+
+            if self.closed:
+                del self.envs[id(env)]
+                self.disposeEnv(env)
+                return
+
+            self.free[id(env)] = env
+            self.condition.notify_all()
+
+    @contextmanager
+    def lease(self, env=None):
+        env = self.acquire(env)
+        try:
+            yield env
+        finally:
+            self.release(env)
+
+    @staticmethod
+    def disposeEnv(env):
+        try:
+            env.dispose()
+        except gurobipy.GurobiError:
+            pass
+
+    def close(self):
+        """Dispose the free environments - the leased ones are disposed when released."""
+        with self.condition:
+            self.closed = True
+            for envId, env in self.free.items():
+                del self.envs[envId]
+                self.disposeEnv(env)
+            self.free.clear()
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            return {'envs': len(self.envs), 'free': len(self.free), 'acquired': self.acquired, 'waits': self.waits,
+                    'waitTime': self.waitTime, 'maxWaitTime': self.maxWaitTime,
+                    'avgWaitTime': self.waitTime / self.waits if self.waits else 0.0}
+
+
+envPool = None
+envPoolLock = threading.Lock()
+
+def getEnvPool():
+    """Return the process wide pool of Gurobi environments, creating it from ilpConfig on the first use."""
+    global envPool
+    if envPool is None:
+        with envPoolLock:
+            if envPool is None:
+                envPool = GurobiEnvPool(maxSize=ilpConfig.get('ilpEnvPoolSize'), threads=ilpConfig.get('ilpEnvThreads', 0))
+
+    return envPool
+
+def closeEnvPool():
+    """Dispose environments of the process wide pool - a new pool is created on the next use."""
+    global envPool
+    with envPoolLock:
+        if envPool is not None:
+            envPool.close()
+            envPool = None
+
+def resetEnvPoolInChild():
+    # Environments of the parent process can not be used in the forked process - drop them without disposing
+    global envPool, envPoolLock
+    envPool = None
+    envPoolLock = threading.Lock()
+
+atexit.register(closeEnvPool)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=resetEnvPoolInChild)
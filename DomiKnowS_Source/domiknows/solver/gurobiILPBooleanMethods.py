@@ -27,6 +27,11 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         self.myLogger = logging.getLogger(ilpConfig['log_name'])
         self.ifLog =  ilpConfig['ifLog']
                 
+    # Debug logging of the logic methods is guarded by this check so the debug messages are not built when not logged
+    @property
+    def ifLogDebug(self):
+        return self.ifLog and self.myLogger.isEnabledFor(logging.DEBUG)
+
     def __varIsNumber(self, var):
         return not isinstance(var, Var)
     
@@ -62,7 +67,8 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 varsInfo['varName'] += varNameConnector
                 varsInfo['varName'] += "_%s_" % (currentVar.VarName)
     
-        if varsInfo['varSumLinExpr'].size() > 0:
+        # String representation is used only in debug log messages
+        if varsInfo['varSumLinExpr'].size() > 0 and self.ifLogDebug:
             varsInfo['varSumLinExprStr'] = str(varsInfo['varSumLinExpr']) 
             #varsInfo['varSumLinExprStr'] = varsInfo['varSumLinExprStr'][varsInfo['varSumLinExprStr'].index(':') + 1 : varsInfo['varSumLinExprStr'].index('>')]
           
@@ -71,7 +77,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             varsInfo['varName'] = '{:.200}'.format(varsInfo['varName'])
             varsInfo['varName'] = varsInfo['varName'][:254] # Limit size of the new ILP variable name
         
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, varsInfo['varsNames']))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, varsInfo['varsNames']))
         
         if varsInfo['N'] < minN: # Variables number less than min 
             raise Exception("%s has no enough variable - %i, required %i"%(logicMethodName,varsInfo['N'],minN))
@@ -106,7 +112,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             else:
                 # -- Create constraint as there is an ILP variable
                 m.addConstr(varsInfo['iLPVars'][0] == 0, name='Not:') # ILP variable has to be 0 so applying not will result in True
-                if self.ifLog: self.myLogger.debug("%s created constraint only: not %s == %i"%(logicMethodName,varsInfo['varsNames'][0],0))
+                if self.ifLogDebug: self.myLogger.debug("%s created constraint only: not %s == %i"%(logicMethodName,varsInfo['varsNames'][0],0))
     
                 return
         else:
@@ -115,11 +121,11 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             if varsInfo['No_of_ilp'] == 0: # Called with a number
                 if varsInfo['numberSum'] == 0:
                     # Applying not results in True
-                    if self.ifLog: self.myLogger.debug("%s returns: %i"%(logicMethodName,1))
+                    if self.ifLogDebug: self.myLogger.debug("%s returns: %i"%(logicMethodName,1))
                     return 1
                 else:
                     # Applying not results in False
-                    if self.ifLog: self.myLogger.debug("%s returns: %i"%(logicMethodName,0))
+                    if self.ifLogDebug: self.myLogger.debug("%s returns: %i"%(logicMethodName,0))
                     return 0
             else: 
                 # -- One ILP variable
@@ -130,9 +136,9 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         
                 # Adding ILP constraint
                 m.addConstr(varNOT + varsInfo['iLPVars'][0] == 1, name='Not:') 
-                if self.ifLog: self.myLogger.debug("%s created constraint: %s + %s == %i "%(logicMethodName,varNOT.VarName,varsInfo['varsNames'][0],1))
+                if self.ifLogDebug: self.myLogger.debug("%s created constraint: %s + %s == %i "%(logicMethodName,varNOT.VarName,varsInfo['varsNames'][0],1))
         
-                if self.ifLog: self.myLogger.debug("%s returns: %s"%(logicMethodName,varsInfo['varName']))
+                if self.ifLogDebug: self.myLogger.debug("%s returns: %s"%(logicMethodName,varsInfo['varName']))
                 return varNOT
             
     def andVar(self, m, *var, onlyConstrains = False):
@@ -157,7 +163,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 raise Exception("ILP model is infeasible - %s is called with value %i, and the result of applying %s is False"%(logicMethodName,0,logicMethodName))
             elif varsInfo['No_of_ilp'] == 0: # No ILP variables
                 # Applying and to all 1 (multiply is 1) results in True
-                if self.ifLog: self.myLogger.debug("%s returns: %i"%(logicMethodName,1))
+                if self.ifLogDebug: self.myLogger.debug("%s returns: %i"%(logicMethodName,1))
                 return
             elif varsInfo['No_of_ilp'] == 1: # if only one ILP variable - rest have to be 1 as there were not zeros
                 # Adding ILP constraint
@@ -166,22 +172,22 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             else:
                 # -- Create constraint as there are at least two ILP variables and all numbers, if present are 1
                 m.addConstr(varsInfo['No_of_ilp'] - S <= 0, name='And:') #  varSumLinExpr >= N
-                if self.ifLog: self.myLogger.debug("%s created constraint only: and %s > %i"%(logicMethodName,varsInfo['varSumLinExprStr'],varsInfo['No_of_ilp']))
+                if self.ifLogDebug: self.myLogger.debug("%s created constraint only: and %s > %i"%(logicMethodName,varsInfo['varSumLinExprStr'],varsInfo['No_of_ilp']))
                 return
         else:  
             # -- If creating ILP variable representing value of AND build of provided method arguments
             
             if varsInfo['numberMul'] == 0: # Vars numbers multiply to 0 - at least one 0 present
                 # Applying and results in False
-                if self.ifLog: self.myLogger.debug("%s has zero, returning 0 without creating additional constraint"%(logicMethodName))
+                if self.ifLogDebug: self.myLogger.debug("%s has zero, returning 0 without creating additional constraint"%(logicMethodName))
                 return 0
             elif varsInfo['No_of_ilp'] == 0: # No ILP variables
                 # Applying and results in True
-                if self.ifLog: self.myLogger.debug("%s has no ILP variable, returning %i without creating additional constraint"%(logicMethodName, varsInfo['numberMul']))
+                if self.ifLogDebug: self.myLogger.debug("%s has no ILP variable, returning %i without creating additional constraint"%(logicMethodName, varsInfo['numberMul']))
                 return 1
             elif varsInfo['No_of_ilp'] == 1: # Only single ILP variable; rest is 1 here
                 # Result of and is the value of the single ILP variable
-                if self.ifLog: self.myLogger.debug("%s has ones and only single variable: %s, it is returned"%(logicMethodName,varsInfo['iLPVars'][0]))
+                if self.ifLogDebug: self.myLogger.debug("%s has ones and only single variable: %s, it is returned"%(logicMethodName,varsInfo['iLPVars'][0]))
                 return varsInfo['iLPVars'][0]
             else:      
                 # -- More than one ILP variable and the rest is 1 
@@ -197,7 +203,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 # Adding ILP constraint
                 m.addConstr(S - varAND <= varsInfo['No_of_ilp'] - 1, name='And:') #  varSumLinExpr <= varAND + N - 1
     
-                if self.ifLog: self.myLogger.debug("%s returns: %s"%(logicMethodName,varsInfo['varName']))
+                if self.ifLogDebug: self.myLogger.debug("%s returns: %s"%(logicMethodName,varsInfo['varName']))
                 return varAND
 
     def orVar(self, m, *var, onlyConstrains = False):
@@ -226,7 +232,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         if onlyConstrains:
             if varsInfo['numberSum'] > 0: # Vars numbers sum is larger then 0 - at least one is present
                 # Applying or results in True
-                if self.ifLog: self.myLogger.debug("%s has ones, returning without creating constraint"%(logicMethodName))
+                if self.ifLogDebug: self.myLogger.debug("%s has ones, returning without creating constraint"%(logicMethodName))
                 return
             elif varsInfo['No_of_ilp'] == 0: # No ILP variables
                 # Applying or results in False -> model is infeasible -> exception
@@ -234,25 +240,25 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             elif varsInfo['No_of_ilp'] == 1: # Only one ILP variable and the rest are zeros
                 # Adding ILP constraint
                 m.addConstr(varsInfo['iLPVars'][0] >= 1, name='Or:') # ILP variable has to be 1 so applying or will result in True
-                if self.ifLog: self.myLogger.debug("%s created constraint only: %s >= %i"%(logicMethodName,varsInfo['iLPVars'][0],1))
+                if self.ifLogDebug: self.myLogger.debug("%s created constraint only: %s >= %i"%(logicMethodName,varsInfo['iLPVars'][0],1))
                 return
             else:
                 # -- Create constraint as there are at least two ILP variables and all numbers, if present, are 0         
                 m.addConstr(S >= 1, name='Or:') # varSumLinExpr >= 1
-                if self.ifLog: self.myLogger.debug("%s created constraint only: %s >= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],1))
+                if self.ifLogDebug: self.myLogger.debug("%s created constraint only: %s >= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],1))
                 return
         else:
             # ------- Creating ILP variable representing value of OR build of provided method arguments
             
             if varsInfo['numberSum'] > 0: #  Vars numbers sum is larger then 0 - at least one present
                 # Applying or results in True
-                if self.ifLog: self.myLogger.debug("%s has ones, returning 1 without creating additional constraint"%(logicMethodName))
+                if self.ifLogDebug: self.myLogger.debug("%s has ones, returning 1 without creating additional constraint"%(logicMethodName))
                 return 1
             elif varsInfo['No_of_ilp'] == 0: # No ILP variables
-                if self.ifLog: self.myLogger.debug("%s has no ILP variable, returning %i without creating additional constraint"%(logicMethodName, varsInfo['numberSum']))
+                if self.ifLogDebug: self.myLogger.debug("%s has no ILP variable, returning %i without creating additional constraint"%(logicMethodName, varsInfo['numberSum']))
                 return varsInfo['numberSum']
             elif varsInfo['No_of_ilp'] == 1: # Only single ILP variable; rest has to be zeros: see first if above
-                if self.ifLog: self.myLogger.debug("%s has zeros and only single variable: %s, it is returned"%(logicMethodName,varsInfo['iLPVars'][0]))
+                if self.ifLogDebug: self.myLogger.debug("%s has zeros and only single variable: %s, it is returned"%(logicMethodName,varsInfo['iLPVars'][0]))
                 return varsInfo['iLPVars'][0]
             else:
                 # -- More than one ILP variable and the rest is 0 
@@ -264,12 +270,12 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 # Build constrains
                 for currentVar in varsInfo['iLPVars']:
                     m.addConstr(currentVar - varOR <= 0, name='Or:') # currentVar <= varOR
-                    if self.ifLog: self.myLogger.debug("%s created constraint: %s - %s <= %i"%(logicMethodName,currentVar.VarName,varsInfo['varName'],0))
+                    if self.ifLogDebug: self.myLogger.debug("%s created constraint: %s - %s <= %i"%(logicMethodName,currentVar.VarName,varsInfo['varName'],0))
         
                 m.addConstr(S - varOR >= 0, name='Or:') # varSumLinExpr >= varOR
-                if self.ifLog: self.myLogger.debug("%s created constraint: %s - %s >= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],varsInfo['varName'],1-1))
+                if self.ifLogDebug: self.myLogger.debug("%s created constraint: %s - %s >= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],varsInfo['varName'],1-1))
         
-                if self.ifLog: self.myLogger.debug("%s returns new variable: %s"%(logicMethodName,varsInfo['varName']))
+                if self.ifLogDebug: self.myLogger.debug("%s returns new variable: %s"%(logicMethodName,varsInfo['varName']))
                 return varOR
              
     def nandVar(self, m, *var, onlyConstrains = False):
@@ -302,7 +308,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 varSumLinExpr.addTerms(1.0, currentVar)
         
             m.addConstr(varSumLinExpr <= varsInfo["N"] - 1, name='Nand:')     
-            if self.ifLog: self.myLogger.debug("NAND created constraint only: %s <= %i"%(varsInfo["varSumLinExprStr"], varsInfo["N"]-1))
+            if self.ifLogDebug: self.myLogger.debug("NAND created constraint only: %s <= %i"%(varsInfo["varSumLinExprStr"], varsInfo["N"]-1))
                   
             return
         
@@ -379,7 +385,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                                     "implication would be False; ignoring in constraint-only mode"
                                     % logicMethodName)
                 else:
-                    if self.ifLog: self.myLogger.debug("%s: numeric implication is True" % logicMethodName)
+                    if self.ifLogDebug: self.myLogger.debug("%s: numeric implication is True" % logicMethodName)
                 return
 
             if is_num_ante and not is_num_cons:
@@ -468,17 +474,17 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         
         if len(varFixed) == 0:
             # Equivalence of no variables is True (vacuous truth)
-            if self.ifLog: self.myLogger.debug("%s returns: %i (no variables)"%(logicMethodName, 1))
+            if self.ifLogDebug: self.myLogger.debug("%s returns: %i (no variables)"%(logicMethodName, 1))
             return 1
         elif len(varFixed) == 1:
             # Equivalence of single variable is True (always equivalent to itself)
-            if self.ifLog: self.myLogger.debug("%s returns: %i (single variable)"%(logicMethodName, 1))
+            if self.ifLogDebug: self.myLogger.debug("%s returns: %i (single variable)"%(logicMethodName, 1))
             return 1
         else:
             # Multi-variable equivalence using existing methods:
             # equiv(a, b, c, ...) = AND(a, b, c, ...) OR AND(NOT(a), NOT(b), NOT(c), ...)
             
-            if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, [v if self.__varIsNumber(v) else v.VarName for v in varFixed]))
+            if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, [v if self.__varIsNumber(v) else v.VarName for v in varFixed]))
             
             # All true case: AND of all variables
             all_true = self.andVar(m, *varFixed)
@@ -502,7 +508,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             if self.ifLog: self.myLogger.error("%s called with incorrect operation specified for comparing limit %s"%(logicMethodName,limitOp))
             return None
             
-        if self.ifLog: self.myLogger.debug("%s called with limit: %i and operation %s"%(logicMethodName,limit,limitOp))
+        if self.ifLogDebug: self.myLogger.debug("%s called with limit: %i and operation %s"%(logicMethodName,limit,limitOp))
         
         # -- Consider None
         varFixed = []  
@@ -524,7 +530,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             # Adding ILP constraint
             if limitOp == '>=': # ilp >= L atLeast
                 if updatedLimit <= 0: # The constraint is satisfied - the limit is negative or zero
-                    if self.ifLog: self.myLogger.debug("%s constraint is satisfied - the limit %i is negative or zero"%(logicMethodName,updatedLimit))
+                    if self.ifLogDebug: self.myLogger.debug("%s constraint is satisfied - the limit %i is negative or zero"%(logicMethodName,updatedLimit))
                     return
                 elif updatedLimit > varsInfo['No_of_ilp']: # The limit is greater than the number of ILP variable - the constraint cannot be satisfied
                     raise Exception("ILP model is infeasible - %s limit %i is greater than the number of ILP variable %i - the constraint %s cannot be satisfied"
@@ -532,7 +538,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 else:
                     # Create Constraint
                     m.addConstr(S >= updatedLimit, name='Count %s:'%(logicMethodName)) # varSumLinExpr >= updatedLimit
-                    if self.ifLog: self.myLogger.debug("%s created ILP constraint: %s >= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],updatedLimit))
+                    if self.ifLogDebug: self.myLogger.debug("%s created ILP constraint: %s >= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],updatedLimit))
                     
             # This check is common for '<=' and '==' atNost and Equal
             elif updatedLimit < 0: # The constraint not is satisfied - the limit is negative or zero so ilp sum cannot be less than it - ilp sum is zero or more
@@ -541,23 +547,23 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                 
             elif limitOp == '<=': # ilp <= L atMost
                 if varsInfo['No_of_ilp'] == 0: # sum Ilp =0 and L >= 0
-                    if self.ifLog: self.myLogger.debug("%s constraint is satisfied - no ILP variable"%(logicMethodName))
+                    if self.ifLogDebug: self.myLogger.debug("%s constraint is satisfied - no ILP variable"%(logicMethodName))
                     return
                 else:
                     m.addConstr(S <= updatedLimit, name='Count %s:'%(logicMethodName)) # varSumLinExpr <= updatedLimit
-                    if self.ifLog: self.myLogger.debug("%s created ILP constraint: %s <= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],updatedLimit))
+                    if self.ifLogDebug: self.myLogger.debug("%s created ILP constraint: %s <= %i"%(logicMethodName,varsInfo['varSumLinExprStr'],updatedLimit))
 
             elif limitOp == '==': # ilp == L Equal
                 if varsInfo['No_of_ilp'] == 0:
                     if updatedLimit == 0:
-                        if self.ifLog: self.myLogger.debug("%s constraint is satisfied - no ILP variable"%(logicMethodName))
+                        if self.ifLogDebug: self.myLogger.debug("%s constraint is satisfied - no ILP variable"%(logicMethodName))
                         return
                     else: # updatedLimit > 0
                         raise Exception("ILP model is infeasible - %s limit %i is not zero as number of ILP variable is zero - the constraint %s cannot be satisfied"
                                     %(logicMethodName,updatedLimit,logicMethodName))
                 else:  
                     m.addConstr(S == updatedLimit, name='Count %s:'%(logicMethodName)) # varSumLinExpr == updatedLimit
-                    if self.ifLog: self.myLogger.debug("%s created ILP constraint: %s == %i"%(logicMethodName,varsInfo['varSumLinExprStr'],updatedLimit))
+                    if self.ifLogDebug: self.myLogger.debug("%s created ILP constraint: %s == %i"%(logicMethodName,varsInfo['varSumLinExprStr'],updatedLimit))
 
             return
         
@@ -566,10 +572,10 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         # Build constrains
             if limitOp == '>=': # atLeast S >= L 
                 if updatedLimit <= 0: # The constraint is satisfied - the limit is negative or zero - return 1
-                    if self.ifLog: self.myLogger.debug("%s constraint is satisfied - the limit %i is negative or zero - return 1"%(logicMethodName,updatedLimit))
+                    if self.ifLogDebug: self.myLogger.debug("%s constraint is satisfied - the limit %i is negative or zero - return 1"%(logicMethodName,updatedLimit))
                     return 1
                 elif updatedLimit > varsInfo['No_of_ilp']: # The limit is greater than the number of ILP variable - the constraint cannot be satisfied
-                    if self.ifLog: self.myLogger.debug("%s limit %i is greater than the number of ILP variable %i - the constraint %s cannot be satisfied - return False"
+                    if self.ifLogDebug: self.myLogger.debug("%s limit %i is greater than the number of ILP variable %i - the constraint %s cannot be satisfied - return False"
                                     %(logicMethodName,updatedLimit,varsInfo['No_of_ilp'],logicMethodName))
                     return False
                 else:
@@ -582,13 +588,13 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                                  
             # This check is common for '<=' and '=='
             elif updatedLimit < 0: # The constraint not is satisfied - the limit is negative or zero so ilp sum cannot be less than it - ilp sum is zero or more
-                if self.ifLog: self.myLogger.debug("%s limit %i is negative or zero, ilp sum cannot be less than it - the constraint %s cannot be satisfied - return False"
+                if self.ifLogDebug: self.myLogger.debug("%s limit %i is negative or zero, ilp sum cannot be less than it - the constraint %s cannot be satisfied - return False"
                                     %(logicMethodName,updatedLimit,logicMethodName))
                 return False
                 
             elif limitOp == '<=': # atMost S <= L 
                 if varsInfo['No_of_ilp'] == 0: # No ILP variable - sum Ilp = 0 and L >= 0
-                    if self.ifLog: self.myLogger.debug("%s constraint is satisfied - no ILP variable"%(logicMethodName))
+                    if self.ifLogDebug: self.myLogger.debug("%s constraint is satisfied - no ILP variable"%(logicMethodName))
                     return True
                 else:  
                     # Create new variable
@@ -601,10 +607,10 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
             elif limitOp == '==': # Exact S == L 
                 if varsInfo['No_of_ilp'] == 0:
                     if updatedLimit == 0:
-                        if self.ifLog: self.myLogger.debug("%s constraint is satisfied - no ILP variable - return True"%(logicMethodName))
+                        if self.ifLogDebug: self.myLogger.debug("%s constraint is satisfied - no ILP variable - return True"%(logicMethodName))
                         return True
                     else: # updatedLimit > 0
-                        if self.ifLog: self.myLogger.debug("I%s limit %i is not zero as number of ILP variable is zero - the constraint %s cannot be satisfied - return False"
+                        if self.ifLogDebug: self.myLogger.debug("I%s limit %i is not zero as number of ILP variable is zero - the constraint %s cannot be satisfied - return False"
                                     %(logicMethodName,updatedLimit,logicMethodName))
                         return False
                 else:
@@ -627,7 +633,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
                     m.addConstr(varCOUNT <= z_ge)
                     m.addConstr(varCOUNT >= z_le + z_ge - 1)
 
-            if self.ifLog: self.myLogger.debug("%s returns new variable: %s"%(logicMethodName,varsInfo['varName']))
+            if self.ifLogDebug: self.myLogger.debug("%s returns new variable: %s"%(logicMethodName,varsInfo['varName']))
             return varCOUNT
     
     def compareCountsVar(
@@ -766,7 +772,7 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         if not self.__varIsNumber(var):
             varName = var.VarName
             
-        if self.ifLog: self.myLogger.debug("%s called with : %s"%(logicMethodName,varName))
+        if self.ifLogDebug: self.myLogger.debug("%s called with : %s"%(logicMethodName,varName))
 
         # If only constructing constrains 
        
@@ -785,11 +791,11 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         
         if fixedTag:    
             m.addConstr(var == 1, name='Fixed:')
-            if self.ifLog: self.myLogger.debug("%s created constraint: Fixed %s == %i"%(logicMethodName,varName,1))
+            if self.ifLogDebug: self.myLogger.debug("%s created constraint: Fixed %s == %i"%(logicMethodName,varName,1))
 
         elif not fixedTag:    
             m.addConstr(var == 0, name='Fixed:')
-            if self.ifLog: self.myLogger.debug("%s created constraint: Fixed %s == %i"%(logicMethodName,varName,0))
+            if self.ifLogDebug: self.myLogger.debug("%s created constraint: Fixed %s == %i"%(logicMethodName,varName,0))
 
         else:
             return # error
@@ -797,5 +803,5 @@ class gurobiILPBooleanProcessor(ilpBooleanProcessor):
         if onlyConstrains:
             return
         
-        if self.ifLog: self.myLogger.debug("%s returns: %i"%(logicMethodName,1))
+        if self.ifLogDebug: self.myLogger.debug("%s returns: %i"%(logicMethodName,1))
         return 1
\ No newline at end of file
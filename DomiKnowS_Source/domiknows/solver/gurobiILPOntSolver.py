@@ -3,6 +3,8 @@ from time import perf_counter, perf_counter_ns
 from collections import OrderedDict
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from colorama import Fore, Style
 
@@ -12,9 +14,11 @@ import torch
 # Gurobi
 from gurobipy import GRB, Model, Var, Env
 import gurobipy
-import collections
 
 from domiknows.graph.concept import Concept, EnumConcept
+from domiknows.solver.ilpConfig import ilpConfig
+from domiknows.solver.ilpModelCache import ILPModelCache, ILPModelCacheEntry
+from domiknows.solver.gurobiEnvPool import getEnvPool
 from domiknows.solver.ilpOntSolver import ilpOntSolver
 from domiknows.solver.gurobiILPBooleanMethods import gurobiILPBooleanProcessor
 from domiknows.solver.lcLossBooleanMethods import lcLossBooleanMethods
@@ -27,10 +31,13 @@ from domiknows.utils import getReuseModel
 from domiknows.utils import getDnSkeletonMode
 
 from domiknows.graph.candidates import getCandidates
+from domiknows.graph.lcGrounding import LcGroundingCache
+from domiknows.graph.dataNodeIndex import DataNodeIndex
 
 
 class gurobiILPOntSolver(ilpOntSolver):
     ilpSolver = 'Gurobi'
+    modelFilesLock = threading.Lock()
 
     def __init__(self, graph, ontologiesTuple, _ilpConfig, reuse_model=False) -> None:
         super().__init__(graph, ontologiesTuple, _ilpConfig)
@@ -46,7 +53,35 @@ class gurobiILPOntSolver(ilpOntSolver):
         if getReuseModel():
             self.reuse_model = True
             
-        self.model = collections.deque([], 20)
+        # Cache of built ILP models keyed by the ILP problem structure
+        if _ilpConfig is None:
+            _ilpConfig = {}
+        self.model = ILPModelCache(maxSize=_ilpConfig.get('ilpModelCacheSize', 20), budget=_ilpConfig.get('ilpModelCacheBudget'), 
+                                   cacheDir=_ilpConfig.get('ilpModelCacheDir'))
+        
+        # Semantic sample (sampleSize -1) generated in chunks, subsampled above the max size
+        self.semanticSampleChunkSize = _ilpConfig.get('semanticSampleChunkSize', 65536)
+        self.semanticSampleMaxSize = _ilpConfig.get('semanticSampleMaxSize')
+        self.semanticSampleMode = _ilpConfig.get('semanticSampleMode', 'uniform')
+        
+        # Candidates of the LCs elements - found once per data graph and reused by loss, ILP and verification
+        self.lcGroundings = LcGroundingCache(maxSize=_ilpConfig.get('lcGroundingCacheSize', 32))
+
+        # Tensorized LC loss - literals of the LC candidates gathered into one tensor and the t-norms applied as reductions
+        self.lcLossTensorized = _ilpConfig.get('lcLossTensorized', False)
+        self.lossLiterals = {} # Literals of the DataNodes gathered by the current loss calculation
+        self.lossLiteralsGathered = True # False if some literals of the current loss calculation were not gathered
+        
+        # State of the current call kept per thread - batch items are solved concurrently by one solver
+        self.callState = threading.local()
+        
+    @property
+    def current_device(self):
+        return getattr(self.callState, 'current_device', 'cpu')
+    
+    @current_device.setter
+    def current_device(self, device):
+        self.callState.current_device = device
         
     def set_logical_constraints(self, new_logical_constraints):
         self.logical_constraints = new_logical_constraints
@@ -157,6 +192,53 @@ class gurobiILPOntSolver(ilpOntSolver):
             
         return dns
     
+    # Lease Gurobi environment from the process wide pool - the environment of the model m if it is reused
+    def acquireEnv(self, m = None):
+        startAcquire = perf_counter()
+        gurobiEnv = getEnvPool().acquire(getattr(m, '_env', None) if m is not None else None)
+        
+        self.myLoggerTime.info('ILP Env acquired - wait time: %ims'%((perf_counter() - startAcquire) * 1000))
+        return gurobiEnv
+    
+    # Remove ILP variables of the concepts from the DataNodes of the data graph - they were created in the previous model of the data graph
+    def resetILPVariables(self, rootDn, *conceptsRelations):
+        for conceptName in {self.getConceptName(c) for c in conceptsRelations}:
+            xkeys = ['<' + conceptName + '>/ILP/' + xkey for xkey in ('x', 'notx', 'xP', 'notxP')]
+            for dn in self.getDatanodesForConcept(rootDn, conceptName):
+                for xkey in xkeys:
+                    dn.attributes.pop(xkey, None)
+                    
+        rootDn.gurobiModel = None
+        
+    # Key of the ILP model in the models cache - None if the structure of the data graph is not known and the model can not be reused
+    def getModelKey(self, dn, ilpVarCount, conceptsRelations, ignorePinLCs = False):
+        # Links of the data graph - LCs of the model are grounded on them, the model is not reused for other structure with the same counts
+        dnIndex = DataNodeIndex.scoped(dn) or dn.dnIndex
+        if dnIndex is None or not dnIndex.valid:
+            return None
+        
+        graphsSignature = tuple(sorted(graph.name for graph in self.myGraph))
+        conceptsSignature = tuple(sorted((self.getConceptName(c), c[1], -1 if c[2] is None else c[2], c[3]) for c in conceptsRelations))
+        
+        lcsSignature = []
+        for graph in self.myGraph:
+            for lcName, lc in graph.logicalConstrains.items():
+                if lc.headLC and lc.active:
+                    lcsSignature.append((graph.name, lcName, type(lc).__name__, lc.strEs(), 100 if ignorePinLCs else lc.p))
+        
+        return (graphsSignature, conceptsSignature, tuple(sorted(lcsSignature)), tuple(sorted(ilpVarCount.items())), dnIndex.signature())
+    
+    # Order ILP variables of the reused model as they are created for the given order of conceptsRelations
+    def orderILPVariables(self, x, conceptsRelations):
+        xGroups = OrderedDict()
+        for c in conceptsRelations:
+            xGroups[(self.getConceptName(c), c[2] if self.conceptIsMultiClass(c) else 0)] = []
+            
+        for _x, xVar in x.items():
+            xGroups.setdefault((_x[0].name, _x[3]), []).append((_x, xVar))
+            
+        return OrderedDict(xItem for xGroup in xGroups.values() for xItem in xGroup)
+    
     # Count number of variables for logical constraints
     def countLCVariables(self, rootDn, *conceptsRelations):
         ilpVarCount = {}
@@ -176,7 +258,8 @@ class gurobiILPOntSolver(ilpOntSolver):
         return ilpVarCount
   
     # Create ILP variables for logical constraints and objective
-    def createILPVariables(self, m, x, rootDn, *conceptsRelations, key = ("local" , "softmax"), fun=None, epsilon = 0.00001):
+    # xDns, if provided, is filled with the datanode of each ILP variable key in x
+    def createILPVariables(self, m, x, rootDn, *conceptsRelations, key = ("local" , "softmax"), fun=None, epsilon = 0.00001, xDns = None):
         Q = None
         # Reset the cash for concept to datanodes
         self.getDatanodesForConcept(rootDn, None)
@@ -211,6 +294,11 @@ class gurobiILPOntSolver(ilpOntSolver):
                 x[self.getConcept(currentConceptRelation), currentLabel, dn.getInstanceID(), currentLabelIndex] = None
                 if self.conceptIsBinary(currentConceptRelation):
                     x[self.getConcept(currentConceptRelation), 'Not_'+  currentLabel, dn.getInstanceID(), currentLabelIndex]  = None
+                
+                if xDns is not None:
+                    xDns[self.getConcept(currentConceptRelation), currentLabel, dn.getInstanceID(), currentLabelIndex] = dn
+                    if self.conceptIsBinary(currentConceptRelation):
+                        xDns[self.getConcept(currentConceptRelation), 'Not_'+  currentLabel, dn.getInstanceID(), currentLabelIndex] = dn
                     
                 # Get probability for variable in the current run
                 currentProbability = self.getProbability(dn, currentConceptRelation, key=key, fun=fun, epsilon=epsilon)
@@ -687,9 +775,11 @@ class gurobiILPOntSolver(ilpOntSolver):
             startNumConstrs = m.NumConstrs
             
             if lc.active:
-                self.myLogger.info('Processing %r - %s'%(lc, lc.strEs()))
+                if self.myLogger.isEnabledFor(logging.INFO):
+                    self.myLogger.info('Processing %r - %s'%(lc, lc.strEs()))
             else:
-                self.myLogger.debug('Skipping not active Logical Constraint %r - %s'%(lc,  [str(e) for e in lc.e]))
+                if self.myLogger.isEnabledFor(logging.DEBUG):
+                    self.myLogger.debug('Skipping not active Logical Constraint %r - %s'%(lc,  [str(e) for e in lc.e]))
                 continue
 
             lcRepr = f'{lc.__class__.__name__} {lc.strEs()}'
@@ -911,6 +1001,48 @@ class gurobiILPOntSolver(ilpOntSolver):
             else:
                 return 0
         
+    def __gatherLossLiterals(self, dnsList, e, xPkey, p):
+        """
+        Tensorized loss - gather the literals of all the candidates of the LC element into one tensor.
+
+        getMLResult is called once for each distinct DataNode (its result is reused by the other LCs of the current loss
+        calculation) and the candidates literals are selected from the stacked results with a single index_select.
+        Missing literals are 0 (as in lcLossBooleanMethods._fixVar). Returns None if the candidates can not be gathered
+        (e.g. several DataNodes for a candidate or multiclass concept without a label) - they are processed one by one.
+        """
+        if not dnsList or (isinstance(e[0], EnumConcept) and e[2] == None) or any(len(dns) != 1 for dns in dnsList):
+            return None
+
+        if isinstance(e[0], EnumConcept): # Multiclass concept label
+            eT = (e[0].name, e[2], e[2])
+        else: # Binary concept
+            eT = (e[0].name, 1, 0)
+
+        rows = {} # DataNode id -> row in values
+        values = []
+        positions = []
+        for dns in dnsList:
+            _dn = dns[0] or None
+            dnId = id(_dn)
+            position = rows.get(dnId)
+            if position is None:
+                literalKey = (_dn, xPkey, eT)
+                if literalKey not in self.lossLiterals:
+                    self.lossLiterals[literalKey] = self.getMLResult(_dn, xPkey, eT, p, loss = True) if _dn is not None else None
+
+                vDn = self.lossLiterals[literalKey]
+                if vDn is None:
+                    vDn = torch.zeros((), device=self.current_device, dtype=torch.float64)
+                elif not torch.is_tensor(vDn) or vDn.numel() != 1:
+                    return None
+
+                position = rows[dnId] = len(values)
+                values.append(vDn if vDn.dim() == 0 else vDn.reshape(()))
+
+            positions.append(position)
+
+        return torch.stack(values).index_select(0, torch.tensor(positions, device=values[0].device))
+
     def __addLossTovDns(self, loss, vDns):
         if loss and vDns:
             vDnsOriginal = vDns
@@ -996,10 +1128,13 @@ class gurobiILPOntSolver(ilpOntSolver):
         
         return result
 
-    def constructLogicalConstrains(self, lc, booleanProcessor, m, dn, p, key = None, lcVariablesDns = None, lcVariables = None, headLC = False, loss = False, sample = False, vNo = None, verify=False):
+    def constructLogicalConstrains(self, lc, booleanProcessor, m, dn, p, key = None, lcVariablesDns = None, lcVariables = None, headLC = False, loss = False, sample = False, vNo = None, verify=False, rootLc = None):
         if key == None:
             key = ""
             
+        if rootLc == None and headLC:
+            rootLc = lc # Head LC - its grounding is shared by the nested LCs
+            
         lcRepr = f'{lc.__class__.__name__} {lc.strEs()}' # for debugging
 
         if lcVariablesDns == None:
@@ -1067,7 +1202,7 @@ class gurobiILPOntSolver(ilpOntSolver):
 
                 elif isinstance(e, (Concept, tuple)): # -- Concept 
                     # -- Get dataNodes candidates 
-                    dnsList, referedVariables = getCandidates(dn, e, variable, lcVariablesDns, lc, self.myLogger, integrate = integrate)
+                    dnsList, referedVariables = self.lcGroundings.getCandidates(dn, e, variable, lcVariablesDns, lc, rootLc, eIndex, self.myLogger, integrate = integrate)
                     lcVariablesDns[variableName] = dnsList
                                 
                     if isinstance(lc, CandidateSelection):
@@ -1089,7 +1224,16 @@ class gurobiILPOntSolver(ilpOntSolver):
                     if sample:
                         sampleInfoForVariable = []
                     xPkey = '<' + conceptName + ">" + key
-                    
+
+                    if loss and not sample and booleanProcessor.tensorized:
+                        literals = self.__gatherLossLiterals(dnsList, e, xPkey, p)
+                        if literals is not None:
+                            lcVariables[variableName] = [[literals]]
+                            usedVariablesNames.add(variableName)
+                            continue
+
+                        self.lossLiteralsGathered = False # Literals of this element are read one by one below
+
                     for dns in dnsList:
                         _vDns = []
                         if sample:
@@ -1185,7 +1329,7 @@ class gurobiILPOntSolver(ilpOntSolver):
                         lcVariablesDnsNew = self.constructLogicalConstrains(
                                                                         e, booleanProcessor, m, dn, p, key = key, 
                                                                         lcVariablesDns = lcVariablesDns, lcVariables = lcVariables, 
-                                                                        headLC = False, loss = loss, sample = sample, vNo=vNo, verify=verify)
+                                                                        headLC = False, loss = loss, sample = sample, vNo=vNo, verify=verify, rootLc = rootLc)
                          
                         lcVariablesDns = lcVariablesDnsNew
                         vDns = None
@@ -1201,13 +1345,14 @@ class gurobiILPOntSolver(ilpOntSolver):
                                 vDns = [[1] for _ in range(length_of_list)]
                                    
                     if isinstance(e, LogicalConstrain): # -- nested LogicalConstrain - process recursively 
-                        self.myLogger.info('Processing Nested %r - %s'%(e, e.strEs()))
+                        if self.myLogger.isEnabledFor(logging.INFO):
+                            self.myLogger.info('Processing Nested %r - %s'%(e, e.strEs()))
 
                         if sample:
                             vDns, sampleInfoLC, lcVariablesLC, lcVariableUpdated = self.constructLogicalConstrains(
                                                                                 e, booleanProcessor, m, dn, p, key = key, 
                                                                                 lcVariablesDns = lcVariablesDns, lcVariables = lcVariables, 
-                                                                                headLC = False, loss = loss, sample = sample, vNo=vNo, verify=verify)
+                                                                                headLC = False, loss = loss, sample = sample, vNo=vNo, verify=verify, rootLc = rootLc)
                             sampleInfo = {**sampleInfo, **sampleInfoLC} # sampleInfo|sampleInfoLC in python 9
                             
                             lcVariablesSet = {**lcVariablesSet, **lcVariablesLC}
@@ -1216,7 +1361,7 @@ class gurobiILPOntSolver(ilpOntSolver):
                             vDns, lcVariableUpdated = self.constructLogicalConstrains(
                                                                     e, booleanProcessor, m, dn, p, key = key, 
                                                                     lcVariablesDns = lcVariablesDns, lcVariables = lcVariables,
-                                                                    headLC = False, loss = loss, sample = sample, vNo=vNo, verify=verify)
+                                                                    headLC = False, loss = loss, sample = sample, vNo=vNo, verify=verify, rootLc = rootLc)
                             
                             vDns = self.__addLossTovDns(loss, vDns)
                             lcVariables = lcVariableUpdated
@@ -1225,8 +1370,9 @@ class gurobiILPOntSolver(ilpOntSolver):
                         self.myLogger.warning('Not found data for %s(%s) nested Logical Constraint required to build %s(%s) - skipping it'%(e.lcName,e,lc.lcName,lc))
                         return None
                         
-                    countValid = sum(1 for sublist in vDns if sublist and any(elem is not None for elem in sublist))
-                    self.myLogger.info('Size of candidate list returned by %s(%s) nested Logical Constraint is %i of which %i is not None'%(e.lcName,e,len(vDns),countValid))
+                    if self.myLogger.isEnabledFor(logging.INFO):
+                        countValid = sum(1 for sublist in vDns if sublist and any(elem is not None for elem in sublist))
+                        self.myLogger.info('Size of candidate list returned by %s(%s) nested Logical Constraint is %i of which %i is not None'%(e.lcName,e,len(vDns),countValid))
                     lcVariables[variableName] = vDns   
                     usedVariablesNames.add(variableName)    
             # Int - limit 
@@ -1283,7 +1429,7 @@ class gurobiILPOntSolver(ilpOntSolver):
     # ---------------
                 
     # -- Main method of the solver - creating ILP constraints plus objective, invoking the ILP solver and returning the result of the ILP solver classification  
-    def calculateILPSelection(self, dn, *conceptsRelations, key = ("local" , "softmax"), fun=None, epsilon = 0.00001, minimizeObjective = False, ignorePinLCs = False):
+    def calculateILPSelection(self, dn, *conceptsRelations, key = ("local" , "softmax"), fun=None, epsilon = 0.00001, minimizeObjective = False, ignorePinLCs = False, pWorkers = None):
         if self.ilpSolver == None:
             self.myLogger.warning('ILP solver not provided - returning')
             self.myLoggerTime.warning('ILP solver not provided - returning')
@@ -1296,29 +1442,53 @@ class gurobiILPOntSolver(ilpOntSolver):
         self.myLoggerTime.info('Calculating ILP Inference ')
         start = perf_counter()
 
-        gurobiEnv = Env("", empty=True)
-        gurobiEnv.setParam('OutputFlag', 0)
-        gurobiEnv.start()  
-        
         # Check if existing ILP model can be reuse without recreating ILP constraints
+        reusedModel = None
+        modelKey = None
+        gurobiEnv = None
+        leasedEnvs = [] # Environments of the models for p solved concurrently - released (or disposed) when their results are read
         try:
+            dn.setActiveLCs() # Set active logical constraints in the data node if constraints datanote set
+
             # Find count of instance in each concept 
             ilpVarCount = self.countLCVariables(dn, *conceptsRelations)
 
             reusingModel = False
             if self.reuse_model:
-                # Find it there is saved ILP model with this count of instances per concept
-                for modelDec in self.model:
-                    if ilpVarCount == modelDec[0]:
-                        m = modelDec[1]
-                        x = modelDec[2]
-                        reusingModel = True
-                        break
+                # Find if there is saved ILP model for the problem with the same structure and count of instances per concept
+                # the found model is taken out of the cache while in use so it is not shared between threads
+                modelKey = self.getModelKey(dn, ilpVarCount, conceptsRelations, ignorePinLCs = ignorePinLCs)
+                concepts = {self.getConceptName(c) : self.getConcept(c) for c in conceptsRelations}
+                if modelKey is not None:
+                    reusedModel = self.model.take(modelKey)
+                
+            # Model created in environment not owned by the pool (e.g. disposed when the pool was closed) is created again
+            reusedM = reusedModel.model if reusedModel is not None else dn.gurobiModel
+            if reusedM is not None and not getEnvPool().owns(getattr(reusedM, '_env', None)):
+                reusedModel = reusedM = None
+                dn.gurobiModel = None
+                
+            # Lease environment of the model to be reused - models of one environment are not solved concurrently
+            gurobiEnv = self.acquireEnv(reusedM)
+            
+            if self.reuse_model:
+                # Model saved in the models cache directory is read into the leased environment - not the in memory model
+                # put back meanwhile by other thread, it was created in other environment
+                if reusedModel is None and modelKey is not None and self.model.cacheDir is not None:
+                    reusedModel = self.model.read(modelKey, gurobiEnv, concepts)
+                    
+                if reusedModel is not None:
+                    m = reusedModel.model
+                    reusedModel.x = self.orderILPVariables(reusedModel.x, conceptsRelations)
+                    x = reusedModel.x
+                    reusingModel = True
                     
             if not reusingModel:
                 # If not reusing the model or if the right model was yet saved - create new Gurabi model
                 if dn.gurobiModel == None:
+                    self.resetILPVariables(dn, *conceptsRelations)
                     m = Model("decideOnClassificationResult" + str(start), gurobiEnv)
+                    m._env = gurobiEnv
                     dn.gurobiModel = m
                 else:
                     m = dn.gurobiModel
@@ -1331,12 +1501,19 @@ class gurobiILPOntSolver(ilpOntSolver):
                 x = OrderedDict()
                 
             # Handle ILP Variables for concepts and objective
-            Q = self.createILPVariables(m, x, dn, *conceptsRelations, key=key, fun=fun, epsilon = epsilon)
+            xDns = {} # Datanode of each ILP variable
+            Q = self.createILPVariables(m, x, dn, *conceptsRelations, key=key, fun=fun, epsilon = epsilon, xDns = xDns)
             
             endVariableInit = perf_counter()
             elapsedVariablesInMs = (endVariableInit - start) *1000
             self.myLoggerTime.info('ILP Variables Init - time: %ims'%(elapsedVariablesInMs))
 
+            # Warm start the reused model from its last solution
+            if reusingModel and reusedModel.start:
+                for _x, xVar in x.items():
+                    if xVar is not None and _x in reusedModel.start:
+                        xVar.Start = reusedModel.start[_x]
+                        
             if not reusingModel:
                 # Add constraints based on ontology and graph definition
                 self.addOntologyConstrains(m, dn, *conceptsRelations)
@@ -1364,7 +1541,6 @@ class gurobiILPOntSolver(ilpOntSolver):
             m.update()
             
             # Collect head logical constraints
-            dn.setActiveLCs() # Set active logical constraints in the data node if constraints datanote set
             _lcP = {}
             _lcP[100] = []
             pUsed = False
@@ -1392,9 +1568,16 @@ class gurobiILPOntSolver(ilpOntSolver):
             lcRun = {} # Keeps information about subsequent model runs
             ps = [] # List with processed p 
             
+            if pWorkers is None:
+                pWorkers = ilpConfig.get('ilpPWorkers', 1)
+            pWorkers = max(1, min(int(pWorkers), len(lcP)))
+            
             #  -----------  Run ILP solver for each p
-            for p in lcP:
-                self.processILPModelForP(p, lcP, m, x, dn, pUsed, reusingModel, ilpVarCount, minimizeObjective, lcRun)
+            if pUsed and pWorkers > 1:
+                self.processILPModelsForPConcurrently(lcP, m, x, dn, pUsed, reusingModel, modelKey, minimizeObjective, lcRun, pWorkers, xDns = xDns, envs = leasedEnvs)
+            else:
+                for p in lcP:
+                    self.processILPModelForP(p, lcP, m, x, dn, pUsed, reusingModel, modelKey, minimizeObjective, lcRun, xDns = xDns)
 
             endOptimize = perf_counter()
 
@@ -1417,118 +1600,16 @@ class gurobiILPOntSolver(ilpOntSolver):
                 
                 lcRun[maxP]['mP'].update()
                 xVars = list(lcRun[maxP]['xP'].values())
-                xVarsIndex = 0
-                solutions_to_log = set()
-
-                # Initialize at the beginning of your method
-                solutions_to_log = set()
-
-                for c in conceptsRelations:
-                    if c[2] is None:
-                        index = 0
-                    else:
-                        index = c[2] # multiclass
-                        
-                    c_root = dn.findRootConceptOrRelation(c[0])
-                    c_root_dns = dn.findDatanodes(select = c_root)
-                    
-                    ILPkey = '<' + c[0].name + '>/ILP'
-                    
-                    xkey = ILPkey + '/x'
-                    xPkey = ILPkey + '/xP'
-                    xNotPkey = ILPkey + '/notxP'
-                    
-                    ilpTensor = None
-                    if getDnSkeletonMode() and "variableSet" in dn.attributes:
-                        ilpKeyInVariableSet = c_root.name + "/<" + c[0].name +">" + "/ILP"
-                        
-                        if ilpKeyInVariableSet in dn.attributes["variableSet"]:
-                            ilpTensor = dn.attributes["variableSet"][ilpKeyInVariableSet]
-                        else:
-                            ilpTensor = torch.zeros([len(c_root_dns), c[3]], dtype=torch.float, device=self.current_device)
                 
-                    for i, cDn in enumerate(c_root_dns):
-                        dnAtt = cDn.getAttributes()
-                        
-                        if xkey not in dnAtt and xPkey not in dnAtt:
-                            if xVars[xVarsIndex] == None or not reusingModel:
-                                
-                                if ilpTensor is not None:
-                                    ilpTensor[i][index] = float("nan")
-                                else:
-                                    if ILPkey not in dnAtt:
-                                        dnAtt[ILPkey] = torch.empty(c[3], dtype=torch.float)
-                                    
-                                    dnAtt[ILPkey][index] = float("nan")
-
-                                # Update index for x variables 
-                                if c[2] is None:
-                                    xVarsIndex +=2 # skip Not variable
-                                else:
-                                    xVarsIndex +=1
-                                    
-                                continue 
-                            else:
-                                if pUsed: 
-                                    dnAtt[xPkey] = {}
-                                    dnAtt[xPkey][maxP] = [None] * c[3]
-                                    dnAtt[xPkey][maxP][index] = xVars[xVarsIndex]
-                                else:
-                                    dnAtt[xkey] = [None] * c[3]
-                                    dnAtt[xkey][index] = xVars[xVarsIndex]
-                        
-                        if pUsed: 
-                            if dnAtt[xPkey][maxP][index] == None:
-                                dnAtt[xPkey][maxP][index] = xVars[xVarsIndex]
-                        else:
-                            if dnAtt[xkey][index] == None:
-                                dnAtt[xkey][index] = xVars[xVarsIndex]
-                                    
-                        # Update index for x variables           
-                        if c[2] is None:
-                            xVarsIndex +=2 # skip Not variable
-                        else:
-                            xVarsIndex +=1
-                            
-                        #  Get solution    
-                        if pUsed:
-                            solution = dnAtt[xPkey][maxP][index].X
-                        else:
-                            solution = dnAtt[xkey][index].X
-                            
-                        if solution == 0:
-                            solution = 0
-                        elif solution == 1: 
-                            solution = 1
-
-                        if ilpTensor is None and ILPkey not in dnAtt:
-                            dnAtt[ILPkey] = torch.full((c[3],), float("nan"))
-                        
-                        if xkey not in dnAtt:
-                            dnAtt[xkey] = torch.full((c[3],), float("nan"))
-                    
-                        if ilpTensor is not None:
-                            ilpTensor[i][index] = solution
-                        else:
-                            dnAtt[ILPkey][index] = solution
-                            
-                        if pUsed: # Set main ILP variable x based on max P ILP variable x
-                            dnAtt[xkey][index] = dnAtt[xPkey][maxP][index]
-                            if xNotPkey in dnAtt: # do this for not x as well
-                                dnAtt[xNotPkey][index] = dnAtt[xNotPkey][maxP][index]
-
-                        # Only log positive concepts when solution == 1
-                        # Skip negative concepts (those with "not_" in the name)
-                        if solution == 1 and not c[1].startswith("not_"):
-                            solutions_to_log.add((cDn, c[1]))
-                    
-                    if ilpTensor is not None:
-                        dn.attributes["variableSet"][ilpKeyInVariableSet] = ilpTensor
+                # Keep the solution as MIP start for the next run of the cached model
+                if modelKey is not None:
+                    xStart = {_x : xVar.X for _x, xVar in lcRun[maxP]['xP'].items() if xVar is not None}
+                    if reusedModel is not None:
+                        reusedModel.start = xStart
+                    else:
+                        self.model.setStart(modelKey, xStart)
                         
-                # Log all solutions in sorted order (only positive concepts)
-                if solutions_to_log:
-                    self.log_sorted_solutions(solutions_to_log)
-                    solutions_to_log.clear()
+                self.setILPSolution(dn, conceptsRelations, xVars, pUsed, maxP, reusingModel)
                     
             else:
                 end = perf_counter()
@@ -1551,6 +1632,19 @@ class gurobiILPOntSolver(ilpOntSolver):
             self.myLoggerTime.error('Error returning solutions -  %s'%(inst))
             
             raise
+        finally:
+            # Return the reused model to the models cache
+            if reusedModel is not None:
+                self.model.put(modelKey, reusedModel)
+                
+            for env in leasedEnvs:
+                if getEnvPool().owns(env):
+                    getEnvPool().release(env)
+                else: # Started for the p model as no pooled environment was free
+                    getEnvPool().disposeEnv(env)
+                    
+            if gurobiEnv is not None:
+                getEnvPool().release(gurobiEnv)
            
         endResultPrep = perf_counter()
         elapsedResultPrepInMs = (endResultPrep - endOptimize) *1000
@@ -1573,6 +1667,229 @@ class gurobiILPOntSolver(ilpOntSolver):
         # ----------- Return
         return
 
+    # Solve the ILP problems of the batch items (children of the batch DataNode dn) as one block diagonal model - a single optimize call
+    # finds solutions of all the items. Each item has its own block of variables and constraints, built in the query scope of the item
+    # data graph (DataNodeIndex.scope of its batchIndexes entry), so its LCs are grounded only in the item, and its solution is set
+    # in the item DataNodes in the same scope.
+    # Returns False if the items have to be solved separately - LCs with p lower than 100 are used (the best p is selected per item)
+    # or the batch model can not be solved (the failing items are then found by solving them separately).
+    def calculateILPSelectionForBatch(self, dn, *conceptsRelations, batchIndexes = None, key = ("local" , "softmax"), fun=None, epsilon = 0.00001, minimizeObjective = False, ignorePinLCs = False):
+        batchDns = dn.relationLinks.get('contains')
+        if self.ilpSolver == None or not batchDns or batchIndexes is None or getDnSkeletonMode():
+            return False
+        
+        self.current_device = dn.current_device
+        
+        self.myLogger.info('Calculating ILP Inference for batch of %i items in one model'%(len(batchDns)))
+        self.myLoggerTime.info('Calculating ILP Inference for batch of %i items in one model'%(len(batchDns)))
+        start = perf_counter()
+
+        gurobiEnv = self.acquireEnv()
+        try:
+            return self.solveILPBatchModel(dn, batchDns, batchIndexes, gurobiEnv, start, *conceptsRelations, key=key, fun=fun, epsilon=epsilon, minimizeObjective=minimizeObjective, ignorePinLCs=ignorePinLCs)
+        finally:
+            getEnvPool().release(gurobiEnv)
+            
+    def solveILPBatchModel(self, dn, batchDns, batchIndexes, gurobiEnv, start, *conceptsRelations, key = ("local" , "softmax"), fun=None, epsilon = 0.00001, minimizeObjective = False, ignorePinLCs = False):
+        m = Model("decideOnClassificationResultBatch" + str(start), gurobiEnv)
+        m._env = gurobiEnv
+        m.params.outputflag = 0
+        
+        # ----------- Add block of each batch item problem to the model - built in the query scope of the item data graph
+        Q = None
+        itemBlocks = [] # ILP variables of the block of each batch item
+        lcs = []
+        for batchDn, batchIndex in zip(batchDns, batchIndexes):
+            with DataNodeIndex.scope(batchIndex):
+                batchDn.setActiveLCs() # Set active logical constraints in the data node if constraints datanote set
+                
+                itemLcs = [lc for graph in self.myGraph for lc in graph.logicalConstrains.values() if lc.headLC and lc.active]
+                if not ignorePinLCs and any(lc.p != 100 for lc in itemLcs):
+                    self.myLogger.info('Found logical constraints with p lower than 100 - batch items are solved separately')
+                    self.myLoggerTime.info('Found logical constraints with p lower than 100 - batch items are solved separately')
+                    
+                    self.resetILPVariables(dn, *conceptsRelations)
+                    return False
+                
+                # Variables of the block are created in the batch model
+                self.resetILPVariables(batchDn, *conceptsRelations)
+                
+                x = OrderedDict()
+                blockQ = self.createILPVariables(m, x, batchDn, *conceptsRelations, key=key, fun=fun, epsilon = epsilon)
+                
+                self.addOntologyConstrains(m, batchDn, *conceptsRelations)
+                self.addGraphConstrains(m, batchDn, *conceptsRelations)
+                self.addMulticlassExclusivity(conceptsRelations, batchDn, m)
+                self.addLogicalConstrains(m, batchDn, itemLcs, 100, key = "/ILP/x")
+                
+            if blockQ is not None:
+                Q = blockQ if Q is None else Q + blockQ
+            itemBlocks.append(x)
+            lcs.extend(itemLcs)
+            
+        endModel = perf_counter()
+        self.myLoggerTime.info('ILP Batch Model with %i blocks - time: %ims'%(len(itemBlocks), (endModel - start) * 1000))
+        
+        # ILP Model objective setup
+        if Q is None:
+            Q = 0
+            self.myLogger.error("No data provided to create any ILP variable - not ILP result returned")
+            self.myLoggerTime.error("No data provided to create any ILP variable - not ILP result returned")
+            
+        if minimizeObjective:
+            m.setObjective(Q, GRB.MINIMIZE)
+        else:
+            m.setObjective(Q, GRB.MAXIMIZE) # -------- Default
+        
+        # ----------- Run ILP model for all the items
+        lcRun = {}
+        try:
+            elapsedOptimizeInMs = self.optimizeILPModelForP(100, m)
+            self.collectILPModelResultForP(100, m, None, lcs, elapsedOptimizeInMs, minimizeObjective, lcRun)
+        except gurobipy.GurobiError as e: # e.g. the batch model is too large for the license
+            self.myLogger.warning('ILP Batch Model can not be solved - %s'%(e))
+            lcRun[100] = {'solved': False}
+        
+        if not lcRun[100]['solved']:
+            self.myLogger.info('ILP Batch Model has no solution - batch items are solved separately')
+            self.myLoggerTime.info('ILP Batch Model has no solution - batch items are solved separately')
+            
+            self.resetILPVariables(dn, *conceptsRelations)
+            return False
+        
+        # ----------- Split the solution back to the batch items - from the variables of their blocks
+        for batchDn, batchIndex, x in zip(batchDns, batchIndexes, itemBlocks):
+            with DataNodeIndex.scope(batchIndex):
+                self.resetILPVariables(batchDn, *conceptsRelations)
+                self.setILPSolution(batchDn, conceptsRelations, list(x.values()), False, 100, True)
+        
+        # Variables of the items keep the batch model
+        dn.gurobiModel = m
+        
+        end = perf_counter()
+        elapsedInS = end - start
+        if elapsedInS > 1:
+            self.myLogger.info('End ILP Batch Inference - internal total time: %fs'%(elapsedInS))
+            self.myLoggerTime.info('End ILP Batch Inference - internal total time: %fs'%(elapsedInS))
+        else:
+            elapsedInMs = elapsedInS *1000
+            self.myLogger.info('End ILP Batch Inference - internal total time: %ims'%(elapsedInMs))
+            self.myLoggerTime.info('End ILP Batch Inference - internal total time: %ims'%(elapsedInMs))
+        
+        return True
+    
+    # Set the ILP solution (values of the ILP variables xVars of the best p run) in the DataNodes of the data graph
+    def setILPSolution(self, dn, conceptsRelations, xVars, pUsed, maxP, reusingModel):
+        xVarsIndex = 0
+        solutions_to_log = set()
+
+        for c in conceptsRelations:
+            if c[2] is None:
+                index = 0
+            else:
+                index = c[2] # multiclass
+                
+            c_root = dn.findRootConceptOrRelation(c[0])
+            c_root_dns = dn.findDatanodes(select = c_root)
+            
+            ILPkey = '<' + c[0].name + '>/ILP'
+            
+            xkey = ILPkey + '/x'
+            xPkey = ILPkey + '/xP'
+            xNotPkey = ILPkey + '/notxP'
+            
+            ilpTensor = None
+            if getDnSkeletonMode() and "variableSet" in dn.attributes:
+                ilpKeyInVariableSet = c_root.name + "/<" + c[0].name +">" + "/ILP"
+                
+                if ilpKeyInVariableSet in dn.attributes["variableSet"]:
+                    ilpTensor = dn.attributes["variableSet"][ilpKeyInVariableSet]
+                else:
+                    ilpTensor = torch.zeros([len(c_root_dns), c[3]], dtype=torch.float, device=self.current_device)
+        
+            for i, cDn in enumerate(c_root_dns):
+                dnAtt = cDn.getAttributes()
+                
+                if xkey not in dnAtt and xPkey not in dnAtt:
+                    if xVars[xVarsIndex] == None or not reusingModel:
+                        
+                        if ilpTensor is not None:
+                            ilpTensor[i][index] = float("nan")
+                        else:
+                            if ILPkey not in dnAtt:
+                                dnAtt[ILPkey] = torch.empty(c[3], dtype=torch.float)
+                            
+                            dnAtt[ILPkey][index] = float("nan")
+
+                        # Update index for x variables 
+                        if c[2] is None:
+                            xVarsIndex +=2 # skip Not variable
+                        else:
+                            xVarsIndex +=1
+                            
+                        continue 
+                    else:
+                        if pUsed: 
+                            dnAtt[xPkey] = {}
+                            dnAtt[xPkey][maxP] = [None] * c[3]
+                            dnAtt[xPkey][maxP][index] = xVars[xVarsIndex]
+                        else:
+                            dnAtt[xkey] = [None] * c[3]
+                            dnAtt[xkey][index] = xVars[xVarsIndex]
+                
+                if pUsed: 
+                    if dnAtt[xPkey][maxP][index] == None:
+                        dnAtt[xPkey][maxP][index] = xVars[xVarsIndex]
+                else:
+                    if dnAtt[xkey][index] == None:
+                        dnAtt[xkey][index] = xVars[xVarsIndex]
+                            
+                # Update index for x variables           
+                if c[2] is None:
+                    xVarsIndex +=2 # skip Not variable
+                else:
+                    xVarsIndex +=1
+                    
+                #  Get solution    
+                if pUsed:
+                    solution = dnAtt[xPkey][maxP][index].X
+                else:
+                    solution = dnAtt[xkey][index].X
+                    
+                if solution == 0:
+                    solution = 0
+                elif solution == 1: 
+                    solution = 1
+
+                if ilpTensor is None and ILPkey not in dnAtt:
+                    dnAtt[ILPkey] = torch.full((c[3],), float("nan"))
+                
+                if xkey not in dnAtt:
+                    dnAtt[xkey] = torch.full((c[3],), float("nan"))
+            
+                if ilpTensor is not None:
+                    ilpTensor[i][index] = solution
+                else:
+                    dnAtt[ILPkey][index] = solution
+                    
+                if pUsed: # Set main ILP variable x based on max P ILP variable x
+                    dnAtt[xkey][index] = dnAtt[xPkey][maxP][index]
+                    if xNotPkey in dnAtt: # do this for not x as well
+                        dnAtt[xNotPkey][index] = dnAtt[xNotPkey][maxP][index]
+
+                # Only log positive concepts when solution == 1
+                # Skip negative concepts (those with "not_" in the name)
+                if solution == 1 and not c[1].startswith("not_"):
+                    solutions_to_log.add((cDn, c[1]))
+            
+            if ilpTensor is not None:
+                dn.attributes["variableSet"][ilpKeyInVariableSet] = ilpTensor
+                
+        # Log all solutions in sorted order (only positive concepts)
+        if solutions_to_log:
+            self.log_sorted_solutions(solutions_to_log)
+            solutions_to_log.clear()
+
     def log_sorted_solutions(self, solutions_to_log):
         """
         Remove duplicates, sort solutions by datanode name and concept, then log them
@@ -1597,48 +1914,150 @@ class gurobiILPOntSolver(ilpOntSolver):
             else:
                 self.myLogger.info('"%s" is "%s"', dn_str, concept)
             
-    def processILPModelForP(self, p, lcP, m, x, dn, pUsed, reusingModel, ilpVarCount, minimizeObjective, lcRun):
-        ps = []
-        ps.append(p)
+    def processILPModelForP(self, p, lcP, m, x, dn, pUsed, reusingModel, modelKey, minimizeObjective, lcRun, xDns = None):
+        mP, xP, lcs = self.prepareILPModelForP(p, lcP, m, x, dn, pUsed, reusingModel, modelKey, xDns = xDns)
         
+        elapsedOptimizeInMs = self.optimizeILPModelForP(p, mP)
+        
+        self.collectILPModelResultForP(p, mP, xP, lcs, elapsedOptimizeInMs, minimizeObjective, lcRun)
+    
+    # Solve the models for all p with the pool of pWorkers threads.
+    # Models are prepared in p order, each copied into its own Gurobi environment as environments are not thread safe.
+    # The LCs set for p includes LCs of all higher p, so the objective value can only get worse for lower p.
+    # Runs for lower p are cancelled as soon as the run for a higher p is infeasible or has worse objective value 
+    # than a run for an even higher p - they can not be selected as the best solution.
+    # Environments of the p models are added to envs - after reading the results the caller returns them to the pool
+    # and disposes the ones started outside of it.
+    def processILPModelsForPConcurrently(self, lcP, m, x, dn, pUsed, reusingModel, modelKey, minimizeObjective, lcRun, pWorkers, xDns = None, envs = None):
+        ps = list(lcP)
+        
+        pModels = {}
+        for p in ps:
+            # Not waiting for a pooled environment while holding the environment of the model - new one is started if none is free
+            pEnv = getEnvPool().acquire(wait = False) if envs is not None else None
+            if pEnv is None:
+                pEnv = Env("", empty=True)
+                pEnv.setParam('OutputFlag', 0)
+                pEnv.start()
+            if envs is not None:
+                envs.append(pEnv)
+            
+            pModels[p] = self.prepareILPModelForP(p, lcP, m, x, dn, pUsed, reusingModel, modelKey, xDns = xDns, env = pEnv)
+        
+        cancelled = set()
+        cancelLock = threading.Lock()
+        
+        def optimizeP(p):
+            with cancelLock:
+                if p in cancelled:
+                    return None
+                
+            return self.optimizeILPModelForP(p, pModels[p][0])
+        
+        pElapsed = {}
+        pResults = {}
+        with ThreadPoolExecutor(max_workers=pWorkers, thread_name_prefix='ILPForP') as executor:
+            pFutures = {p : executor.submit(optimizeP, p) for p in ps}
+            futuresP = {pFuture : p for p, pFuture in pFutures.items()}
+            
+            for pFuture in as_completed(futuresP):
+                p = futuresP[pFuture]
+                if pFuture.cancelled():
+                    continue
+                
+                pElapsed[p] = pFuture.result()
+                if p in cancelled:
+                    continue
+                
+                mP = pModels[p][0]
+                pResults[p] = mP.ObjVal if mP.status == GRB.Status.OPTIMAL else None
+                
+                # Find the first p for which the runs for all lower p can not be the best solution
+                bestObjValue = None
+                for cutIndex, _p in enumerate(ps):
+                    if _p not in pResults:
+                        continue
+                    
+                    objValue = pResults[_p]
+                    if objValue is None:
+                        break
+                    if bestObjValue is not None and (objValue > bestObjValue if minimizeObjective else objValue < bestObjValue):
+                        break
+                    if bestObjValue is None or (objValue < bestObjValue if minimizeObjective else objValue > bestObjValue):
+                        bestObjValue = objValue
+                else:
+                    continue
+                
+                with cancelLock:
+                    for _p in ps[cutIndex + 1:]:
+                        if _p not in cancelled and _p not in pResults:
+                            cancelled.add(_p)
+                            pFutures[_p].cancel()
+                            pModels[_p][0].terminate()
+        
+        # Collect results in p order
+        for p in ps:
+            mP, xP, lcs = pModels[p]
+            if p in cancelled:
+                self.myLogger.info('Optimization cancelled for p - %i - its solution can not be better than solutions for higher p' % (p))
+                self.myLoggerTime.info('Optimization cancelled for p - %i' % (p))
+                
+                lcRun[p] = {'p': p, 'solved': False, 'objValue': None, 'lcs': lcs, 'mP': mP, 'xP': xP, 'elapsedOptimize': pElapsed.get(p)}
+            else:
+                self.collectILPModelResultForP(p, mP, xP, lcs, pElapsed[p], minimizeObjective, lcRun)
+    
+    # Copy the model for p (if p levels are used), add LCs to it and return (mP, xP, lcs)
+    def prepareILPModelForP(self, p, lcP, m, x, dn, pUsed, reusingModel, modelKey, xDns = None, env = None):
         startLogicalConstraintsPrep = perf_counter()
 
         if pUsed:
-            mP = m.copy()  # Copy model for this run
+            mP = m.copy(env) if env is not None else m.copy()  # Copy model for this run
+            if env is not None:
+                mP._env = env
             xP = {}
             lckey = "/ILP/xP"
             
             pStart = perf_counter()
             
-            for _x in x:
-                # Map variables to the new copy model
-                xP[_x] = mP.getVarByName(x[_x].VarName)
+            if xDns is None:
+                xDns = {}
+                for _x in x:
+                    rootConcept = dn.findRootConceptOrRelation(_x[0])
+                    dns = dn.findDatanodes(select=((rootConcept,), ("instanceID", _x[2])))
+                    if dns:
+                        xDns[_x] = dns[0]
+            
+            # The copied model keeps the order of variables - map variables to the new copy model by their index
+            mPVars = mP.getVars()
+            
+            for _x, xVar in x.items():
+                xPVar = mPVars[xVar.index] if xVar is not None else None
+                xP[_x] = xPVar
                 
-                rootConcept = dn.findRootConceptOrRelation(_x[0])
+                xDn = xDns.get(_x)
+                if xDn is None:
+                    continue
                 
-                dns = dn.findDatanodes(select=((rootConcept,), ("instanceID", _x[2])))
+                if _x[1].startswith('Not'):
+                    xPkey = '<' + _x[0].name + '>/ILP/notxP'
+                else:
+                    xPkey = '<' + _x[0].name + '>/ILP/xP'
                 
-                if dns:
-                    if _x[1].startswith('Not'):
-                        xPkey = '<' + _x[0].name + '>/ILP/notxP'
-                    else:
-                        xPkey = '<' + _x[0].name + '>/ILP/xP'
-                    
-                    if xPkey not in dns[0].attributes:
-                        dns[0].attributes[xPkey] = {}
-                    
-                    if p not in dns[0].attributes[xPkey]:
-                        xkey = '<' + _x[0].name + '>/ILP/x'
-                        if xkey not in dns[0].attributes:
-                            continue
-                        
-                        xLen = len(dns[0].attributes[xkey])
-                        dns[0].attributes[xPkey][p] = [None] * xLen
-                    
-                    dns[0].attributes[xPkey][p][_x[3]] = mP.getVarByName(x[_x].VarName)
+                if xPkey not in xDn.attributes:
+                    xDn.attributes[xPkey] = {}
+                
+                if p not in xDn.attributes[xPkey]:
+                    xkey = '<' + _x[0].name + '>/ILP/x'
+                    if xkey not in xDn.attributes:
+                        continue
                     
-                    pEnd = perf_counter()
-                    self.myLoggerTime.info('ILP Model init for p %i - time: %ims' % (p, (pEnd - pStart) * 1000))
+                    xLen = len(xDn.attributes[xkey])
+                    xDn.attributes[xPkey][p] = [None] * xLen
+                
+                xDn.attributes[xPkey][p][_x[3]] = xPVar
+                
+            pEnd = perf_counter()
+            self.myLoggerTime.info('ILP Model init for p %i - time: %ims' % (p, (pEnd - pStart) * 1000))
         else:
             mP = m
             xP = x
@@ -1661,21 +2080,25 @@ class gurobiILPOntSolver(ilpOntSolver):
             self.addLogicalConstrains(mP, dn, lcs, p, key=lckey)  # <--- LC constraints
             
             # Save model
-            if self.reuse_model:
-                self.model.append((ilpVarCount, mP, xP))
-                import sys
-                memoryUsage = sys.getsizeof(mP)
+            if modelKey is not None:
+                evicted = self.model.put(modelKey, ILPModelCacheEntry(mP, xP))
+                if evicted:
+                    self.myLoggerTime.info(f'ILP Logical Constraints Preprocessing - evicted {len(evicted)} least recently used Gurobi models from the cache')
                 # Convert bytes to kilobytes
-                memoryUsage_kB = memoryUsage / 1024
-                self.myLoggerTime.info(f'ILP Logical Constraints Preprocessing - memory use by saved Gurobi models: {memoryUsage_kB:.2f} kB')
-        
-        self.myLogger.info('Optimizing model for LCs with probabilities %s with %i ILP variables and %i ILP constraints' % (p, mP.NumVars, mP.NumConstrs))
-        self.myLoggerTime.info('Optimizing model for LCs with probabilities %s with %i ILP variables and %i ILP constraints' % (p, mP.NumVars, mP.NumConstrs))
+                memoryUsage_kB = self.model.totalSize / 1024
+                self.myLoggerTime.info(f'ILP Logical Constraints Preprocessing - estimated memory use by {len(self.model)} saved Gurobi models: {memoryUsage_kB:.2f} kB')
         
         endLogicalConstraints = perf_counter()
         elapsedLogicalConstraintsInMs = (endLogicalConstraints - endLogicalConstraintsPrep) * 1000
         self.myLoggerTime.info('ILP Logical Constraints - time: %ims' % (elapsedLogicalConstraintsInMs))
         
+        return mP, xP, lcs
+    
+    # Run ILP model for p and return the optimize time in ms
+    def optimizeILPModelForP(self, p, mP):
+        self.myLogger.info('Optimizing model for LCs with probabilities %s with %i ILP variables and %i ILP constraints' % (p, mP.NumVars, mP.NumConstrs))
+        self.myLoggerTime.info('Optimizing model for LCs with probabilities %s with %i ILP variables and %i ILP constraints' % (p, mP.NumVars, mP.NumConstrs))
+        
         startOptimize = perf_counter()
         
         # ----------- Run ILP model - Find solution
@@ -1685,6 +2108,10 @@ class gurobiILPOntSolver(ilpOntSolver):
         endOptimize = perf_counter()
         elapsedOptimizeInMs = (endOptimize - startOptimize) * 1000
         
+        return elapsedOptimizeInMs
+    
+    # Check result of the model run for p, write model files and keep the result in lcRun
+    def collectILPModelResultForP(self, p, mP, xP, lcs, elapsedOptimizeInMs, minimizeObjective, lcRun):
         # ----------- Check model run result
         solved = False
         objValue = None
@@ -1706,38 +2133,40 @@ class gurobiILPOntSolver(ilpOntSolver):
             self.myLogger.error('Optimal solution not was found for p - %i - error code %i' % (p, mP.status))
             self.myLoggerTime.error('Optimal solution not was found for p - %i - error code %i' % (p, mP.status))
         
-         # ----------- Write model to file if logging level is INFO
-        if self.myLogger.level <= logging.INFO:
-            model_path = "logs/GurobiModel.lp"
-            if os.path.exists(model_path):
-                os.remove(model_path)
-            mP.write(model_path) # Write model to file
-           
-        # ----------- Write infeasible model to file if model was proven to be infeasible or solution when found
-        infeasible_path = "logs/GurobiInfeasible.ilp"
-        sol_path = "logs/GurobiSolution.sol"
-        json_path = "logs/GurobiSolution.json"
-
-        if not solved:
-            # Remove solution files if they exist from previous runs
-            if os.path.exists(sol_path):
-                os.remove(sol_path)
-            if os.path.exists(json_path):
-                os.remove(json_path)
-            mP.computeIIS()
-            if os.path.exists(infeasible_path):
-                os.remove(infeasible_path)
-            mP.write(infeasible_path)
-        elif self.myLogger.level <= logging.INFO:
-            # Remove infeasible file and solution files if they exist from previous runs
-            if os.path.exists(infeasible_path):
-                os.remove(infeasible_path)
-            if os.path.exists(sol_path):
-                os.remove(sol_path)
-            if os.path.exists(json_path):
-                os.remove(json_path)
-            mP.write(sol_path) # Write solution to file
-            mP.write(json_path) # Write solution to file in json format extended
+        # Model files are shared by all runs - serialize writing when batch items are solved in parallel
+        with self.modelFilesLock:
+            # ----------- Write model to file if logging level is INFO
+            if self.myLogger.level <= logging.INFO:
+                model_path = "logs/GurobiModel.lp"
+                if os.path.exists(model_path):
+                    os.remove(model_path)
+                mP.write(model_path) # Write model to file
+               
+            # ----------- Write infeasible model to file if model was proven to be infeasible or solution when found
+            infeasible_path = "logs/GurobiInfeasible.ilp"
+            sol_path = "logs/GurobiSolution.sol"
+            json_path = "logs/GurobiSolution.json"
+
+            if not solved:
+                # Remove solution files if they exist from previous runs
+                if os.path.exists(sol_path):
+                    os.remove(sol_path)
+                if os.path.exists(json_path):
+                    os.remove(json_path)
+                mP.computeIIS()
+                if os.path.exists(infeasible_path):
+                    os.remove(infeasible_path)
+                mP.write(infeasible_path)
+            elif self.myLogger.level <= logging.INFO:
+                # Remove infeasible file and solution files if they exist from previous runs
+                if os.path.exists(infeasible_path):
+                    os.remove(infeasible_path)
+                if os.path.exists(sol_path):
+                    os.remove(sol_path)
+                if os.path.exists(json_path):
+                    os.remove(json_path)
+                mP.write(sol_path) # Write solution to file
+                mP.write(json_path) # Write solution to file in json format extended
         
         # Keep result of the model run
         lcRun[p] = {'p': p, 'solved': solved, 'objValue': objValue, 'lcs': lcs, 'mP': mP, 'xP': xP, 'elapsedOptimize': elapsedOptimizeInMs}
@@ -1748,30 +2177,21 @@ class gurobiILPOntSolver(ilpOntSolver):
                     
         variablesSamplesT = torch.stack(variablesSamples)
         
-        uniqueSampleIndex = OrderedDict()
+        # Samples packed into words of 63 variable bits - duplicates found by one torch.unique over the packed rows
+        sampleBits = variablesSamplesT[:, :sampleSize].bool().t()
+        packedWords = []
+        for start in range(0, sampleBits.shape[1], 63):
+            wordBits = sampleBits[:, start:start + 63].long()
+            packedWords.append((wordBits << torch.arange(wordBits.shape[1], device=wordBits.device)).sum(dim=1))
+        _, inverse = torch.unique(torch.stack(packedWords, dim=1), dim=0, return_inverse=True)
         
-        for i in range(sampleSize):
-            currentS = variablesSamplesT[:,i]
-            
-            currentSHash = hash(currentS.cpu().detach().numpy().tobytes())
-            
-            if currentSHash in uniqueSampleIndex:
-                continue
-                
-                # For testing  - not used now
-                if torch.equal(currentS, variablesSamplesT[:,uniqueSampleIndex[currentSHash]]):
-                    continue
-                else:
-                    raise Exception("HashWrong")
-            else:
-                uniqueSampleIndex[currentSHash] = i
+        # First occurrence of each unique sample, kept in the sample order
+        firstIndex = torch.full((int(inverse.max()) + 1,), sampleSize, dtype=torch.long, device=inverse.device)
+        firstIndex.scatter_reduce_(0, inverse, torch.arange(sampleSize, device=inverse.device), reduce='amin')
+        indices = torch.sort(firstIndex).values.to(self.current_device)
             
-        va = list(uniqueSampleIndex.values())
-            
-        newSampleSize = len(va)
+        newSampleSize = indices.shape[0]
     
-        indices = torch.tensor(va, device = self.current_device)
-        #x = torch.arange(6).view(2,3)
         Vs = torch.index_select(variablesSamplesT, dim=1, index=indices)
         
         return newSampleSize, indices, Vs
@@ -1793,35 +2213,34 @@ class gurobiILPOntSolver(ilpOntSolver):
 
             #lossTensor = countSuccesses.div_(len(lossList))
             
+        P, S = [], []
         for i, v in enumerate(lcVariables):
             currentV = lcVariables[v]
             
             if eliminateDuplicateSamples:
-                P = currentV[0][:lcSampleSize] # Tensor with the current variable p (v[0])
-            else:
-                P = currentV[0]
-            oneMinusP = torch.sub(torch.ones(lcSampleSize, device=self.current_device), P) # Tensor with the current variable 1-p
-            
-            if eliminateDuplicateSamples:
-                S = Vs[i, :] #currentV[1] # Sample for the current Variable
+                currentS = Vs[i, :] #currentV[1] # Sample for the current Variable
             else:
-                S = currentV[1]
+                currentS = currentV[1]
                 
-            if isinstance(S, list):
+            if isinstance(currentS, list):
                 continue
             
-            notS = torch.sub(torch.ones(lcSampleSize, device=self.current_device), S.float()) # Negation of Sample
-            
-            pS = torch.mul(P, S) # Tensor with p multiply by True variable sample
-            oneMinusPS = torch.mul(oneMinusP, notS) # Tensor with 1-p multiply by False variable sample
+            if eliminateDuplicateSamples:
+                P.append(currentV[0][:lcSampleSize]) # Tensor with the current variable p (v[0])
+            else:
+                P.append(currentV[0])
+            S.append(currentS)
             
-            cLoss = torch.add(pS, oneMinusPS) # Sum of p and 1-p tensors
+        if P:
+            # All variables at once - [variables, samples] tensor with p where the variable is sampled True and 1-p where False
+            P = torch.stack(torch.broadcast_tensors(*P))
+            cLoss = torch.where(torch.stack(S).bool(), P, 1 - P)
                                             
             # Multiply the loss
             if replace_mul:
-                lossTensor = lossTensor + torch.log(cLoss)
+                lossTensor = lossTensor + torch.log(cLoss).sum(dim=0)
             else:
-                lossTensor.mul_(cLoss)
+                lossTensor.mul_(cLoss.prod(dim=0))
         
         # if replace_mul:
         #     lossTensor = torch.exp(lossTensor)
@@ -1832,9 +2251,9 @@ class gurobiILPOntSolver(ilpOntSolver):
         
         # Collect master concepts with length of multiclass set
         masterConcepts = OrderedDict()
-        productConcepts = []
+        productVariables = [] # (concept name, concept info, datanode) of each sampled variable
         productSize = 1
-        productArgs = []
+        productArgs = [] # Number of labels of each sampled variable
         for currentConceptRelation in conceptsRelations:
             currentConceptName = self.getConceptName(currentConceptRelation)
             
@@ -1859,14 +2278,19 @@ class gurobiILPOntSolver(ilpOntSolver):
                 if self.isConceptFixed(currentConceptName):
                     continue
                 
-                for _ in dns:
-                    productArgs.append(masterConcepts[currentConceptName]["range"])
+                for dn in dns:
+                    productVariables.append((currentConceptName, masterConcepts[currentConceptName], dn))
+                    productArgs.append(conceptRange)
                     productSize *= conceptRange
-                    
-                productConcepts.append(currentConceptName)
             else:
                 masterConcepts[currentConceptName]['e'].append(currentConceptRelation)
 
+        # The whole product of the labels or - when larger than the limit - its subsample
+        usedSampleSize = productSize
+        if self.semanticSampleMaxSize and productSize > self.semanticSampleMaxSize:
+            usedSampleSize = self.semanticSampleMaxSize
+            self.myLogger.info('Semantic sample space of %i assignments is subsampled (%s) to %i samples'%(productSize, self.semanticSampleMode, usedSampleSize))
+
         # Init sample 
         for mConcept in masterConcepts:
             mConceptInfo = masterConcepts[mConcept]
@@ -1890,30 +2314,72 @@ class gurobiILPOntSolver(ilpOntSolver):
                         
                     if isFiexd != None:
                         if isFiexd == 1:
-                            dn.getAttributes()[mConceptInfo['xkey']][sampleSize][i] = torch.ones((productSize,), device = self.current_device)
+                            dn.getAttributes()[mConceptInfo['xkey']][sampleSize][i] = torch.ones((usedSampleSize,), device = self.current_device)
                             continue
                         
-                    dn.getAttributes()[mConceptInfo['xkey']][sampleSize][i] = torch.zeros((productSize,), device = self.current_device)
-             
-        from itertools import product
-        for j, p in enumerate(product(*productArgs, repeat=1)):
-            index = 0
-            if mConceptInfo["binary"]:
-                index = 1
-            for pConcept in productConcepts:
-                pConceptInfo = masterConcepts[pConcept]
-
-                for dn in pConceptInfo['dns']:
-                    try:
-                        dn.getAttributes()[pConceptInfo['xkey']][sampleSize][p[index]][j] = 1
-                    except:
-                        pass
-                    index +=1
+                    dn.getAttributes()[mConceptInfo['xkey']][sampleSize][i] = torch.zeros((usedSampleSize,), device = self.current_device)
         
-        return productSize
+        # Fill the sample chunk by chunk - binary concepts have only the label 1 sample
+        for start, labels in self.semanticSampleChunks(productVariables, productArgs, productSize, usedSampleSize):
+            end = start + labels.shape[1]
+            for (_, pConceptInfo, dn), variableLabels in zip(productVariables, labels):
+                for label, labelSample in dn.getAttributes()[pConceptInfo['xkey']][sampleSize].items():
+                    labelSample[start:end].masked_fill_(variableLabels == label, 1)
+        
+        return usedSampleSize
+    
+    def semanticSampleChunks(self, productVariables, productArgs, productSize, sampleSize):
+        """
+        Yields the semantic sample in chunks of semanticSampleChunkSize samples as (start, labels) -
+        labels[k] holds the labels of the k-th product variable in the samples start, start + 1, ...
+        
+        The whole product (sampleSize == productSize) is enumerated by mixed-radix decoding of the sample
+        indexes, the last variable changing fastest as in itertools.product. A larger product is subsampled -
+        the labels are drawn uniformly or, in the importance mode, from the variable probabilities.
+        """
+        if sampleSize < productSize:
+            weights = []
+            for conceptName, _, dn in productVariables:
+                conceptRange = productArgs[len(weights)]
+                weight = torch.ones(conceptRange, device = self.current_device)
+                
+                if self.semanticSampleMode == 'importance':
+                    probabilities = dn.getAttribute('<' + conceptName + '>/local/softmax')
+                    if torch.is_tensor(probabilities) and probabilities.numel() == conceptRange:
+                        probabilities = torch.nan_to_num(probabilities.detach().reshape(-1).float(), nan=0.0).clamp(min=0)
+                        if probabilities.sum() > 0:
+                            weight = probabilities.to(self.current_device)
+                
+                weights.append(weight)
+            
+            weights = torch.stack(weights) if len(set(productArgs)) == 1 else weights
+                
+        for start in range(0, sampleSize, self.semanticSampleChunkSize):
+            size = min(self.semanticSampleChunkSize, sampleSize - start)
+            
+            if sampleSize == productSize:
+                index = torch.arange(start, start + size, device = self.current_device)
+                labels = torch.empty((len(productArgs), size), dtype=torch.long, device = self.current_device)
+                for k in range(len(productArgs) - 1, -1, -1):
+                    labels[k] = index % productArgs[k]
+                    index = index // productArgs[k]
+            elif torch.is_tensor(weights): # All variables with the same number of labels - drawn at once
+                labels = torch.multinomial(weights, size, replacement=True)
+            else:
+                labels = torch.stack([torch.multinomial(weight, size, replacement=True) for weight in weights])
+                
+            yield start, labels
         
     # -- Calculated loss values for logical constraints
-    def calculateLcLoss(self, dn, tnorm='L',counting_tnorm=None, sample = False, sampleSize = 0, sampleGlobalLoss = False, conceptsRelations = None):
+    def calculateLcLoss(self, dn, tnorm='L',counting_tnorm=None, sample = False, sampleSize = 0, sampleGlobalLoss = False, conceptsRelations = None,
+                        tensorized = None, lossLiterals = None):
+        """
+        Calculate losses of the active head LCs for the data graph.
+
+        tensorized overrides the lcLossTensorized config for this calculation. lossLiterals is the dictionary used to
+        gather the literals of the tensorized loss - (DataNode, key, label) to the value. Literals already in it are used
+        instead of reading the DataNodes and the ones read are added to it (used by LcLossTracer).
+        """
         start = perf_counter()
 
         m = None 
@@ -1938,7 +2404,10 @@ class gurobiILPOntSolver(ilpOntSolver):
             self.myLcLossBooleanMethods.setTNorm(tnorm)
             if counting_tnorm:
                 self.myLcLossBooleanMethods.setCountingTNorm(counting_tnorm)
-            
+            self.myLcLossBooleanMethods.tensorized = self.lcLossTensorized if tensorized is None else tensorized
+            self.lossLiterals = {} if lossLiterals is None else lossLiterals
+            self.lossLiteralsGathered = True
+
             self.myLogger.info('Calculating loss ')
             self.myLoggerTime.info('Calculating loss ')
 
@@ -1959,8 +2428,9 @@ class gurobiILPOntSolver(ilpOntSolver):
                     continue
                     
                 lcCounter +=  1
-                self.myLogger.info('\n')
-                self.myLogger.info('Processing %r - %s'%(lc, lc.strEs()))
+                if self.myLogger.isEnabledFor(logging.INFO):
+                    self.myLogger.info('\n')
+                    self.myLogger.info('Processing %r - %s'%(lc, lc.strEs()))
 
                 lcName = lc.lcName
                     
@@ -1995,6 +2465,8 @@ class gurobiILPOntSolver(ilpOntSolver):
                 elapsedInMsLC = elapsedInNsLC/1000000
                 current_lcLosses['elapsedInMsLC'] = elapsedInMsLC
                             
+        self.lossLiterals = {} # Literals are needed only while constructing the LCs losses
+            
         if not sample: # Loss value
             for currentLcName in lcLosses:
                 startLC = perf_counter_ns()
@@ -2026,21 +2498,7 @@ class gurobiILPOntSolver(ilpOntSolver):
                                 else:
                                     lossTensor += entry[0]
                                     
-                current_lcLosses['lossTensor'] = lossTensor
-                current_lcLosses['conversionTensor'] = 1 - lossTensor
-                if lossTensor != None and torch.is_tensor(lossTensor):
-                    # Calculate differentiable normalized loss using sigmoid
-                    current_lcLosses['loss'] = torch.nansum(lossTensor)
-                    current_lcLosses['conversionSigmoid'] = torch.sigmoid(-current_lcLosses['loss'])
-                    # Calculate differentiable normalized loss using clamp 
-                    current_lcLosses['conversionClamp'] = torch.clamp(1 - current_lcLosses['loss'], min=0.0, max=1.0)
-                    # Keep original conversion for backwards compatibility
-                    current_lcLosses['conversion'] = 1 - current_lcLosses['loss']
-                else:
-                    current_lcLosses['loss'] = None 
-                    current_lcLosses['conversion'] = None
-                    current_lcLosses['conversionSigmoid'] = None
-                    current_lcLosses['conversionClamp'] = None
+                self.setLcLossTensor(current_lcLosses, lossTensor)
                     
                 endLC = perf_counter_ns()
                 elapsedInNsLC = endLC - startLC
@@ -2051,8 +2509,6 @@ class gurobiILPOntSolver(ilpOntSolver):
                     self.myLoggerTime.info('Processing time for %s with %i entries is: %ims'%(currentLcName, len(lossList),  current_lcLosses['elapsedInMsLC']))
                 else:
                     self.myLoggerTime.info('Processing time for %s with %i entries is: %ims'%(currentLcName, 0,  current_lcLosses['elapsedInMsLC']))
-
-                [h.flush() for h in self.myLoggerTime.handlers]
             
         else: # -----------Sample
             globalSuccesses = torch.ones(sampleSize, device = self.current_device)
@@ -2254,6 +2710,24 @@ class gurobiILPOntSolver(ilpOntSolver):
         return lcLosses
     
     # -- Calculated loss values for logical constraints
+    def setLcLossTensor(self, current_lcLosses, lossTensor):
+        """Set the LC loss tensor and the losses and conversions calculated from it in the LC losses dictionary."""
+        current_lcLosses['lossTensor'] = lossTensor
+        current_lcLosses['conversionTensor'] = 1 - lossTensor
+        if lossTensor != None and torch.is_tensor(lossTensor):
+            # Calculate differentiable normalized loss using sigmoid
+            current_lcLosses['loss'] = torch.nansum(lossTensor)
+            current_lcLosses['conversionSigmoid'] = torch.sigmoid(-current_lcLosses['loss'])
+            # Calculate differentiable normalized loss using clamp 
+            current_lcLosses['conversionClamp'] = torch.clamp(1 - current_lcLosses['loss'], min=0.0, max=1.0)
+            # Keep original conversion for backwards compatibility
+            current_lcLosses['conversion'] = 1 - current_lcLosses['loss']
+        else:
+            current_lcLosses['loss'] = None 
+            current_lcLosses['conversion'] = None
+            current_lcLosses['conversionSigmoid'] = None
+            current_lcLosses['conversionClamp'] = None
+
     def verifyResultsLC(self, dn, key = "/argmax"):
         start = perf_counter()
 
@@ -2279,8 +2753,9 @@ class gurobiILPOntSolver(ilpOntSolver):
                     continue
                     
                 lcCounter +=  1
-                self.myLogger.info('\n')
-                self.myLogger.info('Processing %r - %s'%(lc, lc.strEs()))
+                if self.myLogger.isEnabledFor(logging.INFO):
+                    self.myLogger.info('\n')
+                    self.myLogger.info('Processing %r - %s'%(lc, lc.strEs()))
 
                 lcName = lc.lcName
                     
@@ -175,6 +175,21 @@ class ilpBooleanProcessor(object, metaclass=abc.ABCMeta):
         without introducing *varCOUNT*.
         """
 
+    def countVars(
+        self, m, _vars,
+        onlyConstrains: bool = False,
+        limitOp: str = "None",
+        limit: int = 1,
+        logicMethodName: str = "COUNT",
+    ):
+        """**countVar** for each group of literals in *_vars*.
+
+        Returns the results in the order of the groups. Subclasses may count
+        all the groups together instead of one group at a time.
+        """
+        return [self.countVar(m, *var, onlyConstrains=onlyConstrains, limitOp=limitOp, limit=limit,
+                              logicMethodName=logicMethodName) for var in _vars]
+
     @abc.abstractmethod
     def compareCountsVar(
         self,
@@ -1,11 +1,61 @@
 import os
 import logging
 REGR_SOLVER = os.environ.get('REGR_SOLVER', 'Gurobi')
+REGR_ILP_BATCH_ITEMS = os.environ.get('REGR_ILP_BATCH_ITEMS', '0').lower() in ('1', 'true', 'yes')
+REGR_ILP_WORKERS = int(os.environ.get('REGR_ILP_WORKERS', 1))
+REGR_ILP_P_WORKERS = int(os.environ.get('REGR_ILP_P_WORKERS', 1))
+REGR_ILP_BATCH_FUSED = os.environ.get('REGR_ILP_BATCH_FUSED', '0').lower() in ('1', 'true', 'yes')
+REGR_ILP_ENV_POOL_SIZE = int(os.environ.get('REGR_ILP_ENV_POOL_SIZE', 0)) or None
+REGR_ILP_ENV_THREADS = int(os.environ.get('REGR_ILP_ENV_THREADS', 0))
+REGR_ILP_MODEL_CACHE_DIR = os.environ.get('REGR_ILP_MODEL_CACHE_DIR', None)
+REGR_SEMANTIC_SAMPLE_MAX = int(os.environ.get('REGR_SEMANTIC_SAMPLE_MAX', 1 << 20)) or None
+REGR_SEMANTIC_SAMPLE_MODE = os.environ.get('REGR_SEMANTIC_SAMPLE_MODE', 'uniform')
+REGR_LC_LOSS_TENSORIZED = os.environ.get('REGR_LC_LOSS_TENSORIZED', '0').lower() in ('1', 'true', 'yes')
 
 ilpConfig = {
     # variable controlling what ILP solver is used  - one of "Gurobi", "GEKKO", None
+    # or mini solvers "mini_debug", "mini_prob_debug" (Gurobi) and "mini_debug_highs", "mini_prob_debug_highs" (HiGHS through scipy)
     'ilpSolver' : REGR_SOLVER,
 
+    # batch items (children of the batch DataNode) solved as independent ILP problems, each on its own data graph (LCs are grounded
+    # in the item data graph) - by default the batch DataNode is solved as one problem; items with linked data graphs are always solved together
+    'ilpBatchItems' : REGR_ILP_BATCH_ITEMS,
+
+    # number of worker threads used to solve batch items ILP models in parallel - 1 means serial solving
+    'ilpBatchWorkers' : REGR_ILP_WORKERS,
+
+    # batch items ILP problems solved as one block diagonal model (a block per item) with a single optimize call instead of a model per item
+    # (items are solved separately if LCs with p lower than 100 are used or the batch model has no solution)
+    'ilpBatchFused' : REGR_ILP_BATCH_FUSED,
+
+    # number of worker threads used to solve ILP models for the different LCs p levels in parallel - 1 means serial solving
+    'ilpPWorkers' : REGR_ILP_P_WORKERS,
+
+    # Gurobi environments reused by the ILP solver calls from a process wide pool - max number of started environments (None - no limit,
+    # with a limit the calls wait for a free environment) and number of threads used by each environment (0 - Gurobi default)
+    'ilpEnvPoolSize' : REGR_ILP_ENV_POOL_SIZE,
+    'ilpEnvThreads' : REGR_ILP_ENV_THREADS,
+
+    # ILP models cache used when models are reused - max number of models, max estimated size in bytes (None - no limit)
+    # and directory where built models are saved to be reused by subsequent runs (None - models are kept only in memory)
+    'ilpModelCacheSize' : 20,
+    'ilpModelCacheBudget' : None,
+    'ilpModelCacheDir' : REGR_ILP_MODEL_CACHE_DIR,
+
+    # semantic sample (sample loss with sampleSize -1) - number of samples generated at once, max number of samples (None - the whole
+    # product of the labels is always enumerated) and how a larger product is subsampled - "uniform" or "importance" (from the model probabilities)
+    'semanticSampleChunkSize' : 65536,
+    'semanticSampleMaxSize' : REGR_SEMANTIC_SAMPLE_MAX,
+    'semanticSampleMode' : REGR_SEMANTIC_SAMPLE_MODE,
+
+    # number of data graph structures for which the LCs candidates (grounding) are kept to be reused by examples with the same structure
+    # (0 - candidates are only reused by the consumers - loss, ILP, verification - of the same data graph)
+    'lcGroundingCacheSize' : 32,
+
+    # LC loss (t-norms) evaluated on the literals of all the LC candidates gathered into one tensor - the t-norms are applied
+    # as single reductions over the [candidates, arity] tensor and missing literals are 0 instead of splitting the candidates
+    'lcLossTensorized' : REGR_LC_LOSS_TENSORIZED,
+
     # Logging configuration for ilpOntSolver
     'ifLog': True,
     'log_name' : 'ilpOntSolver', 
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import gurobipy
+
+
+class ILPModelCacheEntry:
+    """
+    Built ILP model kept in the ILPModelCache.
+
+    Attributes:
+        - model (gurobipy.Model): Model with the ILP variables and constraints.
+        - x (OrderedDict): ILP variables keyed by (concept, label, instanceID, label index).
+        - start (dict): Last solution values keyed as x - used as MIP start when the model is reused.
+        - size (int): Estimated memory use of the model in bytes.
+    """
+    __slots__ = ('model', 'x', 'start', 'size')
+
+    def __init__(self, model, x, start=None):
+        self.model = model
+        self.x = x
+        self.start = start
+        self.size = ILPModelCache.modelSize(model)
+
+
+class ILPModelCache:
+    """
+    LRU cache of built ILP models keyed by the structure of the ILP problem (see gurobiILPOntSolver.getModelKey).
+
+    Models are taken out of the cache while in use, so one model is never solved by two threads at once,
+    and put back when done. Least recently used models are evicted when the cache holds more than maxSize
+    models or their estimated size exceeds budget bytes.
+
+    If cacheDir is set, models put into the cache are also written to this directory (.mps model and pickled
+    variables keys) and models not found in memory are read from it - repeated runs over the same dataset
+    then skip constraints generation entirely.
+    """
+    def __init__(self, maxSize=20, budget=None, cacheDir=None):
+        self.maxSize = maxSize
+        self.budget = budget
+        self.cacheDir = cacheDir
+        self.entries = OrderedDict()
+        self.totalSize = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def modelSize(model):
+        """Estimate memory use of the Gurobi model in bytes from its dimensions."""
+        try:
+            return model.NumNZs * 16 + (model.NumVars + model.NumConstrs + model.NumGenConstrs) * 128
+        except (AttributeError, gurobipy.GurobiError):
+            return 0
+
+    @staticmethod
+    def keyHash(key):
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def take(self, key, env=None, concepts=None):
+        """Take the model for the key out of the cache, reading it from the cache directory if not in memory."""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.totalSize -= entry.size
+                return entry
+
+        if self.cacheDir is None or env is None or concepts is None:
+            return None
+
+        return self.read(key, env, concepts)
+
+    def put(self, key, entry):
+        """Put the model into the cache as the most recently used one and evict models over the limits."""
+        evicted = []
+        with self.lock:
+            if key in self.entries: # Keep the model already in the cache
+                self.entries.move_to_end(key)
+                return evicted
+
+            self.entries[key] = entry
+            self.totalSize += entry.size
+
+            while len(self.entries) > 1 and \
+                    ((self.maxSize is not None and len(self.entries) > self.maxSize) or (self.budget is not None and self.totalSize > self.budget)):
+                _, evictedEntry = self.entries.popitem(last=False)
+                self.totalSize -= evictedEntry.size
+                evicted.append(evictedEntry)
+
+        if self.cacheDir is not None:
+            self.write(key, entry)
+
+        return evicted
+
+    def setStart(self, key, start):
+        """Keep solution values used as MIP start for the next run of the model for the key."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.start = start
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.totalSize = 0
+
+    def paths(self, key):
+        base = os.path.join(self.cacheDir, self.keyHash(key))
+        return base + '.mps', base + '.pkl'
+
+    def write(self, key, entry):
+        modelPath, xPath = self.paths(key)
+        if os.path.exists(modelPath) and os.path.exists(xPath):
+            return
+
+        os.makedirs(self.cacheDir, exist_ok=True)
+
+        xNames = [((_x[0].name, *_x[1:]), v.VarName if v is not None else None) for _x, v in entry.x.items()]
+
+        # Write to temporary files first so concurrent readers never see partial files
+        tmpSuffix = '.%i.%i.tmp' % (os.getpid(), threading.get_ident())
+        entry.model.write(modelPath + tmpSuffix + '.mps')
+        with open(xPath + tmpSuffix, 'wb') as f:
+            pickle.dump((key, xNames), f)
+
+        os.replace(modelPath + tmpSuffix + '.mps', modelPath)
+        os.replace(xPath + tmpSuffix, xPath)
+
+    def read(self, key, env, concepts):
+        modelPath, xPath = self.paths(key)
+        if not (os.path.exists(modelPath) and os.path.exists(xPath)):
+            return None
+
+        with open(xPath, 'rb') as f:
+            savedKey, xNames = pickle.load(f)
+
+        if savedKey != key: # Hash collision
+            return None
+
+        model = gurobipy.read(modelPath, env)
+        model._env = env # Environment the model is used in - see GurobiEnvPool
+        modelVars = {v.VarName: v for v in model.getVars()}
+
+        x = OrderedDict()
+        for (conceptName, *xKey), varName in xNames:
+            if conceptName not in concepts:
+                return None
+
+            x[(concepts[conceptName], *xKey)] = modelVars.get(varName) if varName is not None else None
+
+        return ILPModelCacheEntry(model, x)
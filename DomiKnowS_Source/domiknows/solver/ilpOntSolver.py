@@ -108,4 +108,10 @@ class ilpOntSolver(object):
     @abc.abstractmethod
     def calculateILPSelection(self, phrase, fun=None, epsilon = 0.00001, graphResultsForPhraseToken=None, graphResultsForPhraseRelation=None, graphResultsForPhraseTripleRelation=None, minimizeObjective = False, hardConstrains = []):
         #self, *conceptsRelations, fun = fun, epsilon = epsilon, minimizeObjective = minimizeObjective, ignorePinLCs = ignorePinLCs
-        pass
\ No newline at end of file
+        pass
+
+    # Solve the ILP problems of the batch items (children of the batch DataNode dn) in one model - returns False if not supported
+    # by the solver, the items are then solved separately with calculateILPSelection. batchIndexes are the query scopes
+    # of the items data graphs (see DataNodeIndex.subgraph) in the order of the items.
+    def calculateILPSelectionForBatch(self, dn, *conceptsRelations, batchIndexes = None, key = ("local" , "softmax"), fun=None, epsilon = 0.00001, minimizeObjective = False, ignorePinLCs = False):
+        return False
@@ -59,6 +59,19 @@ class ilpOntSolverFactory:
                 else:
                     from .gurobiILPOntSolver1 import gurobiILPOntSolver
                 SolverClass = cls.getClass(gurobiILPOntSolver, *SupplementalClasses)
+            elif _ilpConfig['ilpSolver'] in ("mini_prob_debug_highs", "mini_debug_highs"):
+                # Mini solvers using open source HiGHS MILP solver (through scipy) instead of Gurobi
+                if __package__ is None or __package__ == '':
+                    from domiknows.solver.mini_solver_debug import MiniProbSolverDebug, MiniSolverDebug
+                    from domiknows.solver.session.highs_session import HighsSession
+                else:
+                    from .mini_solver_debug import MiniProbSolverDebug, MiniSolverDebug
+                    from .session.highs_session import HighsSession
+                kwargs['SessionType'] = HighsSession
+                if _ilpConfig['ilpSolver'] == "mini_prob_debug_highs":
+                    SolverClass = cls.getClass(MiniProbSolverDebug, *SupplementalClasses)
+                else:
+                    SolverClass = cls.getClass(MiniSolverDebug, *SupplementalClasses)
             elif _ilpConfig['ilpSolver'] == "mini_prob_debug":
                 if __package__ is None or __package__ == '':
                     from domiknows.solver.mini_solver_debug import MiniProbSolverDebug
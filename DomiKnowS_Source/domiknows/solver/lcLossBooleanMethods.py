@@ -5,7 +5,7 @@ from domiknows.graph import DataNode
 
 from domiknows.solver.ilpBooleanMethods import ilpBooleanProcessor 
 from domiknows.solver.ilpConfig import ilpConfig 
-from domiknows import setup_logger, getProductionModeStatus
+from domiknows import setup_logger, getProductionModeStatus, disableLogger
 
 class lcLossBooleanMethods(ilpBooleanProcessor):
     
@@ -14,6 +14,7 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         self.tnorm = 'P'
         self.counting_tnorm = None
         self.grad = True
+        self.tensorized = False # Logic methods evaluated on [candidates, arity] tensors as single reductions
         
         self.myLogger = logging.getLogger(ilpConfig['log_name'])
         self.ifLog =  ilpConfig['ifLog']
@@ -47,11 +48,25 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         
         # Disable logger if in production mode
         if getProductionModeStatus():
-            self.countLogger.addFilter(lambda record: False)
-            self.countLogger.info("Count operations logger disabled due to production mode")
+            disableLogger(self.countLogger)
         else:
             self.countLogger.info("=== lcLossBooleanMethods Count Operations Logger Initialized ===")
 
+    # Debug logging of the logic methods is guarded by this check so the debug messages are not built when not logged
+    @property
+    def ifLogDebug(self):
+        return self.ifLog and self.myLogger.isEnabledFor(logging.DEBUG)
+
+    # Logging of every logic operation is guarded by these checks, so when the count logger is disabled
+    # (production mode) or its level is higher no log messages are built (no .item() device syncs)
+    @property
+    def countLogDebug(self):
+        return self.countLogger.isEnabledFor(logging.DEBUG)
+
+    @property
+    def countLogInfo(self):
+        return self.countLogger.isEnabledFor(logging.INFO)
+
     def setTNorm(self, tnorm='L'):
         if tnorm =='L':
             if self.ifLog: self.myLogger.info("Using Lukasiewicz t-norms Formulation")
@@ -109,10 +124,78 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         
         return varFixed
 
+    # -- Tensorized mode - literals of all the LC candidates stacked into [candidates, arity] tensor
+    TENSORIZED_TNORMS = ('L', 'G', 'P')
+
+    def _isTensorized(self):
+        return self.tensorized and self.tnorm in self.TENSORIZED_TNORMS
+
+    def _stackVar(self, var):
+        """Stack the literals into [..., arity] tensor - None and not tensor literals are 0 (as in _fixVar)."""
+        var = [v if torch.is_tensor(v) else torch.zeros(1, device=self.current_device, dtype=torch.float64) for v in var]
+        return torch.stack(torch.broadcast_tensors(*var), dim=-1)
+
+    def _tensorizedSuccess(self, logicMethodName, var):
+        """Return success of the logic method for all the candidates - the t-norm applied as a reduction over the arity."""
+        t = self._stackVar(var)
+        n = t.shape[-1]
+
+        if logicMethodName in ("AND", "NAND"):
+            if self.tnorm == 'L':
+                return torch.clamp(t.sum(dim=-1) - (n - 1), min=0) # max(sum - N + 1, 0)
+            elif self.tnorm == 'G':
+                return t.amin(dim=-1)
+            else:
+                return t.prod(dim=-1)
+        elif logicMethodName in ("OR", "NOR"):
+            if self.tnorm == 'L':
+                return torch.clamp(t.sum(dim=-1), max=1) # min(sum, 1)
+            elif self.tnorm == 'G':
+                return t.amax(dim=-1)
+            else:
+                return t.sum(dim=-1) - t.prod(dim=-1) # sum - prod, as in orVar
+        elif logicMethodName == "IF":
+            var1, var2 = t[..., 0], t[..., 1]
+            if self.tnorm == 'L':
+                return torch.clamp(1 - var1 + var2, max=1) # min(1, 1 - var1 + var2)
+            elif self.tnorm == 'G':
+                return torch.where(var2 >= var1, torch.ones_like(var2), var2)
+            else:
+                return torch.clamp(var2 / torch.where(var1 != 0, var1, 1e-4), max=1) # min(1, var2/var1)
+        elif logicMethodName == "XOR":
+            if self.tnorm == 'P':
+                return (1 - (1 - 2 * t).prod(dim=-1)) / 2 # a + b - 2ab applied over all the variables
+            xorSuccess = t[..., 0]
+            for i in range(1, n):
+                v = t[..., i]
+                if self.tnorm == 'L':
+                    xorSuccess = torch.clamp(xorSuccess + v, max=1) - torch.clamp(xorSuccess + v - 1, min=0)
+                else:
+                    xorSuccess = torch.maximum(torch.minimum(xorSuccess, 1 - v), torch.minimum(1 - xorSuccess, v))
+            return xorSuccess
+        elif logicMethodName == "EQUIVALENCE":
+            if self.tnorm == 'L':
+                varSum = t.sum(dim=-1)
+                return torch.clamp(torch.clamp(varSum - (n - 1), min=0) + torch.clamp(1 - varSum, min=0), max=1)
+            elif self.tnorm == 'G':
+                return torch.maximum(t.amin(dim=-1), (1 - t).amin(dim=-1))
+            else:
+                allTrue, allFalse = t.prod(dim=-1), (1 - t).prod(dim=-1)
+                return allTrue + allFalse - allTrue * allFalse
+
+        raise ValueError("Logic method %s is not tensorized" % logicMethodName)
+
+    def _tensorizedVar(self, logicMethodName, var, onlyConstrains):
+        success = self._tensorizedSuccess(logicMethodName, var)
+        if logicMethodName in ("NAND", "NOR"):
+            success = 1 - success
+
+        return 1 - success if onlyConstrains else success
+
     def notVar(self, _, var, onlyConstrains = False):
         logicMethodName = "NOT"
                 
-        if self.ifLog: self.myLogger.debug("%s called with : %s"%(logicMethodName,var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with : %s"%(logicMethodName,var))
         
         var, = self._fixVar((var,))
             
@@ -129,98 +212,101 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
     def andVar(self, _, *var, onlyConstrains = False):
         logicMethodName = "AND"
             
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+
+        if self._isTensorized():
+            return self._tensorizedVar("AND", var, onlyConstrains)
         
         # Enhanced logging for AND operations
-        self.countLogger.info(f"=== {logicMethodName} Operation Started ===")
-        self.countLogger.info(f"Input parameters: onlyConstrains={onlyConstrains}")
-        self.countLogger.info(f"Number of input variables: {len(var)}")
-        self.countLogger.info(f"T-norm method: {self.tnorm}")
+        if self.countLogInfo: self.countLogger.info(f"=== {logicMethodName} Operation Started ===")
+        if self.countLogInfo: self.countLogger.info(f"Input parameters: onlyConstrains={onlyConstrains}")
+        if self.countLogInfo: self.countLogger.info(f"Number of input variables: {len(var)}")
+        if self.countLogInfo: self.countLogger.info(f"T-norm method: {self.tnorm}")
         
         # Log input variables before fixing
         for i, v in enumerate(var):
-            self.countLogger.debug(f"Input variable {i}: {v} (type: {type(v)})")
+            if self.countLogDebug: self.countLogger.debug(f"Input variable {i}: {v} (type: {type(v)})")
               
         var = self._fixVar(var)
         
         # Log variables after fixing with additional debug info
-        self.countLogger.debug(f"Total variables after fixing: {len(var)}")
+        if self.countLogDebug: self.countLogger.debug(f"Total variables after fixing: {len(var)}")
         for i, v in enumerate(var):
-            self.countLogger.debug(f"Fixed variable {i}: {v.item() if v.numel() == 1 else v} (shape: {v.shape})")
-            # Force log flush for each variable to ensure visibility
-            for handler in self.countLogger.handlers:
-                handler.flush()
+            if self.countLogDebug: self.countLogger.debug(f"Fixed variable {i}: {v.item() if v.numel() == 1 else v} (shape: {v.shape})")
             
-        self.countLogger.debug(f"Variable indices range: 0 to {len(var)-1}")
+        if self.countLogDebug: self.countLogger.debug(f"Variable indices range: 0 to {len(var)-1}")
                     
         if self.tnorm =='L':
-            self.countLogger.debug("Using Łukasiewicz t-norm for AND")
+            if self.countLogDebug: self.countLogger.debug("Using Łukasiewicz t-norm for AND")
             N = len(var)
-            self.countLogger.debug(f"Number of variables N: {N}")
+            if self.countLogDebug: self.countLogger.debug(f"Number of variables N: {N}")
             
             nTorch = torch.tensor([N], device=self.current_device, requires_grad=True, dtype=torch.float64)
             varSum = torch.clone(var[0])
             for i, v in enumerate(var[1:], 1):
                 varSum.add_(v)
-                self.countLogger.debug(f"After adding var[{i}], sum: {varSum.item() if varSum.numel() == 1 else varSum}")
+                if self.countLogDebug: self.countLogger.debug(f"After adding var[{i}], sum: {varSum.item() if varSum.numel() == 1 else varSum}")
             
-            self.countLogger.debug(f"Final sum of variables: {varSum.item() if varSum.numel() == 1 else varSum}")
+            if self.countLogDebug: self.countLogger.debug(f"Final sum of variables: {varSum.item() if varSum.numel() == 1 else varSum}")
             
             tZero = torch.zeros(1, device=self.current_device, requires_grad=True, dtype=torch.float64)
             tOne = torch.ones(1, device=self.current_device, requires_grad=True, dtype=torch.float64)
 
             # max(varSum - N + 1, 0)
             intermediate = torch.add(torch.sub(varSum, nTorch), tOne)  # varSum - N + 1
-            self.countLogger.debug(f"Intermediate calculation (sum - N + 1): {intermediate.item() if intermediate.numel() == 1 else intermediate}")
+            if self.countLogDebug: self.countLogger.debug(f"Intermediate calculation (sum - N + 1): {intermediate.item() if intermediate.numel() == 1 else intermediate}")
             
             andSuccess = torch.maximum(intermediate, tZero)
-            self.countLogger.debug(f"AND success (max(intermediate, 0)): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+            if self.countLogDebug: self.countLogger.debug(f"AND success (max(intermediate, 0)): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
             
         elif self.tnorm =='G':
-            self.countLogger.debug("Using Gödel t-norm for AND")
+            if self.countLogDebug: self.countLogger.debug("Using Gödel t-norm for AND")
             andSuccess = torch.clone(var[0])
-            self.countLogger.debug(f"Initial value (var[0]): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+            if self.countLogDebug: self.countLogger.debug(f"Initial value (var[0]): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
             
             for i, v in enumerate(var[1:], 1):
                 prev_value = andSuccess.clone()
                 andSuccess = torch.minimum(andSuccess, v)
-                self.countLogger.debug(f"After min with var[{i}] ({v.item() if v.numel() == 1 else v}): {prev_value.item() if prev_value.numel() == 1 else prev_value} → {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+                if self.countLogDebug: self.countLogger.debug(f"After min with var[{i}] ({v.item() if v.numel() == 1 else v}): {prev_value.item() if prev_value.numel() == 1 else prev_value} → {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
                 
         elif self.tnorm =='P':
-            self.countLogger.debug("Using Product t-norm for AND")
+            if self.countLogDebug: self.countLogger.debug("Using Product t-norm for AND")
             andSuccess = torch.clone(var[0])
-            self.countLogger.debug(f"Initial value (var[0]): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+            if self.countLogDebug: self.countLogger.debug(f"Initial value (var[0]): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
             
             for i, v in enumerate(var[1:], 1):
                 prev_value = andSuccess.clone()
                 
                 # Check shapes before in-place multiplication
                 if andSuccess.shape != v.shape:
-                    self.countLogger.debug(f"Shape mismatch detected: andSuccess {andSuccess.shape} vs v {v.shape}")
+                    if self.countLogDebug: self.countLogger.debug(f"Shape mismatch detected: andSuccess {andSuccess.shape} vs v {v.shape}")
                     # Use broadcasting-compatible operation instead of in-place
                     andSuccess = torch.mul(andSuccess, v)
                 else:
                     andSuccess.mul_(v)
                     
-                self.countLogger.debug(f"After multiply with var[{i}] ({v.item() if v.numel() == 1 else v}): {prev_value.item() if prev_value.numel() == 1 else prev_value} → {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+                if self.countLogDebug: self.countLogger.debug(f"After multiply with var[{i}] ({v.item() if v.numel() == 1 else v}): {prev_value.item() if prev_value.numel() == 1 else prev_value} → {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
 
-        self.countLogger.info(f"Final AND success value: {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+        if self.countLogInfo: self.countLogger.info(f"Final AND success value: {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
 
         if onlyConstrains:
             andLoss = 1 - andSuccess
-            self.countLogger.info(f"Returning loss (onlyConstrains=True): {andLoss.item() if andLoss.numel() == 1 else andLoss}")
+            if self.countLogInfo: self.countLogger.info(f"Returning loss (onlyConstrains=True): {andLoss.item() if andLoss.numel() == 1 else andLoss}")
             result = andLoss
         else:
-            self.countLogger.info(f"Returning success (onlyConstrains=False): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
+            if self.countLogInfo: self.countLogger.info(f"Returning success (onlyConstrains=False): {andSuccess.item() if andSuccess.numel() == 1 else andSuccess}")
             result = andSuccess
         
-        self.countLogger.info(f"=== {logicMethodName} Operation Completed ===\n")
+        if self.countLogInfo: self.countLogger.info(f"=== {logicMethodName} Operation Completed ===\n")
         return result
     
     def orVar(self, _, *var, onlyConstrains = False):
         logicMethodName = "OR"
         
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+
+        if self._isTensorized():
+            return self._tensorizedVar("OR", var, onlyConstrains)
 
         var = self._fixVar(var)
 
@@ -251,7 +337,10 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
     def nandVar(self, _, *var, onlyConstrains = False):
         logicMethodName = "NAND"
        
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+
+        if self._isTensorized():
+            return self._tensorizedVar("NAND", var, onlyConstrains)
         
         # nand(var) = not(and(var))
         nandSuccess = self.notVar(_, self.andVar(_, *var))
@@ -298,7 +387,10 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
     def ifVar(self, _, var1, var2, onlyConstrains = False):
         logicMethodName = "IF"
 
-        if self.ifLog: self.myLogger.debug("%s called with: var1 - %s, var2 - %s"%(logicMethodName,var1,var2))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: var1 - %s, var2 - %s"%(logicMethodName,var1,var2))
+
+        if self._isTensorized():
+            return self._tensorizedVar("IF", (var1, var2), onlyConstrains)
                 
         # check if separate tensors used
         if torch.is_tensor(var1) and (len(var1.shape) == 0 or len(var1.shape) == 1 and var1.shape[0] == 1):
@@ -357,7 +449,10 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
     def norVar(self, _, *var, onlyConstrains = False):
         logicMethodName = "NOR"
         
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName,var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName,var))
+
+        if self._isTensorized():
+            return self._tensorizedVar("NOR", var, onlyConstrains)
 
         # nor(var) = not(or(var)
         norSucess = self.notVar(_, self.orVar(_, *var))
@@ -373,7 +468,10 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
     def xorVar(self, _, *var, onlyConstrains = False):
         logicMethodName = "XOR"
         
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+
+        if self._isTensorized() and len(var) > 0:
+            return self._tensorizedVar("XOR", var, onlyConstrains)
 
         if len(var) == 0:
             # XOR of no variables is False
@@ -417,7 +515,10 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
     def equivalenceVar(self, _, *var, onlyConstrains = False):
         logicMethodName = "EQUIVALENCE"
         
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName, var))
+
+        if self._isTensorized() and len(var) > 1:
+            return self._tensorizedVar("EQUIVALENCE", var, onlyConstrains)
 
         if len(var) == 0:
             # Equivalence of no variables is True (vacuous truth)
@@ -484,39 +585,162 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         else:
             return equivSuccess
 
+    # Polynomials longer than this are multiplied through FFT, shorter ones by direct convolution
+    FFT_POLY_LENGTH = 64
+
+    @staticmethod
+    def _multiply_polynomials(a: torch.Tensor, b: torch.Tensor, fft_length: int = 64) -> torch.Tensor:
+        """
+        Row-wise product of polynomials given by coefficients a, b of shape [B, L].
+        Returns coefficients of shape [B, 2L-1].
+        """
+        L = a.shape[-1]
+        size = 2 * L - 1
+        if L > fft_length:
+            return torch.fft.irfft(torch.fft.rfft(a, size) * torch.fft.rfft(b, size), size)
+
+        # Grouped conv1d is cross-correlation - flip b to get convolution of every row pair in one kernel
+        B = a.shape[0]
+        out = torch.nn.functional.conv1d(
+            torch.nn.functional.pad(a, (L - 1, L - 1)).unsqueeze(0),
+            b.flip(-1).unsqueeze(1),
+            groups=B,
+        )
+        return out.squeeze(0)
+
     def calc_probabilities(self, t: torch.Tensor, n: int | None = None) -> torch.Tensor:
         """
         Poisson–binomial PMF over counts 0..n for independent Bernoulli probs in t.
-        Returns a length-(n+1) vector where pmf[k] = P(K==k).
-        Differentiable w.r.t. t. t is 1-D with entries in [0,1].
+        t is 1-D with entries in [0,1] or 2-D [groups, n] with one group of literals per row.
+        Returns a length-(n+1) vector (or [groups, n+1] for 2-D t) where pmf[k] = P(K==k).
+        Differentiable w.r.t. t.
+
+        The PMF is the product of polynomials (1-p_i) + p_i*z. They are multiplied pairwise
+        divide-and-conquer style - log2(n) batched polynomial products for all groups together.
         """
-        if t.ndim != 1:
-            t = t.view(-1)
+        batched = t.ndim == 2
+        if not batched:
+            t = t.reshape(1, -1)
         if n is None:
-            n = t.numel()
+            n = t.shape[-1]
         # Use only the first n probs if more are given
-        p = t[:n]
+        p = t[:, :n]
+        groups, m = p.shape
 
-        # PMF DP: start with P(K=0)=1
-        pmf = torch.zeros(n + 1, dtype=p.dtype, device=p.device)
-        pmf[0] = 1.0
+        if m == 0:
+            # P(K=0)=1
+            pmf = torch.zeros(groups, n + 1, dtype=p.dtype, device=p.device)
+            pmf[:, 0] = 1.0
+        else:
+            polys = torch.stack((1 - p, p), dim=-1)  # [groups, m, 2]
+            while polys.shape[1] > 1:
+                L = polys.shape[-1]
+                if polys.shape[1] % 2:
+                    # Pad with polynomial 1 to have pairs
+                    one = torch.zeros(groups, 1, L, dtype=p.dtype, device=p.device)
+                    one[..., 0] = 1.0
+                    polys = torch.cat((polys, one), dim=1)
+                a = polys[:, 0::2].reshape(-1, L)
+                b = polys[:, 1::2].reshape(-1, L)
+                polys = self._multiply_polynomials(a, b, self.FFT_POLY_LENGTH).reshape(groups, -1, 2 * L - 1)
 
-        # For each probability p_i, convolve with [1-pi, p_i]
-        # Reverse k loop to avoid overwriting dependencies.
-        for pi in p:
-            # pmf_new[k] = pmf[k]*(1-pi) + pmf[k-1]*pi
-            # Do it in-place with careful ordering (descending k)
-            prev = pmf.clone()
-            pmf[1:] = prev[1:] * (1 - pi) + prev[:-1] * pi
-            pmf[0]  = prev[0]  * (1 - pi)
+            pmf = polys[:, 0, : m + 1]
+            if m < n:
+                # Fewer probs than n - counts above m are impossible
+                pmf = torch.nn.functional.pad(pmf, (0, n - m))
 
         # Numerical guard
         pmf = torch.clamp(pmf, 0.0, 1.0)
         # renormalize small drift
-        s = pmf.sum()
-        if torch.isfinite(s) and s > 0:
-            pmf = pmf / s
-        return pmf
+        s = pmf.sum(dim=-1, keepdim=True)
+        s = torch.where(torch.isfinite(s) & (s > 0), s, torch.ones_like(s))
+        pmf = pmf / s
+
+        return pmf if batched else pmf[0]
+
+    def calc_count_losses(self, t: torch.Tensor, limitOp: str, limits, lengths=None) -> torch.Tensor:
+        """
+        Product t-norm losses of counting constraints 'count(t) limitOp limit' computed from one PMF.
+        t is 1-D or 2-D [groups, n]; limits is int or a tensor/list of limits (one per group).
+        lengths are the numbers of literals of the groups padded with 0 literals to n (limits are clamped to them).
+        Returns loss per group (scalar for 1-D t and int limit).
+        """
+        batched = t.ndim == 2
+        pmf = self.calc_probabilities(t if batched else t.reshape(1, -1))
+        n = pmf.shape[-1] - 1
+
+        limits = torch.as_tensor(limits, device=pmf.device).reshape(-1).long().clamp(0, n)
+        if limits.numel() == 1:
+            limits = limits.expand(pmf.shape[0])
+        if lengths is not None:
+            limits = torch.minimum(limits, torch.as_tensor(lengths, device=pmf.device).long())
+
+        if limitOp == "==":
+            success = pmf.gather(-1, limits.unsqueeze(-1)).squeeze(-1)
+        elif limitOp == ">=":
+            # P(K>=s) from the reversed cumulative sum
+            success = pmf.flip(-1).cumsum(-1).flip(-1).gather(-1, limits.unsqueeze(-1)).squeeze(-1)
+        elif limitOp == "<=":
+            success = pmf.cumsum(-1).gather(-1, limits.unsqueeze(-1)).squeeze(-1)
+        else:
+            raise ValueError(f"Unsupported limitOp: {limitOp}")
+
+        loss = 1 - success
+        return loss if batched else loss[0]
+
+    def _countLiteral(self, v):
+        """Literal of the count - tensor in the device of the solver clamped to [0,1]."""
+        tv = self._fixVar((v,))[0] if not isinstance(v, torch.Tensor) else v
+        tv = tv.to(device=self.current_device, dtype=torch.float64)
+        return torch.clamp(tv, 0.0, 1.0)
+
+    def countVars(
+        self,
+        _,
+        _vars,
+        onlyConstrains: bool = False,
+        limitOp: str = "==",
+        limit: int = 1,
+        logicMethodName: str = "COUNT",
+    ):
+        """
+        countVar for each group of literals in _vars. The counts calculated from the Poisson-binomial PMF (product t-norm)
+        are calculated for all the groups from one PMF - the groups are padded with 0 literals to [groups, n].
+        Other counts (and the logged counts) are calculated by countVar one group at a time.
+        """
+        method = self.counting_tnorm if getattr(self, "counting_tnorm", None) else self.tnorm
+        if len(_vars) < 2 or self.countLogInfo or not (method == "P" or (method not in ("G", "L") and limitOp == "==")):
+            return super().countVars(_, _vars, onlyConstrains=onlyConstrains, limitOp=limitOp, limit=limit, logicMethodName=logicMethodName)
+
+        groups = []
+        for var in _vars:
+            vals = [self._countLiteral(v) for v in var if v is not None]
+            if any(v.numel() != 1 for v in vals):
+                self.countLogger.warning(f"countVar expects scalar literals; got shapes {[tuple(v.shape) for v in vals]}")
+            groups.append(torch.cat([v.reshape(-1) for v in vals]) if vals else torch.zeros(1, device=self.current_device, dtype=torch.float64))
+
+        lengths = [group.numel() for group in groups]
+        t = torch.nn.utils.rnn.pad_sequence(groups, batch_first=True)
+        if not t.requires_grad:
+            t = t.detach().requires_grad_(True)
+
+        s = int(limit)
+        if limitOp == ">=" and s <= 1:
+            loss = torch.prod(1 - t, dim=-1) # exists at least one
+        elif limitOp in ("==", ">=", "<="):
+            loss = self.calc_count_losses(t, limitOp, s, lengths=lengths)
+        else:
+            self.countLogger.error(f"Unsupported limitOp: {limitOp}")
+            raise ValueError(f"Unsupported limitOp: {limitOp}")
+
+        # Check if losses are in valid range [0,1] - the values are read only to log it
+        if self.countLogger.isEnabledFor(logging.WARNING):
+            if not bool(((loss >= 0) & (loss <= 1)).all()):
+                self.countLogger.warning(f"Loss out of bounds [0,1]: {loss}")
+        loss = torch.clamp(loss, 0.0, 1.0)
+
+        result = loss if onlyConstrains else torch.clamp(1.0 - loss, 0.0, 1.0)
+        return list(result.unbind())
 
     def countVar(
         self,
@@ -530,22 +754,20 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         logicMethodName = "COUNT"
 
         # Enhanced logging for count operations
-        self.countLogger.info(f"=== {logicMethodName} Operation Started ===")
-        self.countLogger.info(f"Input parameters: limitOp='{limitOp}', limit={limit}, onlyConstrains={onlyConstrains}")
-        self.countLogger.info(f"Number of input variables: {len(var)}")
-        self.countLogger.info(f"T-norm method: {self.counting_tnorm if getattr(self, 'counting_tnorm', None) else self.tnorm}")
+        if self.countLogInfo: self.countLogger.info(f"=== {logicMethodName} Operation Started ===")
+        if self.countLogInfo: self.countLogger.info(f"Input parameters: limitOp='{limitOp}', limit={limit}, onlyConstrains={onlyConstrains}")
+        if self.countLogInfo: self.countLogger.info(f"Number of input variables: {len(var)}")
+        if self.countLogInfo: self.countLogger.info(f"T-norm method: {self.counting_tnorm if getattr(self, 'counting_tnorm', None) else self.tnorm}")
 
         # ---- Normalize inputs: skip None, move to correct device/dtype, clamp to [0,1]
         vals = []
         for i, v in enumerate(var):
-            self.countLogger.debug(f"Processing variable {i}: {v} (type: {type(v)})")
+            if self.countLogDebug: self.countLogger.debug(f"Processing variable {i}: {v} (type: {type(v)})")
             if v is None:
-                self.countLogger.debug(f"Variable {i} is None, skipping")
+                if self.countLogDebug: self.countLogger.debug(f"Variable {i} is None, skipping")
                 continue
-            tv = self._fixVar((v,))[0] if not isinstance(v, torch.Tensor) else v
-            tv = tv.to(device=self.current_device, dtype=torch.float64)
-            tv = torch.clamp(tv, 0.0, 1.0)
-            self.countLogger.debug(f"Variable {i} after processing: {tv.item() if tv.numel() == 1 else tv}")
+            tv = self._countLiteral(v)
+            if self.countLogDebug: self.countLogger.debug(f"Variable {i} after processing: {tv.item() if tv.numel() == 1 else tv}")
             vals.append(tv)
             
         for i, v in enumerate(vals):
@@ -553,7 +775,7 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
                self.countLogger.warning(f"Variable {i}: countVar expects scalar literals; got shape {tuple(v.shape)}: {v}")
 
         if len(vals) == 0:
-            self.countLogger.info("No valid variables found, using zero tensor")
+            if self.countLogInfo: self.countLogger.info("No valid variables found, using zero tensor")
             t = torch.zeros(1, device=self.current_device, dtype=torch.float64, requires_grad=True)
         else:
             # If scalar -> keep as scalar; if vector/tensor -> flatten.
@@ -566,16 +788,16 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         n = t.numel()
         s = int(limit)  # ensure Python int
         
-        self.countLogger.info(f"Final tensor t: {t}")
-        self.countLogger.info(f"Tensor length n: {n}, target count s: {s}")
+        if self.countLogInfo: self.countLogger.info(f"Final tensor t: {t}")
+        if self.countLogInfo: self.countLogger.info(f"Tensor length n: {n}, target count s: {s}")
 
         # ---- Choose t-norm family for counting
         method = self.counting_tnorm if getattr(self, "counting_tnorm", None) else self.tnorm
-        self.countLogger.info(f"Using method: {method}")
+        if self.countLogInfo: self.countLogger.info(f"Using method: {method}")
 
         # Helpers return a **loss in [0,1]** (0 = satisfied, 1 = maximally violated).
         if method == "G":  # Gödel
-            self.countLogger.debug("Defining Gödel t-norm helper functions")
+            if self.countLogDebug: self.countLogger.debug("Defining Gödel t-norm helper functions")
             exists_at_least_one = lambda t: 1 - torch.max(t)  # loss is 0 when any literal is 1
             
             def exists_at_least_s_godel(t, s):
@@ -620,7 +842,7 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
             exists_exactly_s = exists_exactly_s_godel
 
         elif method == "L":  # Łukasiewicz
-            self.countLogger.debug("Defining Łukasiewicz t-norm helper functions")
+            if self.countLogDebug: self.countLogger.debug("Defining Łukasiewicz t-norm helper functions")
             one = torch.tensor(1.0, device=self.current_device, dtype=torch.float64, requires_grad=True)
             zero = torch.tensor(0.0, device=self.current_device, dtype=torch.float64, requires_grad=True)
             exists_at_least_one = lambda t: 1 - torch.minimum(torch.sum(t), one)
@@ -639,62 +861,63 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
             )
 
         elif method == "P":  # Product
-            self.countLogger.debug("Defining Product t-norm helper functions")
+            if self.countLogDebug: self.countLogger.debug("Defining Product t-norm helper functions")
             exists_at_least_one = lambda t: torch.prod(1 - t)  # loss small if there exists a high literal
-            exists_at_least_s = lambda t, s: 1 - torch.sum(self.calc_probabilities(t, t.numel())[max(min(s, n), 0) :])
-            exists_at_most_s = lambda t, s: 1 - torch.sum(self.calc_probabilities(t, t.numel())[: max(min(s, n), 0) + 1])
-            exists_exactly_s = lambda t, s: 1 - self.calc_probabilities(t, t.numel())[max(min(s, n), 0)]
+            exists_at_least_s = lambda t, s: self.calc_count_losses(t, ">=", s)
+            exists_at_most_s = lambda t, s: self.calc_count_losses(t, "<=", s)
+            exists_exactly_s = lambda t, s: self.calc_count_losses(t, "==", s)
 
         else:  # "SP" Simplified Product
-            self.countLogger.debug("Defining Simplified Product t-norm helper functions")
+            if self.countLogDebug: self.countLogger.debug("Defining Simplified Product t-norm helper functions")
             exists_at_least_one = lambda t: torch.prod(1 - t)
             exists_at_least_s = lambda t, s: 1 - torch.prod(torch.sort(t, descending=True)[0][: max(min(s, n), 0)]) if max(min(s, n), 0) > 0 else torch.tensor(1.0, device=t.device, dtype=t.dtype, requires_grad=True)
             exists_at_most_s = lambda t, s: 1 - torch.prod(torch.sort(1 - t, descending=True)[0][: max(n - max(min(s, n), 0), 0)]) if max(n - max(min(s, n), 0), 0) > 0 else torch.tensor(1.0, device=t.device, dtype=t.dtype, requires_grad=True)
-            exists_exactly_s = lambda t, s: 1 - self.calc_probabilities(t, t.numel())[max(min(s, n), 0)]
+            exists_exactly_s = lambda t, s: self.calc_count_losses(t, "==", s)
 
         # ---- Compute loss or success
-        self.countLogger.info(f"Computing result for operation '{limitOp}' with limit {s}")
+        if self.countLogInfo: self.countLogger.info(f"Computing result for operation '{limitOp}' with limit {s}")
         
         if limitOp == "==":
-            self.countLogger.debug("Using exists_exactly_s function")
+            if self.countLogDebug: self.countLogger.debug("Using exists_exactly_s function")
             loss = exists_exactly_s(t, s)
         elif limitOp == ">=":
             if s <= 1:
-                self.countLogger.debug("Using exists_at_least_one function (s <= 1)")
+                if self.countLogDebug: self.countLogger.debug("Using exists_at_least_one function (s <= 1)")
                 loss = exists_at_least_one(t)
             else:
-                self.countLogger.debug(f"Using exists_at_least_s function with s={s}")
+                if self.countLogDebug: self.countLogger.debug(f"Using exists_at_least_s function with s={s}")
                 loss = exists_at_least_s(t, s)
         elif limitOp == "<=":
-            self.countLogger.debug("Using exists_at_most_s function")
+            if self.countLogDebug: self.countLogger.debug("Using exists_at_most_s function")
             loss = exists_at_most_s(t, s)
         else:
             self.countLogger.error(f"Unsupported limitOp: {limitOp}")
             raise ValueError(f"Unsupported limitOp: {limitOp}")
 
-        self.countLogger.info(f"Computed loss: {loss.item() if hasattr(loss, 'item') else loss}")
+        if self.countLogInfo: self.countLogger.info(f"Computed loss: {loss.item() if hasattr(loss, 'item') else loss}")
 
         # Ensure result has gradient tracking
         if isinstance(loss, torch.Tensor) and not loss.requires_grad:
             loss = loss.detach().requires_grad_(True)
 
-        # Check if loss is in valid range [0,1]
-        loss_val = loss.item() if hasattr(loss, 'item') else float(loss)
-        if not (0 <= loss_val <= 1):
-            self.countLogger.warning(f"Loss out of bounds [0,1]: {loss_val}")
-            # clamp
+        # Check if loss is in valid range [0,1] - the value is read (device sync, not possible in traced loss) only to log it
+        if self.countLogger.isEnabledFor(logging.WARNING):
+            loss_val = loss.item() if hasattr(loss, 'item') else float(loss)
+            if not (0 <= loss_val <= 1):
+                self.countLogger.warning(f"Loss out of bounds [0,1]: {loss_val}")
+        # clamp - no change of the loss in the valid range
+        if isinstance(loss, torch.Tensor):
             loss = torch.clamp(loss, 0.0, 1.0)
-            self.countLogger.info(f"Loss clamped to: {loss.item() if hasattr(loss, 'item') else loss}")
 
         if onlyConstrains:
             result = loss  # loss in [0,1]
-            self.countLogger.info(f"Returning loss (onlyConstrains=True): {result.item() if hasattr(result, 'item') else result}")
+            if self.countLogInfo: self.countLogger.info(f"Returning loss (onlyConstrains=True): {result.item() if hasattr(result, 'item') else result}")
         else:
             success = 1.0 - loss
             result = torch.clamp(success, 0.0, 1.0)
-            self.countLogger.info(f"Returning success (onlyConstrains=False): {result.item() if hasattr(result, 'item') else result}")
+            if self.countLogInfo: self.countLogger.info(f"Returning success (onlyConstrains=False): {result.item() if hasattr(result, 'item') else result}")
             
-        self.countLogger.info(f"=== {logicMethodName} Operation Completed ===\n")
+        if self.countLogInfo: self.countLogger.info(f"=== {logicMethodName} Operation Completed ===\n")
         return result
             
     def compareCountsVar(
@@ -711,43 +934,43 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         Truth / loss for  count(varsA)  compareOp  count(varsB) + diff
         """
         
-        self.countLogger.info(f"=== {logicMethodName} Operation Started ===")
-        self.countLogger.info(f"Input parameters: compareOp='{compareOp}', diff={diff}, onlyConstrains={onlyConstrains}")
-        self.countLogger.info(f"Number of varsA: {len(varsA)}, Number of varsB: {len(varsB)}")
+        if self.countLogInfo: self.countLogger.info(f"=== {logicMethodName} Operation Started ===")
+        if self.countLogInfo: self.countLogger.info(f"Input parameters: compareOp='{compareOp}', diff={diff}, onlyConstrains={onlyConstrains}")
+        if self.countLogInfo: self.countLogger.info(f"Number of varsA: {len(varsA)}, Number of varsB: {len(varsB)}")
         
         method = self.counting_tnorm if self.counting_tnorm else self.tnorm
-        self.countLogger.info(f"Using method: {method}")
+        if self.countLogInfo: self.countLogger.info(f"Using method: {method}")
 
         # Build the two counts
-        self.countLogger.debug("Processing varsA...")
+        if self.countLogDebug: self.countLogger.debug("Processing varsA...")
         varsA = self._fixVar(tuple(varsA))
         for i, v in enumerate(varsA):
-            self.countLogger.debug(f"varsA[{i}]: {v.item() if v.numel() == 1 else v}")
+            if self.countLogDebug: self.countLogger.debug(f"varsA[{i}]: {v.item() if v.numel() == 1 else v}")
 
-        self.countLogger.debug("Processing varsB...")
+        if self.countLogDebug: self.countLogger.debug("Processing varsB...")
         varsB = self._fixVar(tuple(varsB))
         for i, v in enumerate(varsB):
-            self.countLogger.debug(f"varsB[{i}]: {v.item() if v.numel() == 1 else v}")
+            if self.countLogDebug: self.countLogger.debug(f"varsB[{i}]: {v.item() if v.numel() == 1 else v}")
 
         sumA = torch.clone(varsA[0])
         for v in varsA[1:]:
             sumA.add_(v)
-        self.countLogger.info(f"Sum of varsA: {sumA.item() if sumA.numel() == 1 else sumA}")
+        if self.countLogInfo: self.countLogger.info(f"Sum of varsA: {sumA.item() if sumA.numel() == 1 else sumA}")
 
         sumB = torch.clone(varsB[0])
         for v in varsB[1:]:
             sumB.add_(v)
-        self.countLogger.info(f"Sum of varsB: {sumB.item() if sumB.numel() == 1 else sumB}")
+        if self.countLogInfo: self.countLogger.info(f"Sum of varsB: {sumB.item() if sumB.numel() == 1 else sumB}")
 
         expr = sumA - sumB - diff
-        self.countLogger.info(f"Expression (countA - countB - diff): {expr.item() if expr.numel() == 1 else expr}")
+        if self.countLogInfo: self.countLogger.info(f"Expression (countA - countB - diff): {expr.item() if expr.numel() == 1 else expr}")
         
         tZero = torch.zeros_like(expr, device=self.current_device, requires_grad=True, dtype=torch.float64)
         tOne  = torch.ones_like(expr, device=self.current_device, requires_grad=True, dtype=torch.float64)
 
         # Gödel logic
         if method == "G":
-            self.countLogger.debug("Using Gödel logic")
+            if self.countLogDebug: self.countLogger.debug("Using Gödel logic")
             if   compareOp == '>' : 
                 success = torch.where(expr >  0, tOne, tZero)
             elif compareOp == '>=': 
@@ -764,7 +987,7 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         # Product logic (smooth)
         elif method == "P":
             β = 10.0
-            self.countLogger.debug(f"Using Product logic with steepness β={β}")
+            if self.countLogDebug: self.countLogger.debug(f"Using Product logic with steepness β={β}")
             if   compareOp in ('>', '>='):
                 k = (0.0 if compareOp == '>=' else 1e-6)
                 sigmoid_input = β * (expr - k)
@@ -782,7 +1005,7 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
 
         # Łukasiewicz logic (piece-wise linear)
         elif method == "L":
-            self.countLogger.debug("Using Łukasiewicz logic")
+            if self.countLogDebug: self.countLogger.debug("Using Łukasiewicz logic")
             if   compareOp == '>':
                 success = torch.clamp(expr, min=0.0, max=1.0)
             elif compareOp == '>=':
@@ -801,7 +1024,7 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
 
         # Simplified-product logic
         else:  # "SP"
-            self.countLogger.debug("Using Simplified Product logic")
+            if self.countLogDebug: self.countLogger.debug("Using Simplified Product logic")
             if   compareOp == '>':
                 success = torch.clamp(expr, min=0.0, max=1.0)
             elif compareOp == '>=':
@@ -821,18 +1044,18 @@ class lcLossBooleanMethods(ilpBooleanProcessor):
         # return loss or success
         if onlyConstrains:
             result = 1.0 - success
-            self.countLogger.info(f"Returning loss (onlyConstrains=True): {result.item() if result.numel() == 1 else result}")
+            if self.countLogInfo: self.countLogger.info(f"Returning loss (onlyConstrains=True): {result.item() if result.numel() == 1 else result}")
         else:
             result = success
-            self.countLogger.info(f"Returning success (onlyConstrains=False): {result.item() if result.numel() == 1 else result}")
+            if self.countLogInfo: self.countLogger.info(f"Returning success (onlyConstrains=False): {result.item() if result.numel() == 1 else result}")
             
-        self.countLogger.info(f"=== {logicMethodName} Operation Completed ===\n")
+        if self.countLogInfo: self.countLogger.info(f"=== {logicMethodName} Operation Completed ===\n")
         return result
     
     def fixedVar(self, _, _var, onlyConstrains = False):
         logicMethodName = "FIXED"
         
-        if self.ifLog: self.myLogger.debug("%s called with: %s"%(logicMethodName,_var))
+        if self.ifLogDebug: self.myLogger.debug("%s called with: %s"%(logicMethodName,_var))
         
         fixedSuccess = torch.ones(1, device=self.current_device, requires_grad=True, dtype=torch.float64)
         
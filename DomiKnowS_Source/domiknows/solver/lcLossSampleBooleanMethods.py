@@ -23,6 +23,10 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
         return False
     #--
     
+    # Fused evaluation - the literals of the operation are stacked into one [literals, samples] tensor reduced at once
+    def stackVar(self, var, dtype = torch.bool):
+        return torch.stack([v.to(dtype) for v in torch.broadcast_tensors(*var)])
+    
     def notVar(self, _, var, onlyConstrains = False):
         if self.ifNone([var]):
             return None
@@ -37,9 +41,7 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
         if self.ifNone(var):
             return None
         
-        andSuccess = var[0]
-        for i in range(1, len(var)):
-            andSuccess = torch.logical_and(andSuccess, var[i])
+        andSuccess = self.stackVar(var).all(dim=0)
             
         if onlyConstrains:
             andLoss = torch.logical_not(andSuccess)
@@ -52,9 +54,7 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
         if self.ifNone(var):
             return None
         
-        orSuccess = var[0]
-        for i in range(1, len(var)):
-            orSuccess = torch.logical_or(orSuccess, var[i])
+        orSuccess = self.stackVar(var).any(dim=0)
             
         if onlyConstrains:
             orLoss = torch.logical_not(orSuccess)
@@ -68,9 +68,7 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
         if self.ifNone(var):
             return None
             
-        nandSuccess = var[0]
-        for i in range(1, len(var)):
-            nandSuccess = torch.logical_and(nandSuccess, var[i])
+        nandSuccess = self.stackVar(var).all(dim=0)
             
         # nand is reversed to and
         if onlyConstrains:
@@ -98,9 +96,7 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
         if self.ifNone(var):
             return None
             
-        norSuccess = var[0]
-        for i in range(1, len(var)):
-            norSuccess = torch.logical_or(norSuccess, var[i])
+        norSuccess = self.stackVar(var).any(dim=0)
             
         # nor is reversed to or
         if onlyConstrains:
@@ -121,15 +117,8 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
             # XOR of single variable is the variable itself
             return var[0]
         else:
-            # Multi-variable XOR: iteratively apply binary XOR
-            xorSuccess = var[0]
-            
-            for v in var[1:]:
-                # XOR(a, b) = (a AND NOT b) OR (NOT a AND b)
-                xorSuccess = torch.logical_or(
-                    torch.logical_and(xorSuccess, torch.logical_not(v)),
-                    torch.logical_and(torch.logical_not(xorSuccess), v)
-                )
+            # Multi-variable XOR: odd number of true variables
+            xorSuccess = self.stackVar(var).sum(dim=0).remainder(2).bool()
             
             if onlyConstrains:
                 xorLoss = torch.logical_not(xorSuccess)
@@ -151,15 +140,13 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
             # Multi-variable equivalence: all variables have same truth value
             # equiv(a, b, c, ...) = (all true) OR (all false)
             
+            stackedVar = self.stackVar(var)
+            
             # All true case: AND of all variables
-            all_true = var[0]
-            for v in var[1:]:
-                all_true = torch.logical_and(all_true, v)
+            all_true = stackedVar.all(dim=0)
             
-            # All false case: AND of all negated variables
-            all_false = torch.logical_not(var[0])
-            for v in var[1:]:
-                all_false = torch.logical_and(all_false, torch.logical_not(v))
+            # All false case: none of the variables is true
+            all_false = torch.logical_not(stackedVar.any(dim=0))
             
             # Equivalence = (all true) OR (all false)
             equivSuccess = torch.logical_or(all_true, all_false)
@@ -191,10 +178,7 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
 
         varSum = torch.zeros([self.sampleSize], device=self.current_device)
         if fixedVar:
-            varSum = fixedVar[0].clone()
-
-        for i in range(1, len(fixedVar)):
-            varSum.add_(fixedVar[i])
+            varSum = self.stackVar(fixedVar, varSum.dtype).sum(dim=0)
 
         # Check condition
         if limitOp == '>=':
@@ -254,12 +238,12 @@ class lcLossSampleBooleanMethods(ilpBooleanProcessor):
 
         # ---------- count “True” literals per sample --------------------------
         countA = torch.zeros([self.sampleSize], device=self.current_device)
-        for t in tensorsA:
-            countA.add_(t)
+        if tensorsA:
+            countA = self.stackVar(tensorsA, countA.dtype).sum(dim=0)
 
         countB = torch.zeros_like(countA)
-        for t in tensorsB:
-            countB.add_(t)
+        if tensorsB:
+            countB = self.stackVar(tensorsB, countB.dtype).sum(dim=0)
 
         diffTensor = torch.full([self.sampleSize], diff, device=self.current_device)
         delta = countA - countB
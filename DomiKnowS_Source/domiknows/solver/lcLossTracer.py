@@ -0,0 +1,179 @@
+import logging
+from collections import OrderedDict
+
+import torch
+
+from domiknows.solver.ilpConfig import ilpConfig
+
+
+class TracedLcLoss:
+    """
+    LCs losses of one data graph structure traced into a torch.fx GraphModule.
+
+    Attributes:
+        - module (callable): GraphModule (or its torch.compile version) calculating the LCs loss tensors from the literals,
+          None if the loss of this structure can not be traced - it is then calculated by the solver.
+        - literalKeys (list): (DataNode position in the DataNodeIndex, key, label) of the literals in the order of the module inputs.
+        - literalMeta (tuple): None for the missing literals, else dtype, shape and requires_grad of the literal the module was traced with.
+        - lcNames (list): Names of the LCs - the module outputs are their loss tensors.
+    """
+    def __init__(self, module=None, literalKeys=(), literalMeta=(), lcNames=()):
+        self.module = module
+        self.literalKeys = literalKeys
+        self.literalMeta = literalMeta
+        self.lcNames = lcNames
+
+    @staticmethod
+    def meta(value):
+        return None if value is None else (value.dtype, value.shape, value.requires_grad)
+
+    def inputs(self, solver, dn):
+        """Read the literals from the DataNodes - None if they do not match the literals the module was traced with."""
+        dns = dn.dnIndex.dns
+        values = [solver.getMLResult(dns[position], xPkey, eT, 0, loss = True) for position, xPkey, eT in self.literalKeys]
+        if tuple(self.meta(value) for value in values) != self.literalMeta:
+            return None
+
+        return [value for value in values if value is not None]
+
+    def __call__(self, solver, inputs):
+        lcLosses = {}
+        for lcName, lossTensor in zip(self.lcNames, self.module(*inputs)):
+            lcLosses[lcName] = {}
+            solver.setLcLossTensor(lcLosses[lcName], lossTensor)
+
+        return lcLosses
+
+
+class LcLossTracer:
+    """
+    Traced LCs loss - for each structure of the data graph (signature of its DataNodeIndex) the tensorized loss calculation
+    is traced once into a torch.fx GraphModule and later examples with the same structure only read their literals and
+    call the module. The LCs grounding and the Python dispatch of the t-norms are skipped and the module can be compiled
+    with torch.compile (compile - True for the default backend or the backend name).
+
+    A new structure is traced again - the modules of the least recently used structures are dropped above maxSize.
+    The structure is not traced (its loss is calculated by the solver) if its literals can not be gathered or the loss
+    calculation reads tensor values (e.g. logging of the counting LCs when not in the production mode). The loss is
+    also calculated by the solver if an active LC selects its candidates by attribute values (eqL).
+
+    The loss dictionaries returned for the traced structures contain the loss tensors and values calculated from them,
+    not the lossList of the solver.
+    """
+    def __init__(self, maxSize=8, compile=False):
+        self.maxSize = maxSize
+        self.compile = compile
+        self.traces = OrderedDict() # signature -> TracedLcLoss
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.myLogger = logging.getLogger(ilpConfig['log_name'])
+
+    def __len__(self):
+        return len(self.traces)
+
+    def signature(self, solver, dn, tnorm, counting_tnorm):
+        dnIndex = dn.dnIndex
+        if dnIndex is None or not dnIndex.valid:
+            return None
+
+        activeLcs = []
+        for graph in solver.myGraph:
+            for lcName, lc in graph.logicalConstrains.items():
+                if not lc.headLC or not lc.active:
+                    continue
+
+                # Candidates selected by attribute values (eqL) depend on the data, not only on the structure
+                if not solver.lcGroundings.plan(lc).cacheable:
+                    return None
+
+                activeLcs.append(lcName)
+
+        activeLcs = tuple(activeLcs)
+        return (dnIndex.signature(), tnorm, counting_tnorm, activeLcs, torch.is_grad_enabled())
+
+    def __call__(self, solver, dn, tnorm='P', counting_tnorm=None):
+        signature = self.signature(solver, dn, tnorm, counting_tnorm)
+        if signature is None:
+            self.fallbacks += 1
+            return solver.calculateLcLoss(dn, tnorm=tnorm, counting_tnorm=counting_tnorm, tensorized=True)
+
+        traced = self.traces.get(signature)
+        if traced is not None:
+            self.traces.move_to_end(signature)
+            if traced.module is None:
+                self.fallbacks += 1
+                return solver.calculateLcLoss(dn, tnorm=tnorm, counting_tnorm=counting_tnorm, tensorized=True)
+
+            inputs = traced.inputs(solver, dn)
+            if inputs is not None:
+                self.hits += 1
+                return traced(solver, inputs)
+
+        # New structure (or different missing literals) - calculate the loss and trace it
+        self.misses += 1
+        literals = {}
+        lcLosses = solver.calculateLcLoss(dn, tnorm=tnorm, counting_tnorm=counting_tnorm, tensorized=True, lossLiterals=literals)
+
+        try:
+            traced = self.trace(solver, dn, tnorm, counting_tnorm, literals, list(lcLosses))
+        except Exception as e:
+            self.myLogger.warning('LC loss of the data graph structure can not be traced, it is calculated by the solver - %s'%(e))
+            traced = TracedLcLoss()
+
+        self.traces[signature] = traced
+        while len(self.traces) > self.maxSize:
+            self.traces.popitem(last=False)
+
+        return lcLosses
+
+    def trace(self, solver, dn, tnorm, counting_tnorm, literals, lcNames):
+        from torch.fx.experimental.proxy_tensor import make_fx
+
+        if not solver.lossLiteralsGathered:
+            raise ValueError('not all the literals were gathered')
+
+        dnIndex = dn.dnIndex
+        literalKeys = []
+        literalMeta = []
+        inputKeys = []
+        inputs = []
+        for literalKey, value in literals.items():
+            literalDn, xPkey, eT = literalKey
+            if literalDn is None: # Missing candidate - part of the structure
+                continue
+
+            position = dnIndex.position(literalDn)
+            if position is None:
+                raise ValueError('literal of %s outside of the data graph'%(literalDn))
+
+            literalKeys.append((position, xPkey, eT))
+            literalMeta.append(TracedLcLoss.meta(value))
+            if value is not None:
+                inputKeys.append(literalKey)
+                inputs.append(value)
+
+        def lcLoss(*inputs):
+            lossLiterals = {literalKey: None for literalKey in literals}
+            lossLiterals.update(zip(inputKeys, inputs))
+
+            lcLosses = solver.calculateLcLoss(dn, tnorm=tnorm, counting_tnorm=counting_tnorm, tensorized=True, lossLiterals=lossLiterals)
+            if not solver.lossLiteralsGathered or len(lossLiterals) != len(literals):
+                raise ValueError('literals changed while tracing')
+
+            return [lcLosses[lcName]['lossTensor'] for lcName in lcNames]
+
+        module = make_fx(lcLoss)(*inputs)
+        module.graph.eliminate_dead_code()
+        module.recompile()
+
+        if self.compile:
+            module = torch.compile(module) if self.compile is True else torch.compile(module, backend=self.compile)
+
+        return TracedLcLoss(module, literalKeys, tuple(literalMeta), lcNames)
+
+    def clear(self):
+        self.traces.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'fallbacks': self.fallbacks, 'traces': len(self.traces)}
@@ -4,7 +4,6 @@ from domiknows.graph import Concept
 
 from .ilpOntSolver import ilpOntSolver
 from .session.solver_session import SolverSession
-from .session.gurobi_session import GurobiSession
 from .constructor.constructor import ScoreConstructor, ProbConstructor
 
 
@@ -20,7 +19,10 @@ class MiniSolverDebug(ilpOntSolver):
         for cur_graph in graph:
             self.names.update({concept.name: concept for concept in cur_graph.traversal_apply(func)})
         self.constructor = constructor or ScoreConstructor(**kwargs)
-        self.SessionType = SessionType or GurobiSession
+        if SessionType is None:
+            from .session.gurobi_session import GurobiSession
+            SessionType = GurobiSession
+        self.SessionType = SessionType
 
     def set_predication(self, predicate, idx, value):
         # predicates_result[concept][idx] = session.get_value(variables[concept, x])
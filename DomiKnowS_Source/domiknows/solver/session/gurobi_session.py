@@ -50,3 +50,6 @@ class GurobiSession(SolverSession):
 
     def get_value(self, var):
         return var.x
+
+    def get_objective_value(self):
+        return self.model.ObjVal
@@ -0,0 +1,148 @@
+import warnings
+
+import numpy as np
+from scipy.optimize import milp, LinearConstraint, Bounds
+from scipy.sparse import coo_array
+
+from .solver_session import SolverSession
+
+
+class HighsLinExpr:
+    """Linear expression over HighsSession variables - coefficients by variable index and a constant."""
+    def __init__(self, coeffs=None, constant=0.):
+        self.coeffs = coeffs if coeffs is not None else {}
+        self.constant = constant
+
+    @staticmethod
+    def of(value):
+        if isinstance(value, HighsLinExpr):
+            return value
+        return HighsLinExpr(constant=float(value))
+
+    def copy(self):
+        return HighsLinExpr(dict(self.coeffs), self.constant)
+
+    def __iadd__(self, other):
+        other = HighsLinExpr.of(other)
+        for index, coeff in other.coeffs.items():
+            self.coeffs[index] = self.coeffs.get(index, 0.) + coeff
+        self.constant += other.constant
+        return self
+
+    def __add__(self, other):
+        return self.copy().__iadd__(other)
+
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        if isinstance(other, HighsLinExpr):
+            raise TypeError('HiGHS session supports only linear expressions')
+        other = float(other)
+        return HighsLinExpr({index: coeff * other for index, coeff in self.coeffs.items()}, self.constant * other)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return self * -1.
+
+    def __sub__(self, other):
+        return self + (-HighsLinExpr.of(other))
+
+    def __rsub__(self, other):
+        return HighsLinExpr.of(other) + (-self)
+
+    def __str__(self):
+        terms = ' + '.join('%s x%i' % (coeff, index) for index, coeff in self.coeffs.items())
+        return '%s + %s' % (terms, self.constant) if self.constant else terms
+
+
+class HighsVar(HighsLinExpr):
+    def __init__(self, index, name=None):
+        super().__init__({index: 1.})
+        self.index = index
+        self.name = name
+
+    def __str__(self):
+        return self.name or 'x%i' % self.index
+
+
+class HighsSession(SolverSession):
+    """SolverSession solving the model with the HiGHS MILP solver bundled with scipy (scipy.optimize.milp)."""
+    def __init__(self, silence=True, time_limit=None):
+        self.silence = silence
+        self.time_limit = time_limit
+        self.vars = [] # (vtype, lb, ub, name)
+        self.constrs = [] # (expr, lb, ub, name)
+        self.objective = None
+        self.sense = None
+        self.solution = None
+        self.objective_value = None
+        self.status = None
+
+    def __str__(self):
+        return '<HighsSession %i vars, %i constrs>' % (len(self.vars), len(self.constrs))
+
+    def var(self, vtype, lb, ub, name=None):
+        var = HighsVar(len(self.vars), name)
+        self.vars.append((vtype, lb, ub, name))
+        return var
+
+    def constr(self, lhs, ctype, rhs, name=None):
+        # strict inequalities are treated as non-strict, as in GurobiSession
+        expr = HighsLinExpr.of(lhs) - rhs
+        bound = -expr.constant
+        if ctype == SolverSession.CTYPE.EQ:
+            constr = (expr, bound, bound, name)
+        elif ctype in (SolverSession.CTYPE.LT, SolverSession.CTYPE.LE):
+            constr = (expr, -np.inf, bound, name)
+        else:
+            constr = (expr, bound, np.inf, name)
+        self.constrs.append(constr)
+        return constr
+
+    def obj(self, otype, expr):
+        self.objective = HighsLinExpr.of(expr)
+        self.sense = otype
+        return self.objective
+
+    def optimize(self):
+        n = len(self.vars)
+        c = np.zeros(n)
+        constant = 0.
+        if self.objective is not None:
+            for index, coeff in self.objective.coeffs.items():
+                c[index] = coeff
+            constant = self.objective.constant
+        sign = -1. if self.sense == SolverSession.OTYPE.MAX else 1. # milp minimizes
+
+        integrality = np.array([0 if vtype == SolverSession.VTYPE.DEC else 1 for vtype, _, _, _ in self.vars])
+        bounds = Bounds([lb for _, lb, _, _ in self.vars], [ub for _, _, ub, _ in self.vars])
+
+        constraints = ()
+        if self.constrs:
+            rows, cols, data = [], [], []
+            for row, (expr, _, _, _) in enumerate(self.constrs):
+                for index, coeff in expr.coeffs.items():
+                    rows.append(row)
+                    cols.append(index)
+                    data.append(coeff)
+            A = coo_array((data, (rows, cols)), shape=(len(self.constrs), n)).tocsr()
+            constraints = LinearConstraint(A, [lb for _, lb, _, _ in self.constrs], [ub for _, _, ub, _ in self.constrs])
+
+        options = {'disp': not self.silence}
+        if self.time_limit is not None:
+            options['time_limit'] = self.time_limit
+
+        result = milp(sign * c, constraints=constraints, integrality=integrality, bounds=bounds, options=options)
+        self.status = result.status
+        if result.x is not None:
+            self.solution = np.where(integrality, np.round(result.x), result.x)
+            self.objective_value = float(c @ self.solution) + constant
+        if result.status != 0:
+            warnings.warn('Model did not finish in an optimal status! Status is {} - {}.'.format(result.status, result.message), RuntimeWarning)
+
+    def get_value(self, var):
+        return self.solution[var.index]
+
+    def get_objective_value(self):
+        return self.objective_value
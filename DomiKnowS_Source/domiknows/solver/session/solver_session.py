@@ -29,3 +29,9 @@ class SolverSession:
 
     def optimize(self):
         raise NotImplementedError
+
+    def get_value(self, var):
+        raise NotImplementedError
+
+    def get_objective_value(self):
+        raise NotImplementedError
@@ -12,6 +12,7 @@ from collections import OrderedDict, Counter
 from typing import Iterable
 from contextlib import contextmanager
 import logging
+import threading
 from logging.handlers import RotatingFileHandler
 
 from colorama import init
@@ -272,13 +273,14 @@ def add_error_warning_handler_to_logger(logger):
     error_warning_handler = _error_warning_handler_class()
     logger.addHandler(error_warning_handler)
 
-def setup_logger(config=None, default_filename='app.log'):
+def setup_logger(config=None, default_filename='app.log', rotate=True):
     """
     Setup a logger with file rotation and timestamp-based backup.
     
     Args:
         config (dict): Configuration dictionary with logging parameters
         default_filename (str): Default log filename if not specified in config
+        rotate (bool): Move the existing log files to the previous runs - False for the file already opened in this run
         
     Returns:
         logging.Logger: Configured logger instance
@@ -329,7 +331,8 @@ def setup_logger(config=None, default_filename='app.log'):
     pathlib.Path(log_dir).mkdir(parents=True, exist_ok=True)
     
     # Move existing log file with timestamp before creating new handler
-    move_existing_logfile_with_timestamp(log_path, timestampBackupCount)
+    if rotate:
+        move_existing_logfile_with_timestamp(log_path, timestampBackupCount)
     
     # Create logger
     logger = logging.getLogger(logName)
@@ -361,6 +364,54 @@ def setup_logger(config=None, default_filename='app.log'):
     
     return logger
 
+class LazyLogger:
+    """
+    Logger configured by setup_logger on its first use - importing a module that declares it
+    does not create or rotate its log file. All attributes are those of the configured logger.
+
+    Loggers writing to the same file are declared with sharedWith (the lazy logger declared first) - they are
+    all set up, in the order of declaration, on the first use of any of them. Only the first one moves the
+    existing log files to the previous runs, so this is done once and not in the middle of the run.
+    """
+    def __init__(self, config=None, default_filename='app.log', onSetup=None, sharedWith=None):
+        self._config = config
+        self._default_filename = default_filename
+        self._onSetup = onSetup
+        self._logger = None
+        self._group = sharedWith._group if sharedWith is not None else []
+        self._group.append(self)
+
+    @property
+    def logger(self):
+        if self._logger is None:
+            with _lazyLoggerLock:
+                for lazyLogger in self._group:
+                    lazyLogger._setup(rotate = lazyLogger is self._group[0])
+        return self._logger
+
+    def _setup(self, rotate=True):
+        if self._logger is None:
+            logger = setup_logger(self._config, self._default_filename, rotate=rotate)
+            if self._onSetup is not None:
+                self._onSetup(logger)
+            self._logger = logger
+
+    def __getattr__(self, name):
+        return getattr(self.logger, name)
+
+_lazyLoggerLock = threading.Lock()
+
+def disableLogger(logger):
+    """
+    Disable the logger - its records are dropped and isEnabledFor() returns False for it,
+    so hot paths guarding their logging with isEnabledFor() skip building the log messages.
+    """
+    logger.addFilter(lambda record: False)
+    logger.disabled = True
+
+# Loggers logging on every logic operation - disabled in production mode
+perOperationLoggers = ("lcLossCountOperations", "lossModelOperations", "primalDualModelOperations", "inferenceModelOperations", "sampleLossModelOperations")
+
 noUseTimeLog = False
 myLoggerTime = None
 def getRegrTimer_logger(_config=None):
@@ -369,13 +420,13 @@ def getRegrTimer_logger(_config=None):
     
     if myLoggerTime:
         if noUseTimeLog:
-            myLoggerTime.addFilter(lambda record: False)
+            disableLogger(myLoggerTime)
         return myLoggerTime
     
     myLoggerTime = setup_logger(_config, 'regrTimer.log')
     
     if noUseTimeLog:
-        myLoggerTime.addFilter(lambda record: False)
+        disableLogger(myLoggerTime)
     else:
         myLoggerTime.info('--- Starting new run ---')
     
@@ -391,16 +442,18 @@ def setProductionLogMode(no_UseTimeLog = False, reuse_model=True):
     productionMode = True
     reuseModel = reuse_model
     ilpOntSolverLog = logging.getLogger("ilpOntSolver")
-    ilpOntSolverLog.addFilter(lambda record: False)
+    disableLogger(ilpOntSolverLog)
     dataNodeLog = logging.getLogger("dataNode")
-    dataNodeLog.addFilter(lambda record: False)
+    disableLogger(dataNodeLog)
     dataNodeBuilderLog = logging.getLogger("dataNodeBuilder")
-    dataNodeBuilderLog.addFilter(lambda record: False)
+    disableLogger(dataNodeBuilderLog)
+    for loggerName in perOperationLoggers:
+        disableLogger(logging.getLogger(loggerName))
     
     noUseTimeLog = no_UseTimeLog
     if noUseTimeLog:
         if myLoggerTime != None:
-            myLoggerTime.addFilter(lambda record: False)
+            disableLogger(myLoggerTime)
     
 def getProductionModeStatus():
     return productionMode
@@ -8,8 +8,10 @@ Translates high-level specifications from Huginn into executable DomiKnowS code.
 
 
 
+import importlib.util
 import os
 import sys
+import threading
 
 # Fix path for standalone testing
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,31 +19,42 @@ domiknows_path = os.path.join(project_root, 'DomiKnowS_Source')
 if domiknows_path not in sys.path:
     sys.path.append(domiknows_path)
 
-if os.environ.get("ANTIGRAVITY_SIMULATION") == "TRUE":
-    print("[ADS] SIMULATION MODE ENABLED. Skipping DomiKnowS imports.")
-    DOMIKNOWS_AVAILABLE = False
-    def ifL(*args): pass
-    def andL(*args): pass
-    def atLeastL(*args): pass
-    class Graph:
-        def __init__(self, *args, **kwargs): pass
-        def __enter__(self): return self
-        def __exit__(self, *args): pass
-    class Concept:
-        def __init__(self, *args, **kwargs): pass
-        @classmethod
-        def relation_type(cls, name): return lambda x: x
-    class Relation:
-        pass
-else:
-    try:
-        from domiknows.graph.logicalConstrain import ifL, andL, atLeastL
-        from domiknows.graph import Graph, Concept, Relation
-        DOMIKNOWS_AVAILABLE = True
-    except ImportError:
-        print("[ADS] Warning: DomiKnowS library not found. Switching to SIMULATION MODE.")
-        DOMIKNOWS_AVAILABLE = False
-        # Mock classes (same as above fallback)
+DOMIKNOWS_EXPORTS = ('ifL', 'andL', 'atLeastL', 'Graph', 'Concept', 'Relation')
+
+_domiknows_available = None
+
+def domiknows_available() -> bool:
+    """
+    Checks that DomiKnowS can be used without importing it (torch and the solvers load in seconds).
+    The generated programs run in the sandbox workers - the Architect itself only writes code.
+    """
+    global _domiknows_available
+    if _domiknows_available is None:
+        if os.environ.get("ANTIGRAVITY_SIMULATION") == "TRUE":
+            print("[ADS] SIMULATION MODE ENABLED. Skipping DomiKnowS imports.")
+            _domiknows_available = False
+        elif importlib.util.find_spec('domiknows') is None:
+            print("[ADS] Warning: DomiKnowS library not found. Switching to SIMULATION MODE.")
+            _domiknows_available = False
+        else:
+            _domiknows_available = True
+    return _domiknows_available
+
+
+def _load_domiknows():
+    """Imports the DomiKnowS names on first access - falls back to the simulation mocks when it is not available."""
+    loaded = None
+    if domiknows_available():
+        try:
+            from domiknows.graph.logicalConstrain import ifL, andL, atLeastL
+            from domiknows.graph import Graph, Concept, Relation
+            loaded = True
+        except ImportError:
+            print("[ADS] Warning: DomiKnowS library not found. Switching to SIMULATION MODE.")
+            loaded = False
+
+    if not loaded:
+        # Mock classes used in simulation mode
         def ifL(*args): pass
         def andL(*args): pass
         def atLeastL(*args): pass
@@ -56,31 +69,105 @@ else:
         class Relation:
             pass
 
+    names = dict(zip(DOMIKNOWS_EXPORTS, (ifL, andL, atLeastL, Graph, Concept, Relation)))
+    names['DOMIKNOWS_AVAILABLE'] = bool(loaded)
+    globals().update(names)
+
+
+def __getattr__(name):
+    # PEP 562 - DomiKnowS names are imported only when a caller uses them
+    if name in DOMIKNOWS_EXPORTS or name == 'DOMIKNOWS_AVAILABLE':
+        _load_domiknows()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 
 import yaml
 
+from agents.intent_trace import IntentTrace
+from agents.program_cache import CompiledProgram, ProgramCache, dna_hash, normalize_strategy
+
 class ADSArchitect:
-    def __init__(self):
+    def __init__(self, cache: ProgramCache = None):
         print("[ADS] Architect initialized. Waiting for design specs.")
         self.domain_config = {}
+        self.domain_path = None
+        self.domain_mtime = None
+        self.domain_hash = None
+        self.cache = cache if cache is not None else ProgramCache()
+        self._domain_lock = threading.Lock()
 
     def load_domain(self, yaml_path: str):
         """Loads domain logic from a YAML file."""
         print(f"[ADS] Loading domain DNA from: {yaml_path}")
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            self.domain_config = yaml.safe_load(f)
+        self._read_domain(yaml_path)
         return self.domain_config
 
-    def compile(self, design_spec: dict) -> str:
+    def _read_domain(self, yaml_path: str):
+        mtime = os.stat(yaml_path).st_mtime_ns
+        with open(yaml_path, 'rb') as f:
+            raw = f.read()
+
+        previous_hash = self.domain_hash
+        self.domain_config = yaml.safe_load(raw.decode('utf-8'))
+        self.domain_path, self.domain_mtime, self.domain_hash = yaml_path, mtime, dna_hash(raw)
+
+        if previous_hash is not None and previous_hash != self.domain_hash:
+            self.cache.invalidate(previous_hash)
+
+    def _refresh_domain(self, trace=None):
+        """Reloads the DNA if the YAML file was modified since it was loaded."""
+        if self.domain_path is None:
+            return
+
+        try:
+            mtime = os.stat(self.domain_path).st_mtime_ns
+        except OSError:
+            return # File removed - keep serving the loaded DNA
+
+        if mtime != self.domain_mtime:
+            with self._domain_lock: # Concurrent requests reload the DNA once
+                if mtime != self.domain_mtime:
+                    IntentTrace.emit(trace, f"[ADS] Domain DNA changed, reloading: {self.domain_path}")
+                    self._read_domain(self.domain_path)
+
+    def cache_key(self, design_spec: dict):
+        """
+        (DNA hash, normalized strategy) - with a loaded DNA the generated code depends only on
+        the DNA, so the strategy is normalized away and every request for the domain shares the entry.
+        """
+        if self.domain_config:
+            return (self.domain_hash, None)
+        return (None, normalize_strategy(design_spec))
+
+    def compile_program(self, design_spec: dict, trace: IntentTrace = None) -> CompiledProgram:
+        """
+        Returns the CompiledProgram for the specification - from the cache when the same DNA
+        and strategy were already compiled, generating the code otherwise.
+        """
+        self._refresh_domain(trace)
+        key = self.cache_key(design_spec)
+
+        program = self.cache.get(key)
+        if program is not None:
+            IntentTrace.emit(trace, f"[ADS] Cached logic for domain: {program.domain}")
+            return program
+
+        return self.cache.put(key, self._generate(design_spec, trace))
+
+    def compile(self, design_spec: dict, trace: IntentTrace = None) -> str:
         """
         Translates a logic specification into a Python script string
         that creates the DomiKnowS graph, using the loaded domain config.
         """
+        return self.compile_program(design_spec, trace).code
+
+    def _generate(self, design_spec: dict, trace: IntentTrace = None) -> CompiledProgram:
         domain_data = self.domain_config if self.domain_config else design_spec
         domain_name = domain_data.get('domain', 'GenericDomain')
         
-        print(f"[ADS] Compiling logic for domain: {domain_name}")
+        IntentTrace.emit(trace, f"[ADS] Compiling logic for domain: {domain_name}")
         
         # Generation Logic
         generated_code = f"""
@@ -101,8 +188,8 @@ with Graph('{domain_name}') as graph:
             logic = constraint['logic']
             generated_code += f"    {logic} # {constraint['name']}\n"
             
-        print("[ADS] Code Generation Complete.")
-        return generated_code
+        IntentTrace.emit(trace, "[ADS] Code Generation Complete.")
+        return CompiledProgram(domain_name, generated_code)
 
 if __name__ == "__main__":
     ads = ADSArchitect()
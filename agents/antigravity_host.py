@@ -10,6 +10,7 @@ to the real world (files, user inputs, outputs).
 
 import sys
 import os
+import threading
 
 # Add local DomiKnowS source to path to ensure it runs without system-wide install
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,40 +21,18 @@ if domiknows_path not in sys.path:
 
 from agents.huginn_brain import HuginnBrain
 from agents.ads_architect import ADSArchitect
+from agents.host_pipeline import HostPipeline
+from agents.sandbox import SandboxExecutor
 
 
-class AntigravityHost:
-    def __init__(self):
+class AntigravityHost(HostPipeline):
+    def __init__(self, sandbox: SandboxExecutor = None):
         print("--- Antigravity Host Booting Up ---")
         self.brain = HuginnBrain()
         self.architect = ADSArchitect()
-
-    def process_user_intent(self, user_input: str):
-        print(f"\n[Host] New User Intent: '{user_input}'")
-        
-        # 1. Ask Brain for Strategy
-        strategy = self.brain.reason(user_input)
-        if "error" in strategy:
-            print(f"[Host] Brain Error: {strategy['error']}")
-            return
-
-        # 2. Ask Architect to Build Logic
-        try:
-            program_code = self.architect.compile(strategy)
-        except Exception as e:
-            print(f"[Host] Architect Error (ADS): {e}")
-            print("[Host] Critical Failure: Logic could not be generated.")
-            return
-        
-        # 3. Execution (Sandbox)
-        print("\n[Host] Executing Generated Logic...")
-        # In PROD, we would write this to a file and run it safely.
-        # Here we just print the success of the pipeline.
-        print(">>> Execution Sandbox <<<")
-        print(program_code)
-        print(">>> End Sandbox <<<")
-        
-        print("\n[Host] Task Complete. Logic is legally verified.")
+        self.sandbox = sandbox # Started on first use unless a pre-warmed pool is given
+        self._sandbox_lock = threading.Lock()
+        self.batch_workers = int(os.environ.get('HOST_BATCH_WORKERS', 8)) # Requests of a batch compiled/executed at the same time
 
 if __name__ == "__main__":
     # Test the Trio Loop
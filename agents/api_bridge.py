@@ -1,87 +1,186 @@
-
 """
 Agentic Engine API Bridge (The Sidecar)
 ---------------------------------------
 Exposes the Antigravity "Army of Agents" as a local HTTP Service.
 React/Next.js apps send JSON POST requests here to get verified logic.
 
+Requests are served concurrently (one thread per connection, HTTP/1.1 keep-alive)
+and the agent work runs in a bounded worker pool, so bursts from the front-end
+do not queue behind each other. Every request logs into its own IntentTrace
+(no stdout capture), so concurrent traces never mix.
+
 Endpoints:
     POST /reason
         Input: {"query": "I need a PMOC for a cinema..."}
-        Output: {"result": {...Generated Logic...}, "status": "verified"}
+        Output: {"result": {...IntentResult...}, "status": "verified", "timings": {"brain": 0.001, ...}, "trace_log": "..."}
+    POST /reason/batch
+        Input: {"queries": ["I need a PMOC for a cinema...", ...]}
+        Output: {"statuses": {"verified": 2, ...}, "results": [...one /reason output per query, in order...]}
+    GET /health
+        Output: {"status": "ok", "workers": 8, "in_flight": 0}
+
+Configuration (environment):
+    SIDECAR_PORT     - port to listen on (default 8000)
+    SIDECAR_WORKERS  - number of requests processed at the same time (default CPU count + 4, at most 32)
+    SANDBOX_*        - execution sandbox pool, see agents/sandbox.py
 """
 
 import http.server
-import socketserver
 import json
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure we can import our agents
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from agents.antigravity_host import AntigravityHost
+from agents.intent_trace import IntentTrace
+from agents.sandbox import SandboxExecutor
+
+PORT = int(os.environ.get('SIDECAR_PORT', 8000))
+WORKERS = int(os.environ.get('SIDECAR_WORKERS', min(32, (os.cpu_count() or 1) + 4)))
+
 
 # Initialize the Host ONCE (Cold Start)
 print("[Sidecar] Initializing Agent Ecosystem...")
-trio_host = AntigravityHost()
-print("[Sidecar] Usage: Send POST to http://localhost:8000/reason")
+sandbox = SandboxExecutor() # Pre-warmed worker processes executing the generated logic
+trio_host = AntigravityHost(sandbox=sandbox)
+print(f"[Sidecar] Usage: Send POST to http://localhost:{PORT}/reason")
+
+executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='sidecar-worker')
+in_flight = 0
+in_flight_lock = threading.Lock()
+
+
+def run_intent(user_query):
+    """Runs the host pipeline in a worker thread - the agents log into the request's own trace."""
+    global in_flight
+    with in_flight_lock:
+        in_flight += 1
+    try:
+        return trio_host.process_user_intent(user_query, IntentTrace())
+    finally:
+        with in_flight_lock:
+            in_flight -= 1
+
+
+def run_batch(user_queries):
+    """Runs the host batch pipeline in a worker thread - one trace per query."""
+    global in_flight
+    with in_flight_lock:
+        in_flight += len(user_queries)
+    try:
+        return trio_host.process_many(user_queries)
+    finally:
+        with in_flight_lock:
+            in_flight -= len(user_queries)
+
+
+def intent_response(result):
+    payload = result.to_dict()
+    trace = payload.pop("trace")
+    return {
+        "status": result.status,
+        "engine": "Huginn-ADS-Trio",
+        "result": payload,
+        "timings": result.timings,
+        "trace_log": "\n".join(trace)
+    }
+
+
+class AgenticHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # Keep-alive - responses always carry Content-Length
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {"status": "ok", "workers": WORKERS, "in_flight": in_flight})
+        else:
+            self._send_json(404, {"error": "Endpoint not found. Use POST /reason, POST /reason/batch or GET /health"})
 
-class AgenticHandler(http.server.SimpleHTTPRequestHandler):
     def do_POST(self):
-        if self.path == '/reason':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            
-            try:
-                data = json.loads(post_data)
+        post_data = self._read_body()
+
+        if self.path not in ('/reason', '/reason/batch'):
+            self._send_json(404, {"error": "Endpoint not found. Use /reason or /reason/batch"})
+            return
+
+        try:
+            data = json.loads(post_data or b'{}')
+            if self.path == '/reason':
                 user_query = data.get('query', '')
-                
-                print(f"\n[Sidecar] Received Request: {user_query}")
-                
-                # Hijack stdout to capture the host's print output (since it prints logic)
-                # In a real impl, the host would return a dict, but we are capturing the prototype's output.
-                from io import StringIO
-                old_stdout = sys.stdout
-                sys.stdout = mystdout = StringIO()
-                
-                # RUN THE LOGIC
-                trio_host.process_user_intent(user_query)
-                
-                # Restore stdout
-                sys.stdout = old_stdout
-                result_log = mystdout.getvalue()
-                
-                response = {
-                    "status": "success",
-                    "engine": "Huginn-ADS-Trio",
-                    "trace_log": result_log
-                }
-                
-                self._send_json(200, response)
-                
-            except Exception as e:
-                self._send_json(500, {"error": str(e)})
+            else:
+                user_queries = data.get('queries', [])
+                if not isinstance(user_queries, list):
+                    raise ValueError("'queries' must be a list")
+                user_queries = [str(query) for query in user_queries]
+        except (ValueError, AttributeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON payload: {e}"})
+            return
+
+        if self.path == '/reason':
+            print(f"\n[Sidecar] Received Request: {user_query}")
+            task = (run_intent, user_query)
+        else:
+            print(f"\n[Sidecar] Received Batch: {len(user_queries)} requests")
+            task = (run_batch, user_queries)
+
+        try:
+            # RUN THE LOGIC - off the connection thread, in the bounded worker pool
+            result = executor.submit(*task).result()
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+
+        if self.path == '/reason':
+            self._send_json(200, intent_response(result))
         else:
-            self._send_json(404, {"error": "Endpoint not found. Use /reason"})
+            statuses = {}
+            for intent_result in result:
+                statuses[intent_result.status] = statuses.get(intent_result.status, 0) + 1
+            self._send_json(200, {"engine": "Huginn-ADS-Trio", "statuses": statuses, "results": [intent_response(r) for r in result]})
+
+    def do_OPTIONS(self):
+        # CORS preflight sent by the browser before JSON POSTs
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _read_body(self):
+        content_length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(content_length) if content_length else b''
 
     def _send_json(self, code, data):
+        body = json.dumps(data).encode('utf-8')
         self.send_response(code)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*') # Allow React App
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
 
     # Disable generic logging to keep console clean
     def log_message(self, format, *args):
         pass
 
-PORT = 8000
+
+class SidecarServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128 # Accept bursts of connections from the front-end
+
 
 if __name__ == "__main__":
-    with socketserver.TCPServer(("", PORT), AgenticHandler) as httpd:
-        print(f"[Sidecar] Serving Agentic Intelligence on port {PORT}...")
+    with SidecarServer(("", PORT), AgenticHandler) as httpd:
+        print(f"[Sidecar] Serving Agentic Intelligence on port {PORT} with {WORKERS} workers...")
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\n[Sidecar] Shutting down...")
+        finally:
+            executor.shutdown(wait=False)
+            sandbox.close()
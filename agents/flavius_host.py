@@ -10,6 +10,7 @@ to the real world (files, user inputs, outputs).
 
 import sys
 import os
+import threading
 
 # Add local DomiKnowS source to path to ensure it runs without system-wide install
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,43 +21,22 @@ if domiknows_path not in sys.path:
 
 from agents.huginn_brain import HuginnBrain
 from agents.ads_architect import ADSArchitect
+from agents.host_pipeline import HostPipeline
+from agents.sandbox import SandboxExecutor
 
 
-class AntigravityHost:
-    def __init__(self, domain_yaml=None):
+class AntigravityHost(HostPipeline):
+    def __init__(self, domain_yaml=None, sandbox: SandboxExecutor = None):
         print("--- Antigravity Host Booting Up ---")
         self.brain = HuginnBrain()
         self.architect = ADSArchitect()
+        self.sandbox = sandbox # Started on first use unless a pre-warmed pool is given
+        self._sandbox_lock = threading.Lock()
+        self.batch_workers = int(os.environ.get('HOST_BATCH_WORKERS', 8)) # Requests of a batch compiled/executed at the same time
         
         if domain_yaml:
-            self.architect.load_domain(domain_yaml)
-
-    def process_user_intent(self, user_input: str):
-        print(f"\n[Host] New User Intent: '{user_input}'")
-        
-        # 1. Ask Brain for Strategy
-        # The Brain now receives the domain context indirectly via the Host
-        strategy = self.brain.reason(user_input)
-        if "error" in strategy:
-            print(f"[Host] Brain Error: {strategy['error']}")
-            return
-
-        # 2. Ask Architect to Build Logic
-        # It uses the YAML domain config loaded during __init__
-        try:
-            program_code = self.architect.compile(strategy)
-        except Exception as e:
-            print(f"[Host] Architect Error (ADS): {e}")
-            print("[Host] Critical Failure: Logic could not be generated.")
-            return
-        
-        # 3. Execution (Sandbox)
-        print("\n[Host] Executing Generated Logic...")
-        print(">>> Execution Sandbox <<<")
-        print(program_code)
-        print(">>> End Sandbox <<<")
-        
-        print("\n[Host] Task Complete. Logic is legally verified.")
+            domain_config = self.architect.load_domain(domain_yaml)
+            self.brain.add_keywords(domain_config.get('keywords'))
 
 if __name__ == "__main__":
     # In professional use, we point to the DNA file
@@ -0,0 +1,100 @@
+"""
+Host Pipeline
+-------------
+Brain -> Architect -> Sandbox pipeline shared by the Hosts (Antigravity and Flavius).
+A Host sets up its brain, architect, sandbox, _sandbox_lock and batch_workers
+(and loads its domain, if any); the requests are processed here.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.ads_architect import domiknows_available
+from agents.intent_trace import IntentTrace, IntentResult
+from agents.sandbox import SandboxExecutor
+
+
+class HostPipeline:
+    def process_user_intent(self, user_input: str, trace: IntentTrace = None) -> IntentResult:
+        """
+        Runs the Brain -> Architect -> Sandbox pipeline and returns its IntentResult.
+        The agents log into the per-request trace - without one, a trace echoing to stdout is used (CLI).
+        """
+        if trace is None:
+            trace = IntentTrace(echo=True)
+
+        start = time.perf_counter()
+        trace.log(f"\n[Host] New User Intent: '{user_input}'")
+        
+        # 1. Ask Brain for Strategy
+        with trace.stage('brain'):
+            strategy = self.brain.reason(user_input, trace)
+        return self._execute_strategy(strategy, trace, start)
+
+    def process_many(self, user_inputs, traces=None) -> list:
+        """
+        Batch version of process_user_intent (e.g. regression sweeps over archived requests).
+        The Brain reasons over the whole batch at once, then Architect and Sandbox run the
+        requests in parallel. Returns the IntentResult of each input, in order.
+        """
+        traces = traces if traces is not None else [IntentTrace() for _ in user_inputs]
+        if not user_inputs:
+            return []
+
+        start = time.perf_counter()
+        for user_input, trace in zip(user_inputs, traces):
+            trace.log(f"\n[Host] New User Intent: '{user_input}'")
+
+        strategies = self.brain.reason_many(user_inputs, traces)
+        brain_seconds = (time.perf_counter() - start) / len(user_inputs) # Share of the batch reasoning
+        for trace in traces:
+            trace.timings['brain'] = brain_seconds
+
+        with ThreadPoolExecutor(max_workers=min(self.batch_workers, len(user_inputs))) as pool:
+            return list(pool.map(lambda args: self._execute_strategy(*args, start), zip(strategies, traces)))
+
+    def _execute_strategy(self, strategy: dict, trace: IntentTrace, start: float) -> IntentResult:
+        def result(status, strategy=None, program=None, error=None, verification=None):
+            trace.timings['total'] = time.perf_counter() - start
+            return IntentResult(status, strategy, program, error, verification, timings=trace.timings, trace=trace.lines)
+
+        if "error" in strategy:
+            trace.log(f"[Host] Brain Error: {strategy['error']}")
+            return result("brain_error", strategy, error=strategy['error'])
+
+        # 2. Ask Architect to Build Logic
+        try:
+            with trace.stage('architect'):
+                program_code = self.architect.compile(strategy, trace)
+        except Exception as e:
+            trace.log(f"[Host] Architect Error (ADS): {e}")
+            trace.log("[Host] Critical Failure: Logic could not be generated.")
+            return result("architect_error", strategy, error=str(e))
+        
+        # 3. Execution (Sandbox)
+        if not domiknows_available():
+            trace.log("\n[Host] Simulation mode - DomiKnowS not available, execution skipped.")
+            return result("generated", strategy, program_code)
+
+        trace.log("\n[Host] Executing Generated Logic...")
+        trace.log(">>> Execution Sandbox <<<")
+        trace.log(program_code)
+        with trace.stage('sandbox'):
+            verification = self.get_sandbox().run(program_code)
+        for lc_name, lc_result in verification.constraints.items():
+            trace.log(f"{lc_name}: {lc_result['satisfied']:.1f}% satisfied")
+        trace.log(">>> End Sandbox <<<")
+
+        if not verification.verified:
+            trace.log(f"[Host] Sandbox Error ({verification.status}): {verification.error}")
+            return result("sandbox_error", strategy, program_code, verification.error, verification.to_dict())
+
+        trace.log("\n[Host] Task Complete. Logic is legally verified.")
+        return result("verified", strategy, program_code, verification=verification.to_dict())
+
+    def get_sandbox(self) -> SandboxExecutor:
+        if self.sandbox is None:
+            with self._sandbox_lock: # Parallel batch requests start a single pool
+                if self.sandbox is None:
+                    self.sandbox = SandboxExecutor()
+        return self.sandbox
@@ -7,40 +7,108 @@ In a real deployment, this would interface with the Huginn model weights or API.
 For now, it acts as a structured prompt engine to break down abstract problems.
 """
 
+import re
+from bisect import bisect_right
+
+from agents.intent_trace import IntentTrace
+
+# Keywords routing a request to the HVAC domain
+HVAC_KEYWORDS = ["pmoc", "hvac", "ac ", "climatiz", "server", "servidor", "refrig", "cinema"]
+
+# Keywords selecting a stricter HVAC scenario (hospital - healthcare, server - critical infrastructure trap)
+TRAP_KEYWORDS = ["hospital", "server"]
+
+# Separates the requests routed in one pass - can not be part of a keyword
+REQUEST_SEPARATOR = "\0"
+
+
 class HuginnBrain:
     def __init__(self, simulation_mode=True):
         self.simulation_mode = simulation_mode
+        self.hvac_keywords = list(HVAC_KEYWORDS)
+        self._compile_router()
         print("[Huginn] Brain initialized. Ready for deep latent thought.")
 
-    def reason(self, user_request: str) -> dict:
+    def add_keywords(self, keywords):
+        """Extends the HVAC routing keywords (e.g. with the 'keywords' list of the domain YAML)."""
+        for keyword in keywords or []:
+            keyword = str(keyword).lower().replace(REQUEST_SEPARATOR, "")
+            if keyword and keyword not in self.hvac_keywords:
+                self.hvac_keywords.append(keyword)
+        self._compile_router()
+
+    def _compile_router(self):
+        # One pass over the request finds every keyword - the lookaheads report overlapping matches too.
+        # The first lookahead stops at the positions where a keyword starts, the HVAC keywords group captures
+        # the longest one of them and each trap keyword has its own group, so a longer keyword containing
+        # a trap keyword (e.g. 'hospitalar') does not hide it.
+        alternatives = "|".join(re.escape(k) for k in sorted(set(self.hvac_keywords), key=len, reverse=True))
+        trapAlternatives = "|".join(re.escape(k) for k in TRAP_KEYWORDS)
+        traps = "".join(f"(?=({re.escape(k)})?)" for k in TRAP_KEYWORDS)
+        self._router = re.compile(f"(?={alternatives}|{trapAlternatives})(?=({alternatives})?){traps}")
+
+    def _route(self, user_request: str):
+        """Returns the keywords found in the request."""
+        return {keyword for groups in self._router.findall(user_request.lower()) for keyword in groups if keyword}
+
+    def _route_many(self, user_requests):
+        """Returns the keywords found in each request - the requests are routed in one pass."""
+        texts = [user_request.lower() for user_request in user_requests]
+        starts = []
+        start = 0
+        for text in texts:
+            starts.append(start)
+            start += len(text) + len(REQUEST_SEPARATOR)
+
+        matched = [set() for _ in texts]
+        text = REQUEST_SEPARATOR.join(texts)
+        for match in self._router.finditer(text):
+            matched[bisect_right(starts, match.start()) - 1].update(keyword for keyword in match.groups() if keyword)
+        return matched
+
+    def reason(self, user_request: str, trace: IntentTrace = None) -> dict:
         """
         Takes a natural language request and performs 'latent reasoning' 
         to produce a structured design specification.
+        Reasoning steps are logged to the trace when given (printed otherwise).
         """
-        print(f"\n[Huginn] Receiving Request: '{user_request}'")
-        print("[Huginn] Entering Latent Space... (Thinking)")
+        return self._reason(user_request, trace, self._route(user_request))
+
+    def _reason(self, user_request, trace, matched):
+        IntentTrace.emit(trace, f"\n[Huginn] Receiving Request: '{user_request}'")
+        IntentTrace.emit(trace, "[Huginn] Entering Latent Space... (Thinking)")
         
         # In a real model, this is where the "Thinking Process" happens without words.
         # Here, we simulate the output of that process: a structured Spec.
         
         # Example logic simulation for HVAC request
-        req_lower = user_request.lower()
-        if any(w in req_lower for w in ["pmoc", "hvac", "ac ", "climatiz", "server", "servidor", "refrig", "cinema"]):
-            if "hospital" in req_lower:
-                return self._reason_hospital(user_request)
+        if not matched.isdisjoint(self.hvac_keywords):
+            if "hospital" in matched:
+                return self._reason_hospital(user_request, trace)
             else:
-                return self._reason_hvac(user_request)
+                return self._reason_hvac(user_request, trace, matched)
             
         return {"error": "Domain not understood by current latent weights."}
 
-    def _reason_hvac(self, request):
+    def reason_many(self, user_requests, traces=None) -> list:
+        """
+        Reasons over a batch of requests (e.g. regression sweeps over archived requests).
+        The domain of all the requests is classified in one routing pass over the batch.
+        Returns the design specification of each request, in order; traces[i] receives the log of request i.
+        """
+        user_requests = list(user_requests)
+        traces = traces if traces is not None else [None] * len(user_requests)
+        return [self._reason(user_request, trace, matched)
+                for user_request, trace, matched in zip(user_requests, traces, self._route_many(user_requests))]
+
+    def _reason_hvac(self, request, trace=None, matched=None):
         """Standard Commercial HVAC Scenario"""
-        print("[Huginn] ... Decoded 'Commercial HVAC' context.")
+        IntentTrace.emit(trace, "[Huginn] ... Decoded 'Commercial HVAC' context.")
         
         # Benchmarking Logic Trap: Small Server Room
-        if "server" in request.lower():
-            print("[Huginn] !!! TRAP DETECTED: 'Server Room' implies CRITICAL despite size !!!")
-            print("[Huginn] ... Overriding 'Size Heuristic'. Enforcing PMOC.")
+        if "server" in (matched if matched is not None else self._route(request)):
+            IntentTrace.emit(trace, "[Huginn] !!! TRAP DETECTED: 'Server Room' implies CRITICAL despite size !!!")
+            IntentTrace.emit(trace, "[Huginn] ... Overriding 'Size Heuristic'. Enforcing PMOC.")
             return {
                 "domain": "Critical_Infrastructure",
                 "concepts": ["ServerRoom", "PMOC"],
@@ -51,7 +119,7 @@ class HuginnBrain:
                 "goal": "Generate Mandatory PMOC Report"
             }
             
-        print("[Huginn] ... Inferring 'Anvisa' regulatory constraints.")
+        IntentTrace.emit(trace, "[Huginn] ... Inferring 'Anvisa' regulatory constraints.")
         return {
             "domain": "Commercial_HVAC",
             "concepts": ["Room", "AC_System"],
@@ -62,11 +130,11 @@ class HuginnBrain:
             "goal": "Generate Standard PMOC"
         }
 
-    def _reason_hospital(self, request):
+    def _reason_hospital(self, request, trace=None):
         """Critical Healthcare Scenario - Stricter Rules"""
-        print("[Huginn] !!! CRITICAL CONTEXT: HOSPITAL DETECTED !!!")
-        print("[Huginn] ... activating NBR 7256 (Health Establishments).")
-        print("[Huginn] ... Enforcing 'Positive Pressure' and 'HEPA Filter' constraints.")
+        IntentTrace.emit(trace, "[Huginn] !!! CRITICAL CONTEXT: HOSPITAL DETECTED !!!")
+        IntentTrace.emit(trace, "[Huginn] ... activating NBR 7256 (Health Establishments).")
+        IntentTrace.emit(trace, "[Huginn] ... Enforcing 'Positive Pressure' and 'HEPA Filter' constraints.")
         return {
             "domain": "Healthcare_HVAC",
             "concepts": ["OperatingTheater", "IsolationRoom", "HEPA_Filter"],
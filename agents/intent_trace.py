@@ -0,0 +1,64 @@
+"""
+Intent Trace & Result
+---------------------
+Typed return path of the Host pipeline (Brain -> Architect -> Sandbox).
+Each request gets its own IntentTrace: the agents log into it instead of
+printing, and every pipeline stage is timed. The Host returns an IntentResult
+with the strategy, generated code, verification status, timings and trace.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+
+class IntentTrace:
+    """Per-request trace buffer with stage timings. With echo=True lines are also printed (CLI use)."""
+    def __init__(self, echo: bool = False):
+        self.echo = echo
+        self.lines = []
+        self.timings = {}
+
+    def log(self, message: str = ""):
+        self.lines.append(message)
+        if self.echo:
+            print(message)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Times the pipeline stage - seconds are stored in timings under the stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    @staticmethod
+    def emit(trace, message: str = ""):
+        """Logs to the trace if the agent was given one, otherwise prints (standalone agent use)."""
+        if trace is not None:
+            trace.log(message)
+        else:
+            print(message)
+
+
+@dataclass
+class IntentResult:
+    status: str                          # "verified", "generated", "brain_error", "architect_error" or "sandbox_error"
+    strategy: Optional[dict] = None      # Huginn design specification
+    program: Optional[str] = None        # DomiKnowS code generated by ADS
+    error: Optional[str] = None
+    verification: Optional[dict] = None  # Sandbox execution result with the satisfied % of each constraint
+    timings: dict = field(default_factory=dict)  # Seconds per stage: brain, architect, sandbox, total
+    trace: list = field(default_factory=list)
+
+    @property
+    def verified(self) -> bool:
+        return self.status == "verified"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
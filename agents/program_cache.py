@@ -0,0 +1,86 @@
+"""
+ADS Program Cache
+-----------------
+Content-addressed cache of the programs generated by the ADS Architect.
+Entries are keyed by (hash of the loaded domain DNA, normalized strategy) and hold
+the generated DomiKnowS code, so repeated requests for the same domain skip generation.
+Least recently used entries are evicted above the size limit.
+
+The code is executed only in the sandbox workers (agents/sandbox.py) - the Host process
+does not import domiknows. Each worker keeps the Graphs of the programs it executed keyed
+by the hash of the code, so a repeated program also skips graph construction.
+
+Configuration (environment):
+    ADS_CACHE_SIZE - maximum number of cached programs (default 64, 0 disables the cache)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def dna_hash(raw: bytes) -> str:
+    """Content hash of the domain DNA file."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def normalize_strategy(design_spec: dict) -> str:
+    """Canonical form of the Huginn strategy - same spec with different key order gives the same key."""
+    return json.dumps(design_spec, sort_keys=True, default=str)
+
+
+class CompiledProgram:
+    """Generated code of one cache entry - its Graph is built and cached by the sandbox workers."""
+    __slots__ = ('domain', 'code')
+
+    def __init__(self, domain: str, code: str):
+        self.domain = domain
+        self.code = code
+
+
+class ProgramCache:
+    """Thread-safe LRU cache of CompiledProgram entries."""
+    def __init__(self, maxsize: int = None):
+        self.maxsize = int(os.environ.get('ADS_CACHE_SIZE', 64)) if maxsize is None else maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            program = self.entries.get(key)
+            if program is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return program
+
+    def put(self, key, program: CompiledProgram):
+        if self.maxsize <= 0:
+            return program
+
+        with self._lock:
+            # Concurrent misses of the same key keep the first stored program
+            program = self.entries.setdefault(key, program)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return program
+
+    def invalidate(self, dna: str):
+        """Drops the programs generated from the DNA (e.g. the YAML file changed)."""
+        with self._lock:
+            for key in [key for key in self.entries if key[0] == dna]:
+                del self.entries[key]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,233 @@
+"""
+Execution Sandbox
+-----------------
+Runs the DomiKnowS programs generated by the ADS Architect outside the Host process.
+A pool of worker processes is started once and pre-warmed (domiknows, torch and the
+graph modules are imported before the first request), so a request only pays for
+executing its program - a cold `import domiknows` costs seconds.
+
+Each worker executes the program, builds a DataNode for its Graph and verifies every
+logical constraint (DataNode.verifyResultsLC), returning the satisfied percentages.
+A program running over the timeout is killed and its worker replaced; the address
+space a program may allocate is limited (Linux).
+
+Configuration (environment):
+    SANDBOX_WORKERS   - number of worker processes (default 2)
+    SANDBOX_TIMEOUT   - seconds a program may run (default 30)
+    SANDBOX_MEMORY_MB - memory a program may allocate on top of the warm worker (default 1024, 0 = unlimited)
+"""
+
+import hashlib
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+domiknows_path = os.path.join(project_root, 'DomiKnowS_Source')
+if domiknows_path not in sys.path:
+    sys.path.append(domiknows_path)
+
+WARM_MODULES = ['torch', 'domiknows', 'domiknows.graph', 'domiknows.graph.logicalConstrain', 'domiknows.graph.dataNode',
+                'domiknows.graph.dataNodeDummy', 'domiknows.solver.ilpOntSolverFactory', 'domiknows.solver.gurobiILPOntSolver']
+GRAPH_CACHE_SIZE = 16 # Executed graphs kept by each worker
+
+
+@dataclass
+class SandboxResult:
+    status: str                          # "verified", "error", "timeout", "memory_error" or "crashed"
+    constraints: dict = field(default_factory=dict)  # LC name -> {"satisfied": %, "ifSatisfied": %}
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def verified(self) -> bool:
+        return self.status == "verified"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _limit_memory(memory_mb):
+    """Caps the address space at the current size of the warm worker plus memory_mb."""
+    try:
+        import resource
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+    except (ImportError, OSError):
+        return # Not supported on this platform
+
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = current + memory_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _verify_program(code, graphs):
+    import torch
+    from domiknows.graph import Graph, Concept, Relation, createDummyDataNode
+
+    key = hashlib.sha256(code.encode('utf-8')).hexdigest()
+    graph = graphs.get(key)
+    if graph is None:
+        # Fresh name registries - graph, concept and constraint names do not depend on earlier programs
+        Graph.clear()
+        Concept.clear()
+        Relation.clear()
+
+        namespace = {}
+        exec(compile(code, "<ads-program>", 'exec'), namespace)
+        graph = namespace['graph']
+
+        if len(graphs) >= GRAPH_CACHE_SIZE:
+            graphs.pop(next(iter(graphs)))
+        graphs[key] = graph
+
+    torch.manual_seed(0) # Same program - same sample DataNode and verification
+    rootDataNode = createDummyDataNode(graph)
+    verifyResult = rootDataNode.verifyResultsLC()
+
+    constraints = {}
+    for lcName, lcResult in verifyResult.items():
+        constraints[lcName] = {name: float(lcResult[name]) for name in ('satisfied', 'ifSatisfied') if name in lcResult}
+    return constraints
+
+
+def _worker_main(conn, memory_mb):
+    """Worker process loop - warm up, then execute the programs received until None is sent."""
+    import importlib
+    for module in WARM_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass # Optional backend (e.g. gurobipy) not installed - same as the forkserver preload
+
+    from domiknows import setProductionLogMode
+    setProductionLogMode(no_UseTimeLog=True, reuse_model=False)
+
+    if memory_mb:
+        _limit_memory(memory_mb)
+
+    graphs = {}
+    conn.send("ready")
+    while True:
+        try:
+            code = conn.recv()
+        except EOFError:
+            break
+        if code is None:
+            break
+
+        try:
+            conn.send({"status": "verified", "constraints": _verify_program(code, graphs)})
+        except MemoryError:
+            graphs.clear()
+            conn.send({"status": "memory_error", "error": "Program exceeded the sandbox memory limit"})
+        except BaseException as e:
+            conn.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+
+
+class _SandboxWorker:
+    def __init__(self, context, memory_mb):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self):
+        # Warm-up is not counted against the request timeout
+        if not self.ready:
+            self.ready = self.conn.recv() == "ready"
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (OSError, EOFError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+
+
+class SandboxExecutor:
+    """Pool of pre-warmed sandbox worker processes. run() is thread-safe - it blocks until a worker is free."""
+    def __init__(self, workers: int = None, timeout: float = None, memory_mb: int = None):
+        self.workers = workers or int(os.environ.get('SANDBOX_WORKERS', 2))
+        self.timeout = timeout or float(os.environ.get('SANDBOX_TIMEOUT', 30))
+        self.memory_mb = int(os.environ.get('SANDBOX_MEMORY_MB', 1024)) if memory_mb is None else memory_mb
+
+        methods = multiprocessing.get_all_start_methods()
+        if 'forkserver' in methods:
+            # Replacement workers are forked from a server that already imported the warm modules
+            self._context = multiprocessing.get_context('forkserver')
+            self._context.set_forkserver_preload(WARM_MODULES)
+        else:
+            self._context = multiprocessing.get_context('spawn')
+
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.workers):
+            self._idle.put(self._start_worker())
+
+    def _start_worker(self):
+        worker = _SandboxWorker(self._context, self.memory_mb)
+        with self._lock:
+            self._all.append(worker)
+        return worker
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            self._all.remove(worker)
+        return self._start_worker()
+
+    def run(self, code: str, timeout: float = None) -> SandboxResult:
+        """Executes the program in a worker and returns the verification of its logical constraints."""
+        if self._closed:
+            raise RuntimeError("SandboxExecutor is closed")
+
+        timeout = timeout or self.timeout
+        worker = self._idle.get()
+        try:
+            worker.wait_ready()
+            start = time.perf_counter()
+            worker.conn.send(code)
+            if worker.conn.poll(timeout):
+                result = SandboxResult(**worker.conn.recv())
+            else:
+                worker = self._replace(worker)
+                result = SandboxResult("timeout", error=f"Program did not finish in {timeout}s")
+            result.seconds = time.perf_counter() - start
+            return result
+        except (EOFError, OSError) as e:
+            # Worker died (e.g. killed by the OS) - start a new one
+            worker = self._replace(worker)
+            return SandboxResult("crashed", error=f"Sandbox worker died: {e!r}")
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers, self._all = self._all, []
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,95 @@
+"""
+Benchmark: ILP Backends - Gurobi vs HiGHS
+-----------------------------------------
+Objective: Compare solve time and objective value of the DomiKnowS mini solver
+using the Gurobi session and the open source HiGHS session (scipy.optimize.milp).
+
+Test Case: entity/relation graph (people, organization, location, work_for)
+with growing number of words - the Gurobi free license caps the model size,
+so the largest cases are expected to fail on Gurobi.
+"""
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, 'DomiKnowS_Source')
+
+from domiknows.graph import Graph, Concept
+from domiknows.solver.ilpConfig import ilpConfig
+from domiknows.solver.mini_solver_debug import MiniProbSolverDebug
+from domiknows.solver.session.highs_session import HighsSession
+
+SIZES = (5, 10, 20, 40, 60)
+
+def build_graph():
+    Graph.clear()
+    Concept.clear()
+    with Graph('global') as graph:
+        word = Concept('word')
+        people = word(name='people')
+        organization = word(name='organization')
+        location = word(name='location')
+        people.not_a(organization)
+        people.not_a(location)
+        organization.not_a(location)
+
+        pair = Concept('pair')
+        pair.has_a(arg1=word, arg2=word)
+        work_for = pair(name='work_for')
+        work_for.has_a(people, organization)
+    return graph
+
+def session_recorder(SessionType, sessions):
+    def create():
+        session = SessionType()
+        sessions.append(session)
+        return session
+    return create
+
+def solve(graph, SessionType, data, words, pairs):
+    sessions = []
+    solver = MiniProbSolverDebug({graph}, (), ilpConfig, SessionType=session_recorder(SessionType, sessions))
+    start = time.perf_counter()
+    solver.calculateILPSelection(data, words, pairs)
+    duration = time.perf_counter() - start
+    return duration, sessions[-1].get_objective_value()
+
+def run_benchmark():
+    print("========================================")
+    print("      BENCHMARK: ILP BACKENDS           ")
+    print("========================================")
+
+    graph = build_graph()
+    backends = {'HiGHS': HighsSession}
+    try:
+        from domiknows.solver.session.gurobi_session import GurobiSession
+        backends['Gurobi'] = GurobiSession
+    except ImportError:
+        print("[Gurobi]: gurobipy not installed - benchmarking HiGHS only")
+
+    rng = np.random.default_rng(0)
+    for n in SIZES:
+        data = list(range(n))
+        words = {name: rng.random(n) for name in ('people', 'organization', 'location')}
+        pairs = {'work_for': rng.random((n, n))}
+
+        print(f"\n[Words]: {n} - ILP variables: {3 * n + n * n}")
+        objectives = {}
+        for name, SessionType in backends.items():
+            try:
+                duration, objective = solve(graph, SessionType, data, words, pairs)
+            except Exception as e:
+                print(f"  {name:>7}: FAILED - {str(e).splitlines()[0]}")
+                continue
+            objectives[name] = objective
+            print(f"  {name:>7}: {duration:.4f}s - objective {objective:.4f}")
+
+        if len(objectives) == 2:
+            parity = abs(objectives['HiGHS'] - objectives['Gurobi']) <= 1e-6 * max(1., abs(objectives['Gurobi']))
+            print(f"  Parity: {'OK' if parity else 'MISMATCH'}")
+
+    print("========================================", flush=True)
+
+if __name__ == "__main__":
+    run_benchmark()
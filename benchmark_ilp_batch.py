@@ -0,0 +1,109 @@
+"""
+Benchmark: Batched ILP - Batch Items Solved Separately vs Batch Solved as One Problem
+-------------------------------------------------------------------------------------
+Objective: Compare DataNode.inferILPResults for a batch solved as one problem
+(the default - LCs grounded in the whole batch data graph) with the batch items
+mode (batchItems) - each item solved on its own data graph item by item (a Gurobi
+model per item), in parallel (batchWorkers) or fused (batchFused) into one model
+where each item is an independent block, solved with a single optimize call and
+split back to the items.
+
+Test Case: batch of sentences with words classified as people, organization
+and location under the nandL/atMostL/existsL constraints, with growing number
+of items. The results of the batch items variants must be identical. The root
+solve grounds the LCs in the whole batch, so its results differ - it is the
+baseline for the time only. The Gurobi free license caps the model size.
+"""
+import sys
+import time
+
+import torch
+
+sys.path.insert(0, 'DomiKnowS_Source')
+
+from domiknows import setProductionLogMode
+from domiknows.graph import Graph, Concept
+from domiknows.graph.dataNode import DataNode
+from domiknows.graph.logicalConstrain import nandL, atMostL, existsL
+
+BATCH_SIZES = (1, 4, 16, 32)
+WORDS = 5
+REPEATS = 3
+WORKERS = 4
+
+def build_graph():
+    Graph.clear()
+    Concept.clear()
+    with Graph('global') as graph:
+        batch = Concept('batch')
+        sentence = Concept('sentence')
+        word = Concept('word')
+        batch.contains(sentence)
+        sentence.contains(word)
+        people = word(name='people')
+        organization = word(name='organization')
+        location = word(name='location')
+
+        nandL(people, organization)
+        atMostL(people('x'), 2)
+        existsL(location('x'))
+    graph.batch = batch
+    return graph, batch, sentence, word, (people, organization, location)
+
+def build_batch(batch, sentence, word, concepts, items, seed):
+    generator = torch.Generator().manual_seed(seed)
+    root = DataNode(instanceID=0, ontologyNode=batch)
+    for i in range(items):
+        sentenceDn = DataNode(instanceID=i, ontologyNode=sentence)
+        for j in range(WORDS):
+            wordDn = DataNode(instanceID=i * WORDS + j, ontologyNode=word)
+            for concept in concepts:
+                p = torch.rand(1, generator=generator).item()
+                wordDn.attributes['<%s>' % concept.name] = torch.tensor([1 - p, p])
+            sentenceDn.addChildDataNode(wordDn)
+        root.addChildDataNode(sentenceDn)
+    return root
+
+def solve(model, items, **kwargs):
+    durations = []
+    for seed in range(REPEATS):
+        root = build_batch(*model, items, seed)
+        start = time.perf_counter()
+        root.inferILPResults(*model[3], fun=None, **kwargs)
+        durations.append(time.perf_counter() - start)
+
+    results = [[int(wordDn.getAttribute('<%s>/ILP' % concept.name).reshape(-1)[0].item()) for concept in model[3]]
+               for sentenceDn in root.getChildDataNodes() for wordDn in sentenceDn.getChildDataNodes()]
+    return min(durations), results
+
+def run_benchmark():
+    print("========================================")
+    print("      BENCHMARK: BATCHED ILP            ")
+    print("========================================")
+
+    setProductionLogMode(no_UseTimeLog=True)
+    _, batch, sentence, word, concepts = build_graph()
+    model = (batch, sentence, word, concepts)
+
+    passed = True
+    for items in BATCH_SIZES:
+        root, _ = solve(model, items)
+        perItem, perItemResults = solve(model, items, batchItems=True, batchWorkers=1, batchFused=False)
+        parallel, parallelResults = solve(model, items, batchItems=True, batchWorkers=WORKERS, batchFused=False)
+        fused, fusedResults = solve(model, items, batchItems=True, batchFused=True)
+        parity = perItemResults == parallelResults == fusedResults
+        passed = passed and parity
+
+        print(f"\n[Items]: {items} - words per item: {WORDS}")
+        print(f"  root solve (baseline): {root:.4f}s")
+        print(f"  per item:              {perItem:.4f}s - {root / perItem:.2f}x")
+        print(f"  per item, {WORKERS} workers:   {parallel:.4f}s - {root / parallel:.2f}x")
+        print(f"  fused:                 {fused:.4f}s - {root / fused:.2f}x")
+        print(f"  Parity of batch items variants: {'OK' if parity else 'MISMATCH'}")
+
+    print("\n[VERDICT]", "PASS" if passed else "FAIL", flush=True)
+    print("========================================", flush=True)
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
@@ -0,0 +1,134 @@
+"""
+Benchmark: Gurobi Environments - Pooled vs Started per Call
+-----------------------------------------------------------
+Objective: Compare starting a new Gurobi environment (and checking the license)
+for each ILP call with leasing a started one from the process wide pool
+(GurobiEnvPool), and report the environment acquisition wait time when more
+threads run ILP inference than the pool has environments.
+
+Test Case: sentence of words classified as people, organization and location
+under the nandL/atMostL/existsL constraints, inferred repeatedly from several
+threads sharing a bounded pool. The results must be the same as serial inference.
+"""
+import sys
+import threading
+import time
+
+import torch
+
+sys.path.insert(0, 'DomiKnowS_Source')
+
+from gurobipy import Env
+
+from domiknows import setProductionLogMode
+from domiknows.graph import Graph, Concept
+from domiknows.graph.dataNode import DataNode
+from domiknows.graph.logicalConstrain import nandL, atMostL, existsL
+from domiknows.solver.gurobiEnvPool import GurobiEnvPool
+import domiknows.solver.gurobiEnvPool as gurobiEnvPool
+
+CALLS = 200
+WORDS = 5
+THREADS = 4
+POOL_SIZE = 2
+EXAMPLES = 40
+
+def build_graph():
+    Graph.clear()
+    Concept.clear()
+    with Graph('global') as graph:
+        sentence = Concept('sentence')
+        word = Concept('word')
+        sentence.contains(word)
+        people = word(name='people')
+        organization = word(name='organization')
+        location = word(name='location')
+
+        nandL(people, organization)
+        atMostL(people('x'), 2)
+        existsL(location('x'))
+    return graph, sentence, word, (people, organization, location)
+
+def build_sentence(sentence, word, concepts, seed):
+    generator = torch.Generator().manual_seed(seed)
+    root = DataNode(instanceID=0, ontologyNode=sentence)
+    for j in range(WORDS):
+        wordDn = DataNode(instanceID=j, ontologyNode=word)
+        for concept in concepts:
+            p = torch.rand(1, generator=generator).item()
+            wordDn.attributes['<%s>' % concept.name] = torch.tensor([1 - p, p])
+        root.addChildDataNode(wordDn)
+    return root
+
+def infer(model, seed):
+    sentence, word, concepts = model
+    root = build_sentence(sentence, word, concepts, seed)
+    root.inferILPResults(*concepts, fun=None)
+    return [[int(wordDn.getAttribute('<%s>/ILP' % concept.name).reshape(-1)[0].item()) for concept in concepts]
+            for wordDn in root.getChildDataNodes()]
+
+def env_per_call():
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        env = Env("", empty=True)
+        env.setParam('OutputFlag', 0)
+        env.start()
+        env.dispose()
+    return (time.perf_counter() - start) / CALLS
+
+def env_pooled():
+    pool = GurobiEnvPool()
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        with pool.lease():
+            pass
+    elapsed = (time.perf_counter() - start) / CALLS
+    pool.close()
+    return elapsed
+
+def run_benchmark():
+    print("========================================")
+    print("      BENCHMARK: GUROBI ENV POOL        ")
+    print("========================================")
+
+    setProductionLogMode(no_UseTimeLog=True)
+    _, sentence, word, concepts = build_graph()
+    model = (sentence, word, concepts)
+
+    perCall = env_per_call()
+    pooled = env_pooled()
+    print(f"\n[Env per call]: {perCall * 1000:.3f}ms")
+    print(f"[Env pooled]:   {pooled * 1000:.3f}ms - speedup {perCall / pooled:.1f}x")
+
+    serial = {seed: infer(model, seed) for seed in range(EXAMPLES)}
+
+    # Threads share the process wide pool bounded to fewer environments than threads
+    gurobiEnvPool.closeEnvPool()
+    gurobiEnvPool.envPool = GurobiEnvPool(maxSize=POOL_SIZE)
+    results = {}
+    def worker(offset):
+        for seed in range(offset, EXAMPLES, THREADS):
+            results[seed] = infer(model, seed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = gurobiEnvPool.getEnvPool().stats()
+    parity = results == serial
+    print(f"\n[Threads]: {THREADS} - pool size {POOL_SIZE} - examples {EXAMPLES} in {elapsed:.3f}s")
+    print(f"  envs started: {stats['envs']} - leases: {stats['acquired']} - waits: {stats['waits']}")
+    print(f"  wait time: avg {stats['avgWaitTime'] * 1000:.3f}ms - max {stats['maxWaitTime'] * 1000:.3f}ms")
+    print(f"  Parity: {'OK' if parity else 'MISMATCH'}")
+
+    passed = parity and stats['envs'] <= POOL_SIZE
+    print("\n[VERDICT]", "PASS" if passed else "FAIL", flush=True)
+    print("========================================", flush=True)
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
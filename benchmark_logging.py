@@ -0,0 +1,70 @@
+"""
+Benchmark: Logging Overhead - Debug vs Production Mode
+------------------------------------------------------
+Objective: Measure the per-operation cost of the DomiKnowS solver logging on the
+differentiable logic hot path (lcLossBooleanMethods) and show that once
+setProductionLogMode() disables the loggers no log messages are built at all.
+
+Test Case: product t-norm AND / OR / COUNT over growing number of literals,
+timed with logging enabled and then again in production mode.
+"""
+import sys
+import time
+
+import torch
+
+sys.path.insert(0, 'DomiKnowS_Source')
+
+from domiknows import setProductionLogMode
+from domiknows.solver.lcLossBooleanMethods import lcLossBooleanMethods
+
+SIZES = (4, 16, 64)
+REPEATS = 200
+
+def build_methods():
+    methods = lcLossBooleanMethods()
+    methods.current_device = 'cpu'
+    methods.setTNorm('P')
+    methods.setCountingTNorm('P')
+    return methods
+
+def time_steps(methods, literals):
+    steps = {
+        'andVar': lambda: methods.andVar(None, *literals),
+        'orVar': lambda: methods.orVar(None, *literals),
+        'countVar': lambda: methods.countVar(None, *literals, limitOp='>=', limit=2),
+    }
+    timings = {}
+    for name, step in steps.items():
+        step() # Warm up
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            step()
+        timings[name] = (time.perf_counter() - start) / REPEATS
+    return timings
+
+def run_benchmark():
+    print("========================================")
+    print("      BENCHMARK: LOGGING OVERHEAD       ")
+    print("========================================")
+
+    torch.manual_seed(0)
+    cases = {n: [torch.rand(1, dtype=torch.float64, requires_grad=True) for _ in range(n)] for n in SIZES}
+
+    methods = build_methods()
+    enabled = {n: time_steps(methods, literals) for n, literals in cases.items()}
+
+    setProductionLogMode()
+    methods = build_methods()
+    disabled = {n: time_steps(methods, literals) for n, literals in cases.items()}
+
+    for n in SIZES:
+        print(f"\n[Literals]: {n}")
+        for name in enabled[n]:
+            on, off = enabled[n][name] * 1e6, disabled[n][name] * 1e6
+            print(f"  {name:>8}: logging {on:9.1f}us/step - production {off:9.1f}us/step ({on / off:.1f}x)")
+
+    print("========================================", flush=True)
+
+if __name__ == "__main__":
+    run_benchmark()
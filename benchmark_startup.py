@@ -0,0 +1,89 @@
+"""
+Benchmark: CLI Startup Time - Lazy Agent Imports
+------------------------------------------------
+Objective: Track how long the Flavius CLI and the agents take to import, using
+`python -X importtime`, and check that no command pays for the heavy
+dependencies (torch, domiknows, gurobipy) before it actually needs them.
+
+Test Case: import of the CLI and of each agent module in a fresh interpreter,
+plus the wall-clock time of `flavius.py genesis --help`. The domiknows package
+namespaces are checked against an import-time budget: they load their submodules,
+solvers and loggers on first use, so importing them must not load torch, sklearn,
+gurobipy or owlready2, nor create log files.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('torch', 'domiknows', 'gurobipy')
+MODULES = ('flavius', 'agents.genesis', 'agents.flavius_host', 'agents.antigravity_host')
+BUDGET_MS = 1000 # `flavius genesis` must start well under a second
+DOMIKNOWS_HEAVY_MODULES = ('torch', 'sklearn', 'gurobipy', 'owlready2')
+DOMIKNOWS_BUDGETS_MS = {'domiknows': 150, 'domiknows.graph': 150, 'domiknows.program': 150, 'domiknows.solver': 150}
+
+def import_times(module, cwd=ROOT):
+    """
+    Returns [(name, cumulative microseconds)] reported by -X importtime for a fresh import of the
+    module - the module itself first, followed by the modules it imported (interpreter startup excluded).
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, 'DomiKnowS_Source')]))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"], cwd=cwd, env=env, capture_output=True, text=True)
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(cumulative), len(name) - len(name.lstrip())))
+
+    # Entries are reported after their imports - the module subtree is the deeper run of lines before it
+    end = max(i for i, (name, _, _) in enumerate(entries) if name == module)
+    start = end
+    while start > 0 and entries[start - 1][2] > entries[end][2]:
+        start -= 1
+    return [(name, us) for name, us, _ in [entries[end]] + entries[start:end]]
+
+def run_benchmark():
+    print("========================================")
+    print("      BENCHMARK: CLI STARTUP TIME       ")
+    print("========================================")
+
+    for module in MODULES:
+        times = import_times(module)
+        heavy = [name for name in HEAVY_MODULES if name in dict(times)]
+        slowest = sorted(times[1:], key=lambda item: item[1], reverse=True)[:3]
+
+        print(f"\n[Import]: {module:<26} {times[0][1] / 1000:8.1f}ms")
+        print(f"  heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+        print("  slowest: " + ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in slowest))
+
+    print("\n----------------------------------------")
+    passed = True
+    for module, budget in DOMIKNOWS_BUDGETS_MS.items():
+        with tempfile.TemporaryDirectory() as cwd:
+            times = import_times(module, cwd)
+            log_files = os.listdir(cwd)
+        heavy = [name for name in DOMIKNOWS_HEAVY_MODULES if name in dict(times)]
+        ok = times[0][1] / 1000 < budget and not heavy and not log_files
+        passed = passed and ok
+
+        print(f"[Import]: {module:<26} {times[0][1] / 1000:8.1f}ms (budget {budget}ms) {'OK' if ok else 'OVER'}")
+        if heavy or log_files:
+            print(f"  loaded: {', '.join(heavy) or '-'} - created: {', '.join(log_files) or '-'}")
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, 'flavius.py'), 'genesis', '--help'], cwd=ROOT, capture_output=True)
+    duration = (time.perf_counter() - start) * 1000
+
+    passed = passed and duration < BUDGET_MS
+
+    print(f"\n[Result]: `flavius.py genesis --help` wall-clock: {duration:.0f}ms (budget {BUDGET_MS}ms)")
+    print("[VERDICT]", "PASS" if passed else "FAIL", flush=True)
+    print("========================================", flush=True)
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if run_benchmark() else 1)
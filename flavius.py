@@ -14,6 +14,7 @@ Uso:
 import sys
 import os
 import argparse
+import importlib
 from pathlib import Path
 
 # Add local modules to path
@@ -21,13 +22,14 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.append(current_dir)
 
-# Import Agents
-try:
-    from agents.genesis import GenesisAgent
-    from agents.flavius_host import AntigravityHost as FlaviusHost # Renamed alias
-except ImportError as e:
-    print(f"❌ Erro Crítico: Falha ao importar agentes. {e}")
-    sys.exit(1)
+# Import Agents - on demand, each command loads only the agent it runs
+# (the Host pulls in YAML, multiprocessing and the DomiKnowS sandbox; genesis/heal only copy files)
+def import_agent(module, name):
+    try:
+        return getattr(importlib.import_module(module), name)
+    except ImportError as e:
+        print(f"❌ Erro Crítico: Falha ao importar agentes. {e}")
+        sys.exit(1)
 
 def main():
     parser = argparse.ArgumentParser(description="🏛️ Motor Flavius: O Imperador da Lógica")
@@ -56,11 +58,13 @@ def main():
 
     if args.command == "genesis":
         print(f"🚀 Iniciando Gênese em: {args.target}")
+        GenesisAgent = import_agent("agents.genesis", "GenesisAgent")
         agent = GenesisAgent(args.target, args.vault, args.intent, heal=False)
         agent.run()
 
     elif args.command == "heal":
         print(f"⚕️  Iniciando Protocolo de Cura em: {args.target}")
+        GenesisAgent = import_agent("agents.genesis", "GenesisAgent")
         agent = GenesisAgent(args.target, args.vault, intent="Healing", heal=True)
         agent.run()
 
@@ -73,6 +77,7 @@ def main():
             dna_path = "hvac_rules.yaml"
             print(f"🧬 DNA detectado automaticamente: {dna_path}")
             
+        FlaviusHost = import_agent("agents.flavius_host", "AntigravityHost") # Renamed alias
         host = FlaviusHost(domain_yaml=dna_path)
         host.process_user_intent(args.prompt)
 
@@ -14,17 +14,21 @@ def run_tests():
     
     host = AntigravityHost()
     
-    # Scenario 1: Standard Commercial
-    print("\n\n>>> TEST CASE 1: Commercial Cinema (Standard Rules) <<<")
-    host.process_user_intent("Generate a PMOC proposal for a cinema with 500 people.")
+    scenarios = [
+        # Scenario 1: Standard Commercial
+        ("Commercial Cinema (Standard Rules)", "Generate a PMOC proposal for a cinema with 500 people."),
+        # Scenario 2: Critical Healthcare
+        ("Hospital Surgery Room (Critical Rules)", "Need HVAC plan for a Hospital Surgery Room to prevent bacteria."),
+        # Scenario 3: Unknown Domain (Should Fail Gracefully)
+        ("Unknown Domain (Bakery Recipe)", "How do I bake a cake?"),
+    ]
     
-    # Scenario 2: Critical Healthcare
-    print("\n\n>>> TEST CASE 2: Hospital Surgery Room (Critical Rules) <<<")
-    host.process_user_intent("Need HVAC plan for a Hospital Surgery Room to prevent bacteria.")
-    
-    # Scenario 3: Unknown Domain (Should Fail Gracefully)
-    print("\n\n>>> TEST CASE 3: Unknown Domain (Bakery Recipe) <<<")
-    host.process_user_intent("How do I bake a cake?")
+    # All scenarios run as one batch - reasoned together, built and executed in parallel
+    results = host.process_many([prompt for _, prompt in scenarios])
+    for i, ((name, _), result) in enumerate(zip(scenarios, results), start=1):
+        print(f"\n\n>>> TEST CASE {i}: {name} <<<")
+        print("\n".join(result.trace))
+        print(f"[Result] {result.status} ({result.timings['total'] * 1000:.1f}ms)")
     
     print("\n\n========================================")
     print("      TESTING COMPLETE                  ")
@@ -0,0 +1,35 @@
+"""
+DataNode logging - the DataNode and DataNodeBuilder loggers share logs/datanode.log, the records of both
+must stay in it when the loggers are used for the first time in any order (log files of the previous run
+are moved to logs/previous once).
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPT = """
+from domiknows.graph.dataNode import _DataNode__Logger, _DataNodeBuilder__Logger
+_{first}__Logger.info('first record')
+_{second}__Logger.info('second record')
+"""
+
+@pytest.mark.parametrize('first, second', [('DataNodeBuilder', 'DataNode'), ('DataNode', 'DataNodeBuilder')])
+def test_datanode_loggers_share_log_file(tmp_path, first, second):
+    # Log of the previous run - moved to logs/previous when the loggers are set up
+    (tmp_path / 'logs').mkdir()
+    (tmp_path / 'logs' / 'datanode.log').write_text('previous run\n')
+
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'DomiKnowS_Source'))
+    completed = subprocess.run([sys.executable, '-c', SCRIPT.format(first=first, second=second)], cwd=tmp_path, env=env,
+                               capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+
+    log = (tmp_path / 'logs' / 'datanode.log').read_text()
+    assert 'previous run' not in log
+    assert '--- Starting new run ---' in log
+    assert 'first record' in log
+    assert 'second record' in log
@@ -0,0 +1,33 @@
+"""
+Huginn routing - keywords added from the domain YAML must not hide the hospital and server scenarios,
+and a batch of requests must be reasoned as each request alone.
+"""
+import contextlib
+import io
+
+import pytest
+
+from agents.huginn_brain import HuginnBrain
+
+@pytest.fixture
+def brain():
+    with contextlib.redirect_stdout(io.StringIO()):
+        brain = HuginnBrain()
+    brain.add_keywords(['hospitalar', 'serverroom'])
+    return brain
+
+def reason(brain, user_request):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return brain.reason(user_request)
+
+def test_keyword_containing_hospital(brain):
+    assert reason(brain, 'climatiz hospitalar')['domain'] == 'Healthcare_HVAC'
+
+def test_keyword_containing_server(brain):
+    assert reason(brain, 'pmoc serverroom')['domain'] == 'Critical_Infrastructure'
+
+def test_reason_many_matches_reason(brain):
+    user_requests = ['PMOC for a cinema', 'climatiz hospitalar', 'small serverroom', 'hello', 'HOSPITAL ac unit', '']
+    with contextlib.redirect_stdout(io.StringIO()):
+        strategies = brain.reason_many(user_requests)
+    assert strategies == [reason(brain, user_request) for user_request in user_requests]
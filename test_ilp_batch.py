@@ -0,0 +1,109 @@
+"""
+Batch ILP inference - batch items solved in parallel (and in one fused model) must give the same
+results as the items solved one after another, each on its own data graph. By default the batch
+is solved as one problem.
+"""
+import os
+import sys
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DomiKnowS_Source'))
+
+gurobipy = pytest.importorskip('gurobipy')
+
+from domiknows import setProductionLogMode
+from domiknows.graph import Graph, Concept
+from domiknows.graph.dataNode import DataNode
+from domiknows.graph.logicalConstrain import nandL, atMostL, existsL
+from domiknows.solver.ilpOntSolverFactory import ilpOntSolverFactory
+
+ITEMS = 16
+WORDS = 5
+
+@pytest.fixture(scope='module')
+def model():
+    setProductionLogMode(no_UseTimeLog=True)
+    Graph.clear()
+    Concept.clear()
+    ilpOntSolverFactory.clear()
+    with Graph('global') as graph:
+        batch = Concept('batch')
+        sentence = Concept('sentence')
+        word = Concept('word')
+        batch.contains(sentence)
+        sentence.contains(word)
+        people = word(name='people')
+        organization = word(name='organization')
+        location = word(name='location')
+
+        nandL(people, organization)
+        atMostL(people('x'), 2)
+        existsL(location('x'))
+    graph.batch = batch
+    return batch, sentence, word, (people, organization, location)
+
+def build_batch(batch, sentence, word, concepts, seed):
+    generator = torch.Generator().manual_seed(seed)
+    root = DataNode(instanceID=0, ontologyNode=batch)
+    for i in range(ITEMS):
+        sentenceDn = DataNode(instanceID=i, ontologyNode=sentence)
+        for j in range(WORDS):
+            wordDn = DataNode(instanceID=i * WORDS + j, ontologyNode=word)
+            for concept in concepts:
+                p = torch.rand(1, generator=generator).item()
+                wordDn.attributes['<%s>' % concept.name] = torch.tensor([1 - p, p])
+            sentenceDn.addChildDataNode(wordDn)
+        root.addChildDataNode(sentenceDn)
+    return root
+
+def solve(model, seed, **kwargs):
+    batch, sentence, word, concepts = model
+    root = build_batch(batch, sentence, word, concepts, seed)
+    root.inferILPResults(*concepts, fun=None, **kwargs)
+    return [[int(wordDn.getAttribute('<%s>/ILP' % concept.name).reshape(-1)[0].item()) for concept in concepts]
+            for sentenceDn in root.getChildDataNodes() for wordDn in sentenceDn.getChildDataNodes()]
+
+@pytest.mark.parametrize('seed', range(10))
+def test_parallel_batch_items_match_serial(model, seed):
+    serial = solve(model, seed, batchItems=True, batchWorkers=1, batchFused=False)
+    parallel = solve(model, seed, batchItems=True, batchWorkers=8, batchFused=False)
+
+    assert parallel == serial
+
+@pytest.mark.parametrize('seed', range(10))
+def test_fused_batch_items_match_serial(model, seed):
+    serial = solve(model, seed, batchItems=True, batchWorkers=1, batchFused=False)
+    fused = solve(model, seed, batchItems=True, batchFused=True)
+
+    assert fused == serial
+
+def test_batch_items_solved_on_own_data_graph(model):
+    # atMostL and existsL hold in each item, not only in the whole batch
+    for kwargs in ({'batchWorkers': 8, 'batchFused': False}, {'batchFused': True}):
+        results = solve(model, 0, batchItems=True, **kwargs)
+        for i in range(ITEMS):
+            item = results[i * WORDS:(i + 1) * WORDS]
+            assert sum(word[0] for word in item) <= 2
+            assert any(word[2] for word in item)
+
+def test_batch_solved_as_one_problem_by_default(model):
+    # LCs are grounded in the whole batch data graph
+    results = solve(model, 0)
+    assert sum(word[0] for word in results) <= 2
+    assert any(word[2] for word in results)
+
+def test_linked_batch_items_solved_as_one_problem(model):
+    # Word shared by two items links their data graphs - the items are not independent problems
+    batch, sentence, word, concepts = model
+    results = []
+    for kwargs in ({}, {'batchItems': True, 'batchWorkers': 8}, {'batchItems': True, 'batchFused': True}):
+        root = build_batch(batch, sentence, word, concepts, 0)
+        sentences = root.getChildDataNodes()
+        sentences[1].addChildDataNode(sentences[0].getChildDataNodes()[0])
+        root.inferILPResults(*concepts, fun=None, **kwargs)
+        results.append([[int(wordDn.getAttribute('<%s>/ILP' % concept.name).reshape(-1)[0].item()) for concept in concepts]
+                        for sentenceDn in sentences for wordDn in sentenceDn.getChildDataNodes()])
+
+    assert results[0] == results[1] == results[2]
@@ -0,0 +1,30 @@
+"""
+Import time - the domiknows package namespaces must import within their budgets without loading
+the heavy dependencies or creating log files, and the CLI and agents must not load them at all.
+"""
+import os
+import tempfile
+
+import pytest
+
+from benchmark_startup import (DOMIKNOWS_BUDGETS_MS, DOMIKNOWS_HEAVY_MODULES, HEAVY_MODULES, MODULES,
+                               import_times)
+
+RUNS = 3 # Best of the runs is compared with the budget - the first import may be slowed down by cold caches
+
+@pytest.mark.parametrize('module', sorted(DOMIKNOWS_BUDGETS_MS))
+def test_domiknows_import(module):
+    durations = []
+    for _ in range(RUNS):
+        with tempfile.TemporaryDirectory() as cwd:
+            times = dict(import_times(module, cwd))
+            assert not os.listdir(cwd), 'log files created on import'
+        assert not [name for name in DOMIKNOWS_HEAVY_MODULES if name in times]
+        durations.append(times[module] / 1000)
+
+    assert min(durations) < DOMIKNOWS_BUDGETS_MS[module]
+
+@pytest.mark.parametrize('module', MODULES)
+def test_cli_import_without_heavy_modules(module):
+    times = dict(import_times(module))
+    assert not [name for name in HEAVY_MODULES if name in times]
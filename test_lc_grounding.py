@@ -0,0 +1,135 @@
+"""
+LC grounding cache - candidates of an example with the same structure as an earlier one are taken from
+the grounding cache; they, the ILP results and the losses must be the same as without the cache, and
+candidates selected by attribute values (eqL) must never be cached.
+"""
+import os
+import sys
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DomiKnowS_Source'))
+
+from domiknows import setProductionLogMode
+from domiknows.graph import Graph, Concept
+from domiknows.graph.dataNode import DataNode
+from domiknows.graph.logicalConstrain import nandL, ifL, andL, atMostL, existsL, eqL
+from domiknows.solver.ilpConfig import ilpConfig
+from domiknows.solver.ilpOntSolverFactory import ilpOntSolverFactory
+
+WORDS = 4
+
+class Builder(dict):
+    def createFullDataNode(self, dn):
+        pass
+
+def build_graph():
+    Graph.clear()
+    Concept.clear()
+    ilpOntSolverFactory.clear()
+    with Graph('global') as graph:
+        sentence = Concept('sentence')
+        word = Concept('word')
+        sentence.contains(word)
+        pair = Concept('pair')
+        (arg1, arg2) = pair.has_a(arg1=word, arg2=word)
+        people = word(name='people')
+        organization = word(name='organization')
+        work_for = pair(name='work_for')
+
+        nandL(people, organization)
+        ifL(work_for('x'), andL(people(path=('x', arg1)), organization(path=('x', arg2))))
+        atMostL(people('x'), 2)
+        flagLc = existsL(people('x', eqL(word, 'flag', {1})))
+    return (sentence, word, pair, arg1, arg2), (people, organization, work_for), flagLc
+
+def build_example(graphConcepts, concepts, seed, flags):
+    sentence, word, pair, arg1, arg2 = graphConcepts
+    generator = torch.Generator().manual_seed(seed)
+    def probabilities():
+        return torch.rand(2, generator=generator, dtype=torch.float64)
+
+    root = DataNode(instanceID=0, ontologyNode=sentence)
+    words = []
+    for i in range(WORDS):
+        wordDn = DataNode(instanceID=i, ontologyNode=word)
+        wordDn.attributes['flag'] = flags[i]
+        for concept in concepts[:2]:
+            wordDn.attributes['<%s>' % concept.name] = probabilities()
+        root.addChildDataNode(wordDn)
+        words.append(wordDn)
+
+    pairId = 0
+    for i in range(WORDS):
+        for j in range(WORDS):
+            if i != j:
+                pairDn = DataNode(instanceID=pairId, ontologyNode=pair)
+                pairDn.attributes['<%s>' % concepts[2].name] = probabilities()
+                pairDn.addRelationLink(arg1.name, words[i]) # Relations are renamed when the graph is built again
+                pairDn.addRelationLink(arg2.name, words[j])
+                pairId += 1
+    return root
+
+def ground(cacheSize, monkeypatch, flagsOfExamples):
+    """Run ILP, loss and verification of the examples, return their results, the found candidates and the solver."""
+    monkeypatch.setitem(ilpConfig, 'lcGroundingCacheSize', cacheSize)
+    graphConcepts, concepts, flagLc = build_graph()
+
+    results, candidates = [], []
+    solver = None
+    for seed, flags in enumerate(flagsOfExamples):
+        root = build_example(graphConcepts, concepts, seed, flags)
+        if solver is None:
+            solver, _ = root.getILPSolver(conceptsRelations=root.collectConceptsAndRelations())
+            getCandidates = solver.lcGroundings.getCandidates
+            def recordCandidates(dn, e, variable, lcVariablesDns, lc, rootLc, eIndex, *args, **kwargs):
+                found = getCandidates(dn, e, variable, lcVariablesDns, lc, rootLc, eIndex, *args, **kwargs)
+                candidates.append((seed, lc.name, eIndex, variable.name, None if found is None else
+                                   [[None if candidateDn is None else (candidateDn.ontologyNode.name, candidateDn.instanceID) for candidateDn in dns]
+                                    for dns in found[0]]))
+                return found
+            monkeypatch.setattr(solver.lcGroundings, 'getCandidates', recordCandidates)
+
+        root.inferILPResults(*concepts, fun=None)
+        _, word, pair, *_ = graphConcepts
+        results.append({concept.name: [int(dn.getAttribute('<%s>/ILP' % concept.name).reshape(-1)[0].item())
+                                       for dn in root.findDatanodes(select=parent)] for concept, parent in zip(concepts, (word, word, pair))})
+
+        root.myBuilder = Builder(DataNodesConcepts={})
+        losses = root.calculateLcLoss(tnorm='P')
+        results.append({lcName: loss['loss'].item() for lcName, loss in losses.items() if loss['loss'] is not None})
+        results.append({lcName: lcResult['satisfied'] for lcName, lcResult in root.verifyResultsLC().items()})
+
+    return results, candidates, solver, flagLc
+
+@pytest.fixture(autouse=True)
+def production_mode():
+    setProductionLogMode(no_UseTimeLog=True)
+
+def test_cached_grounding_matches_uncached(monkeypatch):
+    # Same structure, different values (and flags selecting different words by eqL)
+    flagsOfExamples = [(1, 0, 0, 1), (0, 1, 0, 0), (0, 0, 1, 1)]
+    cachedResults, cachedCandidates, solver, _ = ground(32, monkeypatch, flagsOfExamples)
+    stats = solver.lcGroundings.stats()
+    assert stats['structures'] == 1
+    assert stats['structureHits'] > 0 # Later examples are grounded from the structure of the first one
+
+    results, candidates, solver, _ = ground(0, monkeypatch, flagsOfExamples)
+    assert solver.lcGroundings.stats()['structureHits'] == 0
+    assert cachedCandidates == candidates
+    assert cachedResults == pytest.approx(results)
+
+def test_grounding_selected_by_attribute_values_not_cached(monkeypatch):
+    _, candidates, solver, flagLc = ground(32, monkeypatch, [(1, 0, 0, 0), (0, 0, 0, 1)])
+    assert not solver.lcGroundings.plan(flagLc).cacheable
+    for groundings in solver.lcGroundings.structures.values():
+        assert not [key for key in groundings if key[0] is flagLc]
+
+    # The eqL LC candidates are found from the flags of each example
+    flagCandidates = {}
+    for seed, lcName, *_, found in candidates:
+        if lcName == flagLc.name:
+            flagCandidates.setdefault(seed, []).append(found)
+    assert flagCandidates[0] == [[[('word', 0)], [None], [None], [None]]] * len(flagCandidates[0])
+    assert flagCandidates[1] == [[[None], [None], [None], [('word', 3)]]] * len(flagCandidates[1])
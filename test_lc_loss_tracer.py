@@ -0,0 +1,85 @@
+"""
+Traced LC loss - the loss calculated by the module traced for the structure of the data graph must be
+the same as the loss calculated by the solver for each example.
+"""
+import os
+import sys
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DomiKnowS_Source'))
+
+from domiknows import setProductionLogMode
+from domiknows.graph import Graph, Concept
+from domiknows.graph.dataNode import DataNode
+from domiknows.graph.logicalConstrain import nandL, atMostL, existsL, eqL
+from domiknows.solver.ilpOntSolverFactory import ilpOntSolverFactory
+from domiknows.solver.lcLossTracer import LcLossTracer
+
+WORDS = 4
+
+class Builder(dict):
+    def createFullDataNode(self, dn):
+        pass
+
+def build_graph(selectByFlag):
+    Graph.clear()
+    Concept.clear()
+    ilpOntSolverFactory.clear()
+    with Graph('global') as graph:
+        sentence = Concept('sentence')
+        word = Concept('word')
+        sentence.contains(word)
+        people = word(name='people')
+        organization = word(name='organization')
+
+        if selectByFlag:
+            existsL(people('x', eqL(word, 'flag', {1})))
+        else:
+            nandL(people, organization)
+            atMostL(people('x'), 2)
+            existsL(organization('x'))
+    return sentence, word, (people, organization)
+
+def build_sentence(sentence, word, concepts, seed, flags=(0,) * WORDS):
+    generator = torch.Generator().manual_seed(seed)
+    root = DataNode(instanceID=0, ontologyNode=sentence)
+    for j in range(WORDS):
+        wordDn = DataNode(instanceID=j, ontologyNode=word)
+        wordDn.attributes['flag'] = flags[j]
+        for concept in concepts:
+            wordDn.attributes['<%s>' % concept.name] = torch.rand(2, generator=generator, dtype=torch.float64)
+        root.addChildDataNode(wordDn)
+    root.myBuilder = Builder(DataNodesConcepts={})
+    return root
+
+def lc_loss(root, lossTracer=None):
+    losses = root.calculateLcLoss(lossTracer=lossTracer)
+    return {lcName: loss['loss'].item() for lcName, loss in losses.items() if loss['loss'] is not None}
+
+@pytest.fixture(autouse=True)
+def production_mode():
+    setProductionLogMode(no_UseTimeLog=True)
+
+def test_traced_loss_matches_solver():
+    sentence, word, concepts = build_graph(False)
+    lossTracer = LcLossTracer()
+    for seed in range(4):
+        traced = lc_loss(build_sentence(sentence, word, concepts, seed), lossTracer)
+        eager = lc_loss(build_sentence(sentence, word, concepts, seed))
+        assert traced == pytest.approx(eager)
+
+    assert lossTracer.stats()['hits'] == 3
+
+def test_loss_with_candidates_selected_by_attribute_values_not_traced():
+    # Words selected by eqL depend on their flag values, not only on the structure of the data graph
+    sentence, word, concepts = build_graph(True)
+    lossTracer = LcLossTracer()
+    for flags in ((1, 0, 0, 0), (0, 0, 0, 1), (0, 1, 1, 0)):
+        traced = lc_loss(build_sentence(sentence, word, concepts, 0, flags), lossTracer)
+        eager = lc_loss(build_sentence(sentence, word, concepts, 0, flags))
+        assert traced == pytest.approx(eager)
+
+    assert lossTracer.stats()['hits'] == 0
+    assert len(lossTracer) == 0
@@ -0,0 +1,111 @@
+"""
+Semantic sample - the whole sample space must be enumerated once in itertools.product order, whatever
+the chunk size, and a sample space larger than semanticSampleMaxSize must be subsampled to exactly that size.
+"""
+import itertools
+import os
+import sys
+
+import pytest
+import torch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DomiKnowS_Source'))
+
+from domiknows import setProductionLogMode
+from domiknows.graph import Graph, Concept, EnumConcept
+from domiknows.graph.dataNode import DataNode
+from domiknows.solver.ilpOntSolverFactory import ilpOntSolverFactory
+
+LABELS = ['a', 'b', 'c']
+
+def build_sentence(words, peopleProbability=0.7):
+    Graph.clear()
+    Concept.clear()
+    ilpOntSolverFactory.clear()
+    with Graph('global') as graph:
+        sentence = Concept('sentence')
+        word = Concept('word')
+        sentence.contains(word)
+        word(name='people')
+        word(name='label', ConceptClass=EnumConcept, values=LABELS)
+
+    root = DataNode(instanceID=0, ontologyNode=sentence)
+    for i in range(words):
+        wordDn = DataNode(instanceID=i, ontologyNode=word)
+        wordDn.attributes['<people>'] = torch.tensor([1 - peopleProbability, peopleProbability])
+        wordDn.attributes['<people>/local/softmax'] = torch.tensor([1 - peopleProbability, peopleProbability])
+        wordDn.attributes['<label>'] = torch.tensor([0.2, 0.3, 0.5])
+        wordDn.attributes['<label>/local/softmax'] = torch.tensor([0.2, 0.3, 0.5])
+        root.addChildDataNode(wordDn)
+    return root
+
+def concepts_relations(root, multiclassLast):
+    conceptsRelations = root.collectConceptsAndRelations()
+    multiclass = [c for c in conceptsRelations if c[0].name == 'label']
+    binary = [c for c in conceptsRelations if c[0].name == 'people']
+    return binary + multiclass if multiclassLast else multiclass + binary
+
+def sampled_labels(root, conceptsRelations):
+    """Labels of the product variables (concepts in the order of conceptsRelations, then words) in each sample."""
+    labels = []
+    for conceptName in dict.fromkeys(c[0].name for c in conceptsRelations):
+        for wordDn in root.getChildDataNodes():
+            sample = wordDn.getAttribute('<%s>/sample' % conceptName)[-1]
+            if conceptName == 'people':
+                labels.append(sample[1].long())
+            else:
+                onehot = torch.stack([sample[i] for i in range(len(LABELS))])
+                assert (onehot.sum(dim=0) == 1).all() # One label of the multiclass concept in each sample
+                labels.append(onehot.argmax(dim=0))
+    return [tuple(sample) for sample in torch.stack(labels).t().tolist()]
+
+def semantic_sample(root, multiclassLast, monkeypatch, **config):
+    conceptsRelations = concepts_relations(root, multiclassLast)
+    solver, _ = root.getILPSolver(conceptsRelations=conceptsRelations)
+    for name, value in config.items():
+        monkeypatch.setattr(solver, name, value)
+    sampleSize = solver.generateSemanticSample(root, conceptsRelations)
+    return sampleSize, sampled_labels(root, conceptsRelations)
+
+@pytest.fixture(autouse=True)
+def production_mode():
+    setProductionLogMode(no_UseTimeLog=True)
+    torch.manual_seed(0)
+
+@pytest.mark.parametrize('multiclassLast', [False, True], ids=['binary-last', 'multiclass-last'])
+@pytest.mark.parametrize('chunkSize', [7, 65536])
+def test_whole_sample_space_in_product_order(monkeypatch, multiclassLast, chunkSize):
+    words = 3
+    root = build_sentence(words)
+    sampleSize, samples = semantic_sample(root, multiclassLast, monkeypatch, semanticSampleChunkSize=chunkSize,
+                                          semanticSampleMaxSize=None)
+
+    ranges = [len(LABELS)] * words + [2] * words if not multiclassLast else [2] * words + [len(LABELS)] * words
+    expected = list(itertools.product(*[range(r) for r in ranges]))
+    assert sampleSize == len(expected) == 6 ** words
+    assert samples == expected
+    assert len(set(samples)) == sampleSize
+
+@pytest.mark.parametrize('mode', ['uniform', 'importance'])
+@pytest.mark.parametrize('multiclassLast', [False, True], ids=['binary-last', 'multiclass-last'])
+def test_subsampled_to_max_size(monkeypatch, mode, multiclassLast):
+    words, maxSize = 6, 100
+    root = build_sentence(words)
+    sampleSize, samples = semantic_sample(root, multiclassLast, monkeypatch, semanticSampleChunkSize=32,
+                                          semanticSampleMaxSize=maxSize, semanticSampleMode=mode)
+
+    assert sampleSize == maxSize
+    assert len(samples) == maxSize
+    for wordDn in root.getChildDataNodes():
+        assert all(labelSample.shape == (maxSize,) for labelSample in wordDn.getAttribute('<people>/sample')[-1].values())
+        assert all(labelSample.shape == (maxSize,) for labelSample in wordDn.getAttribute('<label>/sample')[-1].values())
+
+def test_importance_subsample_follows_probabilities(monkeypatch):
+    # Labels with zero probability are never drawn in the importance mode
+    root = build_sentence(6, peopleProbability=1.0)
+    _, samples = semantic_sample(root, True, monkeypatch, semanticSampleMaxSize=50, semanticSampleMode='importance')
+    assert all(sample[:6] == (1,) * 6 for sample in samples)
+
+    root = build_sentence(6, peopleProbability=1.0)
+    _, samples = semantic_sample(root, True, monkeypatch, semanticSampleMaxSize=50, semanticSampleMode='uniform')
+    assert any(sample[:6] != (1,) * 6 for sample in samples)
@@ -0,0 +1,154 @@
+"""
+Sensor caches - the LRU cache must stay within its limits and read through its backend, and the sharded
+on-disk cache must round trip the values and be shared by cache instances of several processes.
+"""
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+import torch
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'DomiKnowS_Source'))
+
+from domiknows.sensor.pytorch.cache import LRUCache, ShardedCache, valueSize
+from domiknows.sensor.pytorch.sensors import CacheSensor
+
+WRITER = """
+import sys
+import torch
+from domiknows.sensor.pytorch.cache import ShardedCache
+cache = ShardedCache(sys.argv[1], shards=4)
+for i in range(int(sys.argv[3])):
+    cache['%s-%i' % (sys.argv[2], i)] = torch.full((64,), float(i))
+"""
+
+def write_in_processes(path, prefixes, count):
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'DomiKnowS_Source'))
+    writers = [subprocess.Popen([sys.executable, '-c', WRITER, str(path), prefix, str(count)], env=env, stderr=subprocess.PIPE, text=True)
+               for prefix in prefixes]
+    for writer in writers:
+        _, stderr = writer.communicate()
+        assert writer.returncode == 0, stderr
+
+def test_lru_evicts_least_recently_used_over_budget():
+    value = torch.zeros(100, dtype=torch.float32)
+    cache = LRUCache(budget=3 * valueSize(value))
+    for name in 'abc':
+        cache[name] = value.clone()
+    cache['a'] # a becomes the most recently used - b is evicted next
+    cache['d'] = value.clone()
+
+    assert set(cache.entries) == {'a', 'c', 'd'}
+    assert cache.totalSize == 3 * valueSize(value)
+    assert cache.stats()['evictions'] == 1
+    with pytest.raises(KeyError):
+        cache['b']
+
+def test_lru_evicts_over_max_size():
+    cache = LRUCache(maxSize=2, budget=None)
+    for i in range(5):
+        cache[i] = i
+    assert list(cache.entries) == [3, 4]
+    assert cache.stats()['evictions'] == 3
+
+def test_lru_keeps_value_over_budget():
+    # A single value larger than the budget is kept - the sensor would compute it again otherwise
+    cache = LRUCache(budget=1)
+    cache['a'] = torch.zeros(10)
+    assert 'a' in cache
+
+def test_lru_reads_through_backend(tmp_path):
+    backend = ShardedCache(tmp_path, shards=4)
+    cache = LRUCache(maxSize=1, budget=None, backend=backend)
+    cache['a'] = torch.tensor([1.])
+    cache['b'] = torch.tensor([2.])
+    assert 'a' not in cache # Evicted from memory, still in the backend
+
+    assert torch.equal(cache['a'], torch.tensor([1.]))
+    assert 'a' in cache # Read values are kept in memory again
+    with pytest.raises(KeyError):
+        cache['c']
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['backend']['size'] == 2
+
+@pytest.mark.parametrize('compress', [None, 6])
+def test_sharded_round_trip(tmp_path, compress):
+    values = {'tensor': torch.randn(3, 4), 'list': [torch.arange(5), 'text'], 'dict': {'x': torch.ones(2)}}
+    cache = ShardedCache(tmp_path, shards=3, compress=compress)
+    for name, value in values.items():
+        cache[name] = value
+
+    reopened = ShardedCache(tmp_path, shards=3, compress=compress)
+    assert len(reopened) == len(values)
+    assert torch.equal(reopened['tensor'], values['tensor'])
+    assert torch.equal(reopened['list'][0], values['list'][0]) and reopened['list'][1] == 'text'
+    assert torch.equal(reopened['dict']['x'], values['dict']['x'])
+
+def test_sharded_compression_shrinks_shards(tmp_path):
+    value = torch.zeros(10000)
+    ShardedCache(tmp_path / 'raw', shards=1)['a'] = value
+    ShardedCache(tmp_path / 'compressed', shards=1, compress=6)['a'] = value
+    assert os.path.getsize(tmp_path / 'compressed' / 'shard-000.bin') < os.path.getsize(tmp_path / 'raw' / 'shard-000.bin') / 10
+
+def test_sharded_instances_share_directory(tmp_path):
+    first = ShardedCache(tmp_path, shards=4)
+    second = ShardedCache(tmp_path, shards=4)
+    first['a'] = torch.tensor([1.])
+    second['b'] = torch.tensor([2.])
+
+    # Entries written by the other instance are found by reading the index on a miss
+    assert torch.equal(second['a'], torch.tensor([1.]))
+    assert torch.equal(first['b'], torch.tensor([2.]))
+    assert len(first) == len(second) == 2
+
+def test_sharded_reads_index_written_by_other_process(tmp_path):
+    cache = ShardedCache(tmp_path, shards=4)
+    with pytest.raises(KeyError):
+        cache['worker-0']
+
+    write_in_processes(tmp_path, ['worker'], 3)
+    for i in range(3):
+        assert torch.equal(cache['worker-%i' % i], torch.full((64,), float(i)))
+
+def test_sharded_concurrent_process_writes(tmp_path):
+    # Processes append to the same shards at the same time - the file lock keeps values and indexes intact
+    prefixes, count = ['w0', 'w1', 'w2', 'w3'], 50
+    write_in_processes(tmp_path, prefixes, count)
+
+    cache = ShardedCache(tmp_path, shards=4)
+    assert len(cache) == len(prefixes) * count
+    for prefix in prefixes:
+        for i in range(count):
+            assert torch.equal(cache['%s-%i' % (prefix, i)], torch.full((64,), float(i)))
+
+def test_pickle_copies_settings_not_values(tmp_path):
+    cache = LRUCache(maxSize=10, budget=1000, backend=ShardedCache(tmp_path, shards=2))
+    cache['a'] = torch.tensor([1.])
+    cache['a']
+    with pytest.raises(KeyError):
+        cache['b']
+
+    copy = pickle.loads(pickle.dumps(cache))
+    assert (copy.maxSize, copy.budget) == (10, 1000)
+    assert len(copy) == 0 and copy.totalSize == 0
+    # Counters are per process
+    assert copy.stats()['hits'] == copy.stats()['misses'] == copy.stats()['evictions'] == 0
+    assert copy.backend.stats()['misses'] == 0
+
+    # The backend is shared - values written before pickling are read from it
+    assert torch.equal(copy['a'], torch.tensor([1.]))
+    copy['c'] = torch.tensor([3.])
+    assert torch.equal(cache['c'], torch.tensor([3.]))
+
+def test_cache_sensor_caches(tmp_path):
+    # A Cache class is instantiated for every sensor, caches needing arguments are passed as instances
+    first, second = CacheSensor(), CacheSensor()
+    assert isinstance(first.cache, LRUCache) and first.cache is not second.cache
+
+    backend = ShardedCache(tmp_path)
+    assert CacheSensor(cache=backend).cache is backend
+    assert CacheSensor(cache=None).cache is None